@@ -0,0 +1,46 @@
+"""Deepcopy and patch vs copy-on-write patch of a large dict tree."""
+
+import copy
+import random
+import time
+
+from nested_diff import Differ, Patcher
+
+KEYS = 20000
+CHANGED = 10
+
+
+def main():
+    """Run benchmark."""
+    rnd = random.Random(0)
+    old = {
+        f'k{i}': {'items': list(range(50)), 'name': f'n{i}', 'v': i}
+        for i in range(KEYS)
+    }
+    new = dict(old)
+    for _ in range(CHANGED):
+        key = f'k{rnd.randrange(KEYS)}'
+        record = dict(new[key])
+        record['v'] = -1
+        record['items'] = [*record['items'], 1]
+        new[key] = record
+
+    _, diff = Differ(O=False, U=False).diff(old, new)
+
+    start = time.perf_counter()
+    copied = Patcher().patch(copy.deepcopy(old), diff)
+    copy_spent = time.perf_counter() - start
+
+    start = time.perf_counter()
+    patched = Patcher(copy_on_write=True).patch(old, diff)
+    cow_spent = time.perf_counter() - start
+
+    assert copied == patched == new
+    print(
+        f'deepcopy+patch {copy_spent * 1e3:.1f}ms, '
+        f'copy-on-write patch {cow_spent * 1e3:.2f}ms',
+    )
+
+
+if __name__ == '__main__':
+    main()
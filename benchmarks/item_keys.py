@@ -0,0 +1,49 @@
+"""Pickle based vs default (typed/structural) list item keys."""
+
+import pickle
+import time
+import tracemalloc
+
+from nested_diff import Differ
+
+ITEMS = 100000
+REPLACED = 100
+
+
+def pickle_key(item):
+    """Return list item key the way it was calculated before."""
+    return pickle.dumps(item, -1)
+
+
+def main():
+    """Run benchmark."""
+    a = [{'id': i, 'name': f'n{i}', 'tags': [i, i + 1]} for i in range(ITEMS)]
+    b = [dict(item) for item in a]
+    for i in range(0, ITEMS, ITEMS // REPLACED):
+        b[i] = {'id': -i}
+
+    for name, item_key in (('pickle', pickle_key), ('default', None)):
+        differ = Differ(U=False, item_key=item_key)
+
+        start = time.perf_counter()
+        for item in a:
+            differ.item_key(item)
+        keys_spent = time.perf_counter() - start
+
+        start = time.perf_counter()
+        differ.diff(a, b)
+        diff_spent = time.perf_counter() - start
+
+        tracemalloc.start()
+        differ.diff(a, b)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        print(
+            f'{name:<8} keys {keys_spent:.2f}s per side, '
+            f'diff {diff_spent:.2f}s, peak traced memory {peak / 1e6:.1f}MB',
+        )
+
+
+if __name__ == '__main__':
+    main()
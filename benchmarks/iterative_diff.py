@@ -0,0 +1,45 @@
+"""Recursive vs iterative diff for chains of nested dicts."""
+
+import time
+
+from nested_diff import Differ
+
+DEPTHS = (10, 1000, 100000)
+NODES = 200000  # per measurement
+
+
+def make_chain(depth, leaf):
+    """Return chain of nested dicts, two nodes per level."""
+    obj = leaf
+    for i in range(depth):
+        obj = {'k': obj, 'i': i}
+
+    return obj
+
+
+def main():
+    """Run benchmark."""
+    for depth in DEPTHS:
+        a = make_chain(depth, 0)
+        b = make_chain(depth, 1)
+        repeat = max(1, NODES // depth)
+
+        for iterative in (False, True):
+            differ = Differ(U=False, iterative=iterative)
+            mode = 'iterative' if iterative else 'recursive'
+
+            try:
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    differ.diff(a, b)
+                spent = (time.perf_counter() - start) / repeat
+            except RecursionError:
+                print(f'depth={depth:<7} {mode}: RecursionError')
+                continue
+
+            rate = depth * 2 / spent / 1e6
+            print(f'depth={depth:<7} {mode}: {rate:.2f}M nodes/s')
+
+
+if __name__ == '__main__':
+    main()
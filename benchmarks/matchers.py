@@ -0,0 +1,83 @@
+"""Matching time of sequence matchers for lists of ints.
+
+"uniq" lists contain unique items, "rep" ones are drawn from 10 distinct
+values. Edits are random replacements, insertions and deletions. Use
+`--full` to include 100k items lists (takes several minutes).
+
+"""
+
+import argparse
+import random
+import time
+
+from nested_diff.matchers import get_matcher
+
+ALGORITHMS = ('difflib', 'myers', 'patience', 'histogram')
+CASES = (
+    ('uniq', 1000, 0.001),
+    ('uniq', 10000, 0.01),
+    ('uniq', 10000, 0.1),
+    ('rep', 1000, 0.01),
+    ('rep', 10000, 0.001),
+    ('rep', 10000, 0.01),
+    ('rep', 10000, 0.1),
+)
+FULL_CASES = (
+    ('uniq', 100000, 0.001),
+    ('uniq', 100000, 0.01),
+    ('uniq', 100000, 0.1),
+    ('rep', 100000, 0.001),
+    ('rep', 100000, 0.01),
+    ('rep', 100000, 0.1),
+)
+SKIPPED = {('difflib', 'rep', 100000)}  # more than a minute each
+
+
+def make_lists(data, size, density):
+    """Return list and it's edited copy."""
+    rnd = random.Random(0)
+    a = [rnd.randrange(10) if data == 'rep' else i for i in range(size)]
+    b = list(a)
+
+    for _ in range(int(size * density)):
+        op = rnd.randrange(3)
+        i = rnd.randrange(len(b))
+        if op == 0:
+            b[i] = -rnd.randrange(1 << 30)
+        elif op == 1:
+            del b[i]
+        else:
+            b.insert(i, -rnd.randrange(1 << 30))
+
+    return a, b
+
+
+def main():
+    """Run benchmark."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--full', action='store_true')
+    args = parser.parse_args()
+
+    header = 'data  size    edits  ' + ''.join(f'{a:<10}' for a in ALGORITHMS)
+    print(header.rstrip())
+
+    for data, size, density in CASES + (FULL_CASES if args.full else ()):
+        a, b = make_lists(data, size, density)
+        row = f'{data:<6}{size:<8}{density:<7.1%}'
+
+        for algorithm in ALGORITHMS:
+            if (algorithm, data, size) in SKIPPED:
+                row += f'{"skipped":<10}'
+                continue
+
+            matcher = get_matcher(algorithm)
+            start = time.perf_counter()
+            matcher.set_seqs(a, b)
+            matcher.get_matching_blocks()
+            row += f'{time.perf_counter() - start:<10.3f}'
+
+        print(row.rstrip())
+
+
+if __name__ == '__main__':
+    main()
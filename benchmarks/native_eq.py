@@ -0,0 +1,45 @@
+"""Diff of services config snapshot with and without native_eq option."""
+
+import copy
+import random
+import time
+
+from nested_diff import Differ
+
+SERVICES = 5000
+CHANGED = 250  # 5%
+
+
+def make_service(i):
+    """Return service definition."""
+    return {
+        'name': f'svc{i}',
+        'replicas': 3,
+        'image': f'repo/img:{i}',
+        'env': {f'VAR{j}': str(j) for j in range(10)},
+        'ports': [{'port': 80 + j, 'proto': 'tcp'} for j in range(3)],
+        'labels': ['a', 'b', 'c'],
+    }
+
+
+def main():
+    """Run benchmark."""
+    rnd = random.Random(0)
+    a = {f'svc{i}': make_service(i) for i in range(SERVICES)}
+    b = copy.deepcopy(a)
+    for name in rnd.sample(sorted(b), CHANGED):
+        b[name]['replicas'] += 1
+
+    results = []
+    for native_eq in (False, True):
+        differ = Differ(U=False, native_eq=native_eq)
+
+        start = time.perf_counter()
+        results.append(differ.diff(a, b))
+        print(f'native_eq={native_eq}: {time.perf_counter() - start:.3f}s')
+
+    assert results[0] == results[1]
+
+
+if __name__ == '__main__':
+    main()
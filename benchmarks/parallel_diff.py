@@ -0,0 +1,75 @@
+"""Serial vs process pool based parallel diff of host records."""
+
+import copy
+import os
+import pickle
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from nested_diff import Differ
+
+HOSTS = 20000
+CHANGED = 2000
+WORKERS = (1, 2, 4, 8)
+
+
+def make_hosts(rnd):
+    """Return dict of host records."""
+    return {
+        f'h{i}': {
+            'id': i,
+            'name': f'host{i}',
+            'tags': [f't{j}' for j in range(20)],
+            'metrics': {f'm{j}': rnd.random() for j in range(30)},
+            'ports': [{'port': p, 'proto': 'tcp'} for p in range(10)],
+        }
+        for i in range(HOSTS)
+    }
+
+
+def main():
+    """Run benchmark."""
+    rnd = random.Random(0)
+    a = make_hosts(rnd)
+    b = copy.deepcopy(a)
+    for name in rnd.sample(sorted(b), CHANGED):
+        b[name]['metrics']['m1'] = -1.0
+        b[name]['tags'].append('x')
+
+    print(f'{os.cpu_count()} CPUs')
+    differ = Differ(U=False)
+
+    start = time.perf_counter()
+    expected = differ.diff(a, b)
+    serial = time.perf_counter() - start
+    print(f'serial diff: {serial:.2f}s')
+
+    start = time.perf_counter()
+    data = pickle.dumps((a, b))
+    dumps_spent = time.perf_counter() - start
+    start = time.perf_counter()
+    pickle.loads(data)  # noqa: S301
+    loads_spent = time.perf_counter() - start
+    print(
+        f'pickle {len(data) / 2**20:.0f}MB: '
+        f'dumps {dumps_spent:.2f}s, loads {loads_spent:.2f}s',
+    )
+
+    for workers in WORKERS:
+        with ProcessPoolExecutor(workers) as executor:
+            executor.submit(int).result()  # start workers
+
+            start = time.perf_counter()
+            got = differ.diff_parallel(a, b, executor=executor)
+            spent = time.perf_counter() - start
+
+        assert got == expected
+        print(
+            f'diff_parallel, {workers} workers: {spent:.2f}s, '
+            f'speedup {serial / spent:.2f}',
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""Patching of long lists and texts with many scattered edits.
+
+Handlers below patch the way it was done before: by insert/del (pop) for
+every added or removed item, which is O(n) each.
+
+"""
+
+import argparse
+import random
+import time
+
+from nested_diff import Patcher, handlers
+
+
+class InsertDeleteListHandler(handlers.ListHandler):
+    """List handler patching by insert/del."""
+
+    def patch(self, patcher, target, diff):
+        """Patch list object."""
+        i = j = 0  # index, scatter
+
+        for subdiff in diff['D']:
+            if 'I' in subdiff:
+                i = subdiff['I'] + j
+
+            if 'D' in subdiff or 'N' in subdiff:
+                target[i] = patcher.patch(target[i], subdiff)
+            elif 'A' in subdiff:
+                target.insert(i, subdiff['A'])
+                j += 1
+            elif 'R' in subdiff:
+                del target[i]
+                j -= 1
+                continue
+
+            i += 1
+
+        return target
+
+
+class InsertDeleteTextHandler(handlers.TextHandler):
+    """Text handler patching by insert/pop."""
+
+    def patch(self, patcher, target, diff):  # noqa: ARG002
+        """Patch text."""
+        offset = idx = 0
+        lines = target.split('\n')
+
+        for subdiff in diff['D']:
+            if 'I' in subdiff:
+                idx = subdiff['I'][0] + offset
+            elif 'A' in subdiff:
+                lines.insert(idx, subdiff['A'])
+                offset += 1
+                idx += 1
+            elif 'R' in subdiff:
+                lines.pop(idx)
+                offset -= 1
+            else:
+                idx += 1
+
+        return '\n'.join(lines)
+
+
+def make_diffs(size, edits):
+    """Return list and text diffs with scattered edits."""
+    rnd = random.Random(0)
+    positions = sorted(rnd.sample(range(size), edits))
+
+    list_diff = []
+    src = 0
+    for pos in positions:
+        chance = rnd.random()
+        if chance < 0.4:  # noqa: PLR2004
+            subdiff = {'A': -pos}
+        elif chance < 0.8:  # noqa: PLR2004
+            subdiff = {'R': pos}
+        else:
+            subdiff = {'N': -pos, 'O': pos}
+
+        if pos != src:
+            subdiff['I'] = pos
+        list_diff.append(subdiff)
+        src = pos if 'A' in subdiff else pos + 1
+
+    text_diff = []
+    offset = 0
+    for pos in positions:
+        added = rnd.random() < 0.5  # noqa: PLR2004
+        text_diff.append({'I': [pos, pos + 1, pos + offset, pos + offset]})
+        text_diff.append({'R': str(pos)})
+        if added:
+            text_diff.append({'A': 'x'})
+        else:
+            offset -= 1
+
+    return {'D': list_diff}, {'D': text_diff, 'E': 5}
+
+
+def main():
+    """Run benchmark."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, default=1000000)
+    args = parser.parse_args()
+
+    items = list(range(args.size))
+    text = '\n'.join(map(str, items))
+    list_diff, text_diff = make_diffs(args.size, args.size // 10)
+
+    before = Patcher(
+        handlers=[InsertDeleteListHandler(), InsertDeleteTextHandler()],
+    )
+    after = Patcher()
+    after.set_handler(handlers.TextHandler())
+    results = {}
+
+    print(f'{args.size} items, {args.size // 10} edits')
+    for name, target, diff in (
+        ('list', items, list_diff),
+        ('text', text, text_diff),
+    ):
+        for label, patcher in (('before', before), ('after', after)):
+            start = time.perf_counter()
+            results[label] = patcher.patch(
+                list(target) if name == 'list' else target,
+                diff,
+            )
+            print(f'{name} {label}: {time.perf_counter() - start:.3f}s')
+
+        assert results['before'] == results['after']
+
+
+if __name__ == '__main__':
+    main()
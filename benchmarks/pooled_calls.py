@@ -0,0 +1,48 @@
+"""Per call overhead of diff() and patch() functions for tiny inputs.
+
+Fresh instances per call is what the functions did before pooling.
+
+"""
+
+import timeit
+
+from nested_diff import Differ, Patcher, diff, patch
+
+CALLS = 100000
+
+
+def main():
+    """Run benchmark."""
+    small_a = {'id': 1, 'v': [1, 2]}
+    small_b = {'id': 1, 'v': [1, 3]}
+    scalar_diff = diff(1, 2)
+
+    cases = (
+        (
+            'diff(1, 2)',
+            lambda: Differ().diff(1, 2)[1],
+            lambda: diff(1, 2),
+        ),
+        (
+            'diff(small dict)',
+            lambda: Differ().diff(small_a, small_b)[1],
+            lambda: diff(small_a, small_b),
+        ),
+        (
+            'patch(scalar diff)',
+            lambda: Patcher().patch(1, scalar_diff),
+            lambda: patch(1, scalar_diff),
+        ),
+    )
+
+    print(f'{"":<22}{"fresh":>10}{"pooled":>10}')
+    for name, fresh, pooled in cases:
+        spent = [
+            timeit.timeit(func, number=CALLS) / CALLS * 1e6
+            for func in (fresh, pooled)
+        ]
+        print(f'{name:<22}{spent[0]:>8.1f}us{spent[1]:>8.1f}us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Snapshot stores size and latency for versions of services config."""
+
+import os
+import pickle
+import random
+import statistics
+import tempfile
+import time
+
+from nested_diff.snapshots import DirectoryStore, SqliteStore
+
+SERVICES = 2000
+VERSIONS = 1000
+CHANGED = 5  # services per version
+READS = 100
+
+
+def get_size(path):
+    """Return size of a file or files in a directory."""
+    if os.path.isdir(path):
+        return sum(
+            os.path.getsize(os.path.join(path, name))
+            for name in os.listdir(path)
+        )
+
+    return os.path.getsize(path)
+
+
+def main():
+    """Run benchmark."""
+    for store_cls in (DirectoryStore, SqliteStore):
+        rnd = random.Random(0)
+        config = {
+            f'svc{i}': {
+                'image': f'img:{i}',
+                'replicas': 2,
+                'env': {f'K{j}': str(j) for j in range(10)},
+                'ports': [80, 443],
+            }
+            for i in range(SERVICES)
+        }
+        full_size = 0
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'store')
+
+            start = time.perf_counter()
+            with store_cls(path, keyframe_interval=32) as store:
+                for version in range(VERSIONS):
+                    for _ in range(CHANGED):
+                        service = config[f'svc{rnd.randrange(SERVICES)}']
+                        service['replicas'] += 1
+                        service['env'][f'K{rnd.randrange(12)}'] = str(version)
+
+                    store.put(config)
+                    full_size += len(pickle.dumps(config, -1))
+            put_spent = (time.perf_counter() - start) / VERSIONS
+
+            size = get_size(path)
+            latencies = []
+
+            with store_cls(path) as store:
+                for version in rnd.sample(range(VERSIONS), READS):
+                    start = time.perf_counter()
+                    store.get(version)
+                    latencies.append(time.perf_counter() - start)
+
+        print(
+            f'{store_cls.__name__:<15} size {size / 2**20:.1f}MB, '
+            f'full copies {full_size / 2**20:.1f}MB '
+            f'({full_size / size:.1f}x), '
+            f'get mean {statistics.mean(latencies) * 1e3:.1f}ms '
+            f'max {max(latencies) * 1e3:.1f}ms, '
+            f'put {put_spent * 1e3:.0f}ms',
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -14,11 +14,29 @@
 
 """Recursive diff and patch for nested structures."""
 
+import copy
+import marshal
+import os
 import pickle
+import threading
+from collections import ChainMap
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from hashlib import blake2b
+from itertools import chain, islice
 
 import nested_diff.handlers
 
-__all__ = ['Differ', 'Iterator', 'Patcher', 'diff', 'patch']
+__all__ = [
+    'Differ',
+    'Iterator',
+    'Patcher',
+    'compose',
+    'diff',
+    'fingerprint',
+    'invert',
+    'patch',
+]
 
 __version__ = '1.10.0'
 __author__ = 'Michael Samoglyadov'
@@ -27,6 +45,23 @@ __website__ = 'https://github.com/mr-mixas/Nested-Diff.py'
 
 DEFAULT_HANDLER = nested_diff.handlers.TypeHandler()
 
+_CONTAINER_TYPES = frozenset((dict, frozenset, list, set, tuple))
+_ITEMWISE_HANDLERS = (  # equal objects diffs are not just {'U': obj}
+    nested_diff.handlers.MultisetHandler,
+    nested_diff.handlers.SetHandler,
+)
+_KEYED_HANDLERS = (nested_diff.handlers.KeyedListHandler,)
+_LIST_PATCH_FUNCS = (  # patch lists in place when no items added or removed
+    nested_diff.handlers.ListHandler.patch,
+    nested_diff.handlers.KeyedListHandler.patch,  # same for non keyed diffs
+)
+_POOL = threading.local()  # differs and patchers for diff() and patch()
+_POOL_SIZE = 32
+_SCALAR_TYPES = frozenset((bool, bytes, complex, float, int, type(None)))
+_SEQUENCE_TYPES = frozenset((list, tuple))
+_LEAF_TYPES = _SCALAR_TYPES.union((str,))
+_UNKNOWN = object()  # no fingerprint for an object
+
 TYPE_HANDLERS = (
     nested_diff.handlers.DictHandler(),
     nested_diff.handlers.ListHandler(),
@@ -40,6 +75,27 @@ TYPE_HANDLERS = (
 )
 
 
+class Prepared:
+    """Object prepared by `Differ.prepare` to be diffed many times."""
+
+    __slots__ = ('dumps', 'fingerprints', 'item_keys', 'obj')
+
+    def __init__(self, obj, dumps, item_keys, fingerprints):
+        """Initialize prepared object.
+
+        Args:
+            obj: Prepared object itself.
+            dumps: Precalculated dumps, objects ids are keys.
+            item_keys: Precalculated sequences items keys.
+            fingerprints: Precalculated fingerprints.
+
+        """
+        self.obj = obj
+        self.dumps = dumps
+        self.item_keys = item_keys
+        self.fingerprints = fingerprints
+
+
 class Differ:
     """Compute recursive diff for two passed objects.
 
@@ -109,6 +165,10 @@ class Differ:
         trimR=False,  # noqa: N803
         dumper=None,
         handlers=None,
+        iterative=False,
+        native_eq=False,
+        item_key=None,
+        fingerprints=False,
     ):
         """Initialize Differ.
 
@@ -121,6 +181,26 @@ class Differ:
             trimR: When enabled will replace removed data by None.
             dumper: Optional objects serialiser.
             handlers: A list of type handlers.
+            iterative: Traverse objects using explicit stack instead of
+                recursion. Slower for shallow objects, but nesting depth is
+                limited by available memory only.
+            native_eq: Compare containers (dicts, lists, tuples, sets and
+                frozensets) by `==` first and treat them as unchanged if
+                they are equal. Much faster for mostly equal objects, but
+                handlers are bypassed for such containers, so, for example,
+                `[1]`, `[1.0]` and `[True]` are equal in this mode.
+            item_key: Callable returning sequence item's key used to match
+                items of diffed lists and tuples; get_item_key method is
+                used by default.
+            fingerprints: Treat objects with equal fingerprints (see
+                `fingerprint` function) as unchanged without traversal.
+                Fingerprints are calculated once per diff run (or once for
+                prepared objects), so diff walks changed branches only.
+                Sets and multisets are diffed as usual when unchanged items
+                enabled: their diffs report such items one by one.
+                Fingerprints don't know about handlers, so objects equal for
+                handlers only (NaNs with `nans_equal` for example) are not
+                skipped, but diffed by handlers as usual.
 
         """
         self.op_a = A
@@ -131,12 +211,28 @@ class Differ:
         self.op_trim_r = trimR
 
         self.dump = dumper or pickle.dumps
+        self.dump_calls = 0
+        self.item_key = item_key or self.get_item_key
+        self.native_eq = native_eq
+        self.fingerprints = fingerprints
+        self.quick = False
 
         self._differs = {}
+        self._scoped = {}  # path length: {path: {type: (diff, stepper)}}
+        self._dumps = None  # per run caches, objects ids are keys
+        self._item_keys = None
+        self._fingerprints = None
+        self._itemwise = set()  # types with unchanged items reported apart
+        self._steppers = {}
+        self._iterative = iterative
+        self._quick_differ = None
 
         for handler in TYPE_HANDLERS if handlers is None else handlers:
             self.set_handler(handler)
 
+        if iterative:
+            self.diff = self._diff_iteratively
+
     def diff(self, a, b):
         """Calculate diff for two objects.
 
@@ -152,7 +248,11 @@ class Differ:
             Tuple: equality flag and nested diff.
 
         """
-        if a is b:
+        if self._dumps is None:  # top-level call
+            with self._caches(a, b) as objs:
+                return self.diff(*objs)
+
+        if a is b or (self.fingerprints and self._same_fingerprints(a, b)):
             return True, {'U': a} if self.op_u else {}
 
         differ = self.default_differ
@@ -165,36 +265,897 @@ class Differ:
 
         return differ(self, a, b)
 
-    def set_handler(self, handler):
+    @contextmanager
+    def _caches(self, *objs):
+        """Enable per run caches, drop them when run is over.
+
+        Passed objects are yielded as a list, prepared ones are unwrapped and
+        their caches are looked up after the run's caches (not copied).
+
+        """
+        dumps, item_keys = self._dumps, self._item_keys
+        fingerprints = self._fingerprints
+
+        if dumps is None:  # not a nested run
+            # objects are kept in caches with their keys, so their ids can't
+            # be reused by other objects during the run
+            self._dumps, self._item_keys = {}, {}
+            self._fingerprints = {}
+
+        objs = list(objs)
+        for i, obj in enumerate(objs):
+            if obj.__class__ is Prepared:
+                # read-only layers, new entries go to the run's caches
+                self._dumps = ChainMap(self._dumps, obj.dumps)
+                self._item_keys = ChainMap(self._item_keys, obj.item_keys)
+                self._fingerprints = ChainMap(
+                    self._fingerprints,
+                    obj.fingerprints,
+                )
+                objs[i] = obj.obj
+
+        try:
+            yield objs
+        finally:
+            self._dumps, self._item_keys = dumps, item_keys
+            self._fingerprints = fingerprints
+
+    def _diff_iteratively(self, a, b):
+        """Calculate diff for two objects without recursion.
+
+        Handlers with `diff_stepwise` generators are driven using explicit
+        stack, rest of them called as is.
+
+        Args:
+            a: First object to diff.
+            b: Second object to diff.
+
+        Returns:
+            Tuple: equality flag and nested diff.
+
+        """
+        if self._dumps is None:  # top-level call
+            with self._caches(a, b) as (a, b):  # noqa: PLR1704
+                return self._traverse(a, b, [] if self._scoped else None)
+
+        # nested call from handler without `diff_stepwise`: path is unknown
+        return self._traverse(a, b, None)
+
+    def _traverse(self, a, b, path):  # noqa: C901 PLR0912
+        """Diff objects using explicit stack, track path when list passed."""
+        stack = []
+        steppers = self._steppers
+        pending = True
+        base = 0 if path is None else len(path)
+
+        while True:
+            if pending:
+                scoped = None
+                if path is not None and a.__class__ is b.__class__:
+                    scoped = self._get_scoped_handler(path, a.__class__)
+
+                if a is b or (
+                    self.fingerprints and self._same_fingerprints(a, b)
+                ):
+                    result = True, {'U': a} if self.op_u else {}
+                elif scoped is not None:
+                    if scoped[1] is None:
+                        result = scoped[0](self, a, b)
+                    else:
+                        stack.append(scoped[1](self, a, b))
+                        result = None
+                elif a.__class__ is b.__class__ and a.__class__ in steppers:
+                    stack.append(steppers[a.__class__](self, a, b))
+                    result = None
+                else:
+                    differ = self.default_differ
+                    if a.__class__ is b.__class__:
+                        differ = self._differs.get(a.__class__, differ)
+
+                    result = differ(self, a, b)
+
+            if not stack:
+                return result
+
+            try:
+                key, a, b = stack[-1].send(result)
+                pending = True
+                if path is not None:
+                    del path[base + len(stack) - 1 :]
+                    path.append(key)
+            except StopIteration as stop:
+                stack.pop()
+                result = stop.value
+                pending = False
+
+    def diff_parallel(self, a, b, *, depth=1, executor=None, threads=False):
+        """Calculate diff for two objects using pool of workers.
+
+        Objects are traversed by current process down to `depth` level,
+        subitems found there are diffed by pool workers and their diffs are
+        merged back, so result is the same as returned by `diff` method.
+        Subitems are sent to workers in batches, largest first: idle workers
+        take next batches while huge subtrees are still in progress.
+
+        Handlers with `diff_stepwise` generator are used for traversed
+        levels, such generators are run twice: to collect subitems and to
+        build diff, so items they yield should not depend on sent results
+        (true for all builtin handlers).
+
+        Args:
+            a: First object to diff.
+            b: Second object to diff.
+            depth: Amount of levels traversed by current process.
+            executor: concurrent.futures executor, new ProcessPoolExecutor
+                is used when omitted. Differ (including handlers and
+                item_key callable) and diffed objects should be picklable
+                for process based executors.
+            threads: Use new ThreadPoolExecutor when executor omitted.
+                Nothing is pickled then, but handlers are called from
+                several threads concurrently, so it pays off on free
+                threaded (no GIL) python builds only.
+
+        Returns:
+            Tuple: equality flag and nested diff.
+
+        """
+        if executor is None:
+            pool = ThreadPoolExecutor if threads else ProcessPoolExecutor
+            with pool() as executor:  # noqa: PLR1704
+                return self.diff_parallel(
+                    a,
+                    b,
+                    depth=depth,
+                    executor=executor,
+                )
+
+        with self._caches(a, b) as objs:
+            results = []
+            tasks = []  # (result index, path, a, b)
+            root = self._split(*objs, [], depth, results, tasks)
+
+            sizes = [_get_size(t[2]) + _get_size(t[3]) for t in tasks]
+            limit = sum(sizes) // ((os.cpu_count() or 1) * 8) or 1
+            batches = []
+            batch_size = limit
+
+            order = sorted(
+                range(len(tasks)),
+                key=sizes.__getitem__,
+                reverse=True,
+            )
+
+            for i in order:
+                if batch_size >= limit:
+                    batches.append([])
+                    batch_size = 0
+                batches[-1].append(tasks[i])
+                batch_size += sizes[i]
+
+            # caches are keyed by ids, so they are meaningful for threads only
+            shared = isinstance(executor, ThreadPoolExecutor)
+            futures = [  # own differ per batch: runs may be concurrent
+                (
+                    batch,
+                    executor.submit(
+                        _diff_batch,
+                        self._fork(shared_caches=shared),
+                        batch,
+                    ),
+                )
+                for batch in batches
+            ]
+
+            for batch, future in futures:
+                for task, result in zip(batch, future.result()):
+                    results[task[0]] = result
+
+            return self._merge(root, results)
+
+    def _split(self, a, b, path, depth, results, tasks):  # noqa: PLR0913
+        """Collect subitems to diff, return tree of traversed objects."""
+        if a is b or (self.fingerprints and self._same_fingerprints(a, b)):
+            results.append((True, {'U': a} if self.op_u else {}))
+            return len(results) - 1
+
+        stepper = None
+        if a.__class__ is b.__class__:
+            scoped = None
+            if self._scoped:
+                scoped = self._get_scoped_handler(path, a.__class__)
+
+            if scoped is None:
+                stepper = self._steppers.get(a.__class__)
+            else:
+                stepper = scoped[1]
+
+        if depth < 1 or stepper is None:
+            results.append(None)  # not known yet
+            tasks.append((len(results) - 1, tuple(path), a, b))
+            return len(results) - 1
+
+        children = []
+        steps = stepper(self, a, b)
+
+        try:
+            key, old, new = next(steps)
+            while True:
+                children.append(
+                    self._split(
+                        old,
+                        new,
+                        [*path, key],
+                        depth - 1,
+                        results,
+                        tasks,
+                    ),
+                )
+                key, old, new = steps.send((True, {}))
+        except StopIteration:
+            pass
+
+        return stepper, a, b, children
+
+    def _merge(self, node, results):
+        """Build diff for tree of traversed objects."""
+        if node.__class__ is int:
+            return results[node]
+
+        stepper, a, b, children = node
+        steps = stepper(self, a, b)
+
+        try:
+            next(steps)
+            for child in children:
+                steps.send(self._merge(child, results))
+        except StopIteration as stop:
+            return stop.value
+
+        raise RuntimeError('stepwise diff yields inconsistent subitems')
+
+    def equal(self, a, b):
+        """Check objects are equal.
+
+        Same as diff, but no diff is built and comparison stops on first
+        found difference. Handlers are informed about such mode by `quick`
+        differ's attribute and may return as soon as inequality revealed.
+
+        Args:
+            a: First object to compare.
+            b: Second object to compare.
+
+        Returns:
+            True when objects are equal, False otherwise.
+
+        >>> Differ().equal({'one': [1, 2]}, {'one': [1, 2]})
+        True
+        >>> Differ().equal({'one': [1, 2]}, {'one': [1, 3]})
+        False
+        >>>
+
+        """
+        if self._quick_differ is None:
+            differ = self._fork()
+            differ.op_a = differ.op_n = differ.op_o = False
+            differ.op_r = differ.op_u = False
+            differ.quick = True
+
+            self._quick_differ = differ
+
+        return self._quick_differ.diff(a, b)[0]
+
+    def _fork(self, *, shared_caches=False):
+        """Return copy of differ with own per run state and shared handlers.
+
+        Current run's caches are read (but not extended) by the copy when
+        `shared_caches` is True.
+
+        """
+        differ = copy.copy(self)
+        differ._dumps = differ._item_keys = None  # noqa: SLF001
+        differ._fingerprints = differ._quick_differ = None  # noqa: SLF001
+
+        if shared_caches:
+            differ._dumps = ChainMap({}, self._dumps)  # noqa: SLF001
+            differ._item_keys = ChainMap({}, self._item_keys)  # noqa: SLF001
+            differ._fingerprints = ChainMap({}, self._fingerprints)  # noqa: SLF001
+
+        if self.item_key == self.get_item_key:  # bound to original's caches
+            differ.item_key = differ.get_item_key
+        if self._iterative:
+            differ.diff = differ._diff_iteratively  # noqa: SLF001
+
+        return differ
+
+    def prepare(self, obj):
+        """Prepare object to be diffed many times.
+
+        Keys for all lists and tuples items, dumps of objects with
+        unsupported types and, in fingerprints mode, fingerprints are
+        calculated once and reused by every diff with returned object on any
+        side. Prepared object should be diffed by the
+        same differ (or differ with the same dumper) and must not be changed.
+
+        Args:
+            obj: Object to prepare.
+
+        Returns:
+            Prepared object, wrapper for passed one.
+
+        >>> differ = Differ(U=False)
+        >>> golden = differ.prepare({'hosts': ['a', 'b', 'c']})
+        >>>
+        >>> differ.diff(golden, {'hosts': ['a', 'c']})
+        (False, {'D': {'hosts': {'D': [{'R': 'b', 'I': 1}]}}})
+        >>> differ.diff({'hosts': ['a', 'b', 'c']}, golden)
+        (True, {})
+        >>>
+
+        """
+        item_key = self.item_key
+        if item_key != self.get_item_key:  # custom keys are not cached
+            item_key = None
+
+        with self._caches():
+            stack = [obj]
+            seen = set()
+
+            while stack:
+                sub = stack.pop()
+                if id(sub) in seen:
+                    continue
+                seen.add(id(sub))
+
+                cls = sub.__class__
+                if cls is dict:
+                    stack.extend(sub.values())
+                elif cls in _CONTAINER_TYPES:
+                    if item_key is not None and cls in _SEQUENCE_TYPES:
+                        for item in sub:
+                            item_key(item)
+                    stack.extend(sub)
+                elif cls not in _SCALAR_TYPES and cls is not str:
+                    self.get_dump(sub)
+
+            if self.fingerprints:
+                _get_fingerprint(obj, self._fingerprints)
+
+            return Prepared(
+                obj,
+                self._dumps,
+                self._item_keys,
+                self._fingerprints,
+            )
+
+    def _same_fingerprints(self, a, b):
+        """Return True if objects fingerprints are known and equal."""
+        if a.__class__ is not b.__class__ or a.__class__ in _SCALAR_TYPES:
+            return False
+
+        if a.__class__ is str or (self.op_u and a.__class__ in self._itemwise):
+            return False
+
+        fingerprint = _get_fingerprint(a, self._fingerprints)
+
+        return fingerprint is not _UNKNOWN and fingerprint == _get_fingerprint(
+            b,
+            self._fingerprints,
+        )
+
+    def get_item_key(self, item):
+        """Return key for sequence item.
+
+        Keys are used to match items of diffed sequences: equal items must
+        have equal keys, while different items should have different ones.
+        Strings are keys by themselves, other scalars are accompanied by their
+        types (thus 1, 1.0 and True keys are different), containers are hashed
+        using their serialized (marshal) form or, when not possible, using
+        their items keys. Differ's dumper is used for the rest of types.
+        Containers keys are cached during diff run.
+
+        Args:
+            item: Object to get key for.
+
+        Returns:
+            Hashable key.
+
+        """
+        cls = item.__class__
+
+        if cls is str:
+            return item
+
+        if cls in _SCALAR_TYPES:
+            return cls, item
+
+        if cls not in _CONTAINER_TYPES:
+            return self.get_dump(item)
+
+        keys = self._item_keys
+        if keys is not None and id(item) in keys:
+            return keys[id(item)][1]
+
+        try:
+            key = hash(marshal.dumps(item, 2))
+        except ValueError:  # unsupported items or too deep nesting
+            return self._get_structural_key(item)
+
+        if keys is not None:
+            keys[id(item)] = item, key
+
+        return key
+
+    def get_dump(self, obj):
+        """Return serialized object.
+
+        Differ's dumper is used for serialization, results are cached during
+        diff run.
+
+        Args:
+            obj: Object to serialize.
+
+        Returns:
+            Serialized object.
+
+        """
+        dumps = self._dumps
+        if dumps is not None and id(obj) in dumps:
+            return dumps[id(obj)][1]
+
+        self.dump_calls += 1
+        dump = self.dump(obj)
+
+        if dumps is not None:
+            dumps[id(obj)] = obj, dump
+
+        return dump
+
+    def _get_structural_key(self, item):  # noqa: C901 PLR0912
+        """Compose container's key from it's items keys without recursion."""
+        keys = {} if self._item_keys is None else self._item_keys
+        visiting = set()
+        stack = [item]
+
+        while stack:
+            obj = stack[-1]
+            if id(obj) in keys:  # same object met several times
+                stack.pop()
+                continue
+
+            visiting.add(id(obj))
+            cls = obj.__class__
+            depth = len(stack)
+            subkeys = []
+
+            items = chain.from_iterable(obj.items()) if cls is dict else obj
+
+            for sub in items:
+                subcls = sub.__class__
+
+                if subcls is str:
+                    subkeys.append(sub)
+                elif subcls in _SCALAR_TYPES:
+                    subkeys.append((subcls, sub))
+                elif subcls not in _CONTAINER_TYPES:
+                    subkeys.append(self.get_dump(sub))
+                elif id(sub) in keys:
+                    subkeys.append(keys[id(sub)][1])
+                elif id(sub) in visiting:  # recursive reference
+                    subkeys.append(None)
+                else:
+                    stack.append(sub)
+
+            if len(stack) > depth:
+                continue  # come back when all subitems keys are known
+
+            if cls is dict:
+                key = hash((cls, frozenset(zip(subkeys[::2], subkeys[1::2]))))
+            elif cls is set or cls is frozenset:
+                key = hash((cls, frozenset(subkeys)))
+            else:
+                key = hash((cls, *subkeys))
+
+            keys[id(obj)] = obj, key
+            visiting.discard(id(obj))
+            stack.pop()
+
+        return keys[id(item)][1]
+
+    def iter_diff(self, a, b):
+        """Generate diff for two objects as a flat stream of changes.
+
+        Unlike `diff` method, no nested diff is built: each change is yielded
+        as soon as it is discovered. Items added to or removed from containers
+        are yielded when container traversal finished. Diffs which can't be
+        split further (sets, texts, custom handlers without `diff_stepwise`
+        generator) are yielded with `D` tag and whole subdiff as a value.
+        Unchanged items moved within keyed lists are yielded with `I` tag and
+        their old and new indexes as a value.
+
+        Args:
+            a: First object to diff.
+            b: Second object to diff.
+
+        Yields:
+            Tuples with path (tuple of keys/indexes), tag and value.
+
+        >>> a = {'one': [1, 2], 'two': 2}
+        >>> b = {'one': [1, 3], 'three': 3}
+        >>>
+        >>> for event in sorted(Differ(U=False).iter_diff(a, b)):
+        ...     print(event)
+        (('one', 1), 'N', 3)
+        (('one', 1), 'O', 2)
+        (('three',), 'A', 3)
+        (('two',), 'R', 2)
+        >>>
+
+        """
+        # per run state is kept by a fork, so partly consumed generator
+        # doesn't affect other calls of this differ
+        differ = self._fork()
+        differ.dump_calls = 0
+
+        try:
+            with differ._caches(a, b) as objs:  # noqa: SLF001
+                yield from differ._iter_diff(*objs)  # noqa: SLF001
+        finally:
+            self.dump_calls += differ.dump_calls
+
+    def _iter_diff(self, a, b):  # noqa: C901 PLR0912
+        """Generate diff events, see iter_diff for details."""
+        stack = []  # generators and flags is anything yielded by them
+        path = []
+        steppers = self._steppers
+
+        while True:
+            scoped = None
+            if self._scoped and a.__class__ is b.__class__:
+                scoped = self._get_scoped_handler(path, a.__class__)
+
+            if a is b or (self.fingerprints and self._same_fingerprints(a, b)):
+                result = True, {'U': a} if self.op_u else {}
+            elif scoped is not None:
+                if scoped[1] is None:
+                    result = scoped[0](self, a, b)
+                else:
+                    stack.append([scoped[1](self, a, b), False])
+                    result = None
+            elif a.__class__ is b.__class__ and a.__class__ in steppers:
+                stack.append([steppers[a.__class__](self, a, b), False])
+                result = None
+            else:
+                differ = self.default_differ
+                if a.__class__ is b.__class__:
+                    differ = self._differs.get(a.__class__, differ)
+
+                result = differ(self, a, b)
+
+            if result is not None:
+                yield from self._generate_events(path, result[1])
+                result = result[0], {}  # already emitted
+
+            while stack:
+                frame = stack[-1]
+
+                if result is not None:
+                    path.pop()
+
+                try:
+                    key, a, b = frame[0].send(result)
+                except StopIteration as stop:
+                    stack.pop()
+
+                    equal, diff = stop.value
+                    if 'D' in diff:
+                        yield from self._generate_own_events(path, diff)
+                    elif not frame[1]:  # otherwise reported by subitems
+                        yield from self._generate_events(path, diff)
+
+                    result = equal, {}
+                    continue
+
+                frame[1] = True
+                path.append(key)
+                break
+
+            if not stack:
+                return
+
+    @staticmethod
+    def _generate_events(path, diff):
+        """Generate changes for final (not traversed) diff."""
+        if 'D' in diff:
+            yield tuple(path), 'D', diff
+            return
+
+        for tag in ('R', 'O', 'N', 'A', 'U'):
+            try:
+                yield tuple(path), tag, diff[tag]
+            except KeyError:  # noqa: PERF203
+                pass
+
+    def _generate_own_events(self, path, diff):
+        """Generate changes for container's own items (added, removed)."""
+        items = diff['D']
+
+        if items.__class__ is dict:
+            for key, subdiff in items.items():
+                yield from self._generate_events((*path, key), subdiff)
+            return
+
+        if not isinstance(items, (list, tuple)):
+            yield from self._generate_events(path, diff)
+            return
+
+        idx = 0
+        for subdiff in items:
+            try:
+                idx = subdiff['I']
+            except KeyError:
+                pass
+            else:
+                if idx.__class__ is list:  # old and new index, keyed lists
+                    if len(subdiff) == 1:  # moved, but not changed
+                        yield (*path, idx[1]), 'I', idx
+                        continue
+                    idx = idx[0] if idx[1] is None else idx[1]
+
+            yield from self._generate_events((*path, idx), subdiff)
+
+            if 'A' not in subdiff:
+                idx += 1
+
+    @staticmethod
+    def _get_stepwise_differ(handler):
+        """Return handler's diff generator if it is consistent with diff."""
+        if handler.diff_stepwise is None or 'diff' in vars(handler):
+            return None
+
+        mro = handler.__class__.__mro__
+        diff_owner = next(c for c in mro if 'diff' in vars(c))
+        stepwise_owner = next(c for c in mro if 'diff_stepwise' in vars(c))
+
+        if issubclass(stepwise_owner, diff_owner):
+            return handler.diff_stepwise
+
+        return None  # diff overridden, generator is not relevant anymore
+
+    def _get_scoped_handler(self, path, cls):
+        """Return diff method and generator of handler scoped by path."""
+        for pattern, handlers in self._scoped.get(len(path), {}).items():
+            if cls in handlers and all(
+                p is ... or p == k for p, k in zip(pattern, path)
+            ):
+                return handlers[cls]
+
+        return None
+
+    def set_handler(self, handler, path=None):
         """Set handler.
 
         Args:
             handler: Instance of handlers.TypeHandler.
+            path: Use handler only for objects with this path (tuple of
+                keys and indexes, `...` matches any key or index). Path
+                scoped handlers take precedence over generic ones. Paths
+                are tracked using iterative traversal (see Differ's
+                `iterative` option), it is enabled when such handler set.
+
+        >>> from nested_diff import Differ, handlers
+        >>>
+        >>> a = {'users': [{'name': 'one'}, {'name': 'two', 'age': 20}]}
+        >>> b = {'users': [{'name': 'two', 'age': 21}]}
+        >>>
+        >>> differ = Differ(O=False, U=False)
+        >>> differ.set_handler(
+        ...     handlers.KeyedListHandler(key='name'),
+        ...     path=('users',),
+        ... )
+        >>> differ.diff(a, b)
+        (False,
+         {'D': {'users': {'D': [{'D': {'age': {'N': 21}}, 'I': [1, 0]},
+                                {'R': {'name': 'one'}, 'I': [0, None]}],
+                          'E': 6}}})
+        >>>
 
         """
+        self._quick_differ = None  # will be recreated using actual handlers
+
+        if isinstance(handler, _ITEMWISE_HANDLERS):
+            self._itemwise.add(handler.handled_type)
+        elif path is None:
+            self._itemwise.discard(handler.handled_type)
+
+        if path is not None:
+            path = tuple(path)
+            self._scoped.setdefault(len(path), {}).setdefault(path, {})[
+                handler.handled_type
+            ] = handler.diff, self._get_stepwise_differ(handler)
+
+            self._iterative = True
+            self.diff = self._diff_iteratively
+            return
+
         self._differs[handler.handled_type] = handler.diff
 
+        stepwise_differ = self._get_stepwise_differ(handler)
+        if stepwise_differ is None:
+            self._steppers.pop(handler.handled_type, None)
+        else:
+            self._steppers[handler.handled_type] = stepwise_differ
+
+
+def _diff_batch(differ, tasks):
+    """Diff batch of subitems, pool worker's function."""
+    with differ._caches():  # noqa: SLF001
+        return [
+            differ._traverse(a, b, list(path) if differ._scoped else None)  # noqa: SLF001
+            for _, path, a, b in tasks
+        ]
+
+
+def _get_fingerprint(obj, cache):  # noqa: C901 PLR0912
+    """Calculate fingerprint wrapped by tuple, _UNKNOWN when not possible.
+
+    Fingerprints for containers and custom objects are cached by their ids.
+
+    """
+    if obj.__class__ not in _CONTAINER_TYPES:
+        sub = _get_leaf_fingerprint(obj, cache)
+        return sub if sub is _UNKNOWN else (_hash(obj.__class__, sub),)
+
+    visiting = set()
+    stack = [obj]
+
+    while stack:
+        cur = stack[-1]
+        if id(cur) in cache:  # same object met several times
+            stack.pop()
+            continue
+
+        visiting.add(id(cur))
+        cls = cur.__class__
+        depth = len(stack)
+        subs = []
+
+        for sub in chain.from_iterable(cur.items()) if cls is dict else cur:
+            if sub.__class__ in _LEAF_TYPES and sub == sub:  # noqa: PLR0124
+                subs.append(sub)  # inlined _get_leaf_fingerprint
+            elif sub.__class__ not in _CONTAINER_TYPES:
+                subs.append(_get_leaf_fingerprint(sub, cache))
+            elif id(sub) in cache:
+                subs.append(cache[id(sub)][1])
+            elif id(sub) in visiting:  # recursive reference
+                subs.append(_UNKNOWN)
+            else:
+                stack.append(sub)
+
+        if len(stack) > depth:
+            continue  # come back when all subitems fingerprints are known
+
+        if _UNKNOWN in subs:
+            fingerprint = _UNKNOWN
+        elif cls is dict:
+            pairs = _sort(list(zip(subs[::2], subs[1::2])))
+            fingerprint = (_hash(cls, pairs),)
+        elif cls is set or cls is frozenset:
+            fingerprint = (_hash(cls, _sort(subs)),)
+        else:
+            fingerprint = (_hash(cls, subs),)
+
+        cache[id(cur)] = cur, fingerprint
+        visiting.discard(id(cur))
+        stack.pop()
+
+    return cache[id(obj)][1]
+
+
+def _get_leaf_fingerprint(obj, cache):
+    """Return marshallable representation of a leaf object or _UNKNOWN.
+
+    Builtin scalars and strings represent themselves (marshal keeps their
+    types), other objects are represented by hashed fingerprints provided by
+    their hook, wrapped by tuple just like containers fingerprints.
+
+    """
+    cls = obj.__class__
+
+    if cls in _LEAF_TYPES:
+        return obj if obj == obj else _UNKNOWN  # noqa: PLR0124 NaNs
+
+    if id(obj) in cache:
+        return cache[id(obj)][1]
+
+    fingerprint = _UNKNOWN
+    hook = getattr(cls, '__nested_diff_fingerprint__', None)
+
+    if hook is not None:
+        data = hook(obj)
+        if data is not None:
+            fingerprint = (_hash(cls, data),)
+
+    cache[id(obj)] = obj, fingerprint
+
+    return fingerprint
+
+
+def _hash(cls, data):
+    """Return stable hash for type and marshallable data."""
+    return blake2b(
+        b''.join(
+            (cls.__module__.encode(), b'.', cls.__qualname__.encode(), b':'),
+        )
+        + marshal.dumps(data, 2),
+        digest_size=16,
+    ).digest()
+
+
+def _sort(items):
+    """Sort fingerprints, use their serialized form for mixed types."""
+    try:
+        items.sort()
+    except TypeError:
+        items.sort(key=lambda x: marshal.dumps(x, 2))
+
+    return items
+
+
+def _get_size(obj):
+    """Return approximate size of object."""
+    try:
+        return len(obj) + 1
+    except TypeError:
+        return 1
+
 
 class Patcher:
     """Patch objects using nested diff."""
 
+    default_checker = DEFAULT_HANDLER.check
     default_patcher = DEFAULT_HANDLER.patch
 
-    def __init__(self, handlers=None):
+    def __init__(
+        self,
+        handlers=None,
+        *,
+        copy_on_write=False,
+        transactional=False,
+    ):
         """Initialize Patcher.
 
         Args:
             handlers: List of type handlers.
+            copy_on_write: Do not change target, return patched copy instead.
+                Only containers on changed paths are copied, the rest is
+                shared with target.
+            transactional: Revert changes made to the target when patching
+                fails. Changes are journaled, so it costs proportionally to
+                the diff size instead of a deepcopy of the target.
 
         """
+        self.copy_on_write = copy_on_write
+        self.transactional = transactional
+
+        self.journal = None  # undo callables, set per transactional run
+
         self._patchers_by_cls = {}
         self._patchers_by_ext = {}
+        self._checkers_by_cls = {}
+        self._checkers_by_ext = {}
+        self._composers_by_cls = {}
+        self._composers_by_ext = {}
+        self._inverters_by_cls = {}
+        self._inverters_by_ext = {}
+        self._keyed_exts = set()  # composed with non keyed list diffs too
 
         for handler in TYPE_HANDLERS if handlers is None else handlers:
             self.set_handler(handler)
 
         if handlers is None:
             self.set_handler(nested_diff.handlers.TextHandler())
+            self.set_handler(nested_diff.handlers.MultisetHandler())
+            self.set_handler(nested_diff.handlers.KeyedListHandler())
 
     def patch(self, target, ndiff):
         """Patch object using nested diff.
@@ -212,12 +1173,296 @@ class Patcher:
         Raises:
             ValueError: Unsupported patch type passed.
 
+        """
+        if (
+            self.transactional
+            and self.journal is None
+            and not self.copy_on_write
+        ):
+            with self._transaction():
+                return self.patch(target, ndiff)
+
+        if 'D' in ndiff:
+            return self._get_patcher(ndiff)(self, target, ndiff)
+
+        return self.default_patcher(self, target, ndiff)
+
+    def _get_patcher(self, ndiff):
+        """Return appropriate handler's patch method for nested diff."""
+        try:
+            extension_id = ndiff['E']
+            try:
+                return self._patchers_by_ext[extension_id]
+            except KeyError:
+                raise ValueError(
+                    f'unsupported extension: {extension_id}',
+                ) from None
+        except KeyError:
+            cls = ndiff['D'].__class__
+
+            try:
+                return self._patchers_by_cls[cls]
+            except KeyError:
+                raise ValueError(
+                    f'unsupported patch type: {cls.__name__}',
+                ) from None
+
+    def check(self, target, ndiff, *, find_all=False):
+        """Check object may be patched by nested diff cleanly.
+
+        Nothing is changed or copied. Old, removed and unchanged values
+        should match target ones, changed keys and indexes should exist in
+        target, added dict keys should not, text hunks should match target
+        lines.
+
+        Args:
+            target: Object to check.
+            ndiff: Nested diff.
+            find_all: Search for all conflicts, not only the first one.
+
+        Returns:
+            List of paths (lists of keys and indexes) to conflicting values,
+            empty when diff may be applied cleanly.
+
+        Raises:
+            ValueError: Unsupported diff type passed.
+
+        """
+        conflicts = self.iter_conflicts(target, ndiff)
+
+        if find_all:
+            return list(conflicts)
+
+        return list(islice(conflicts, 1))
+
+    def iter_conflicts(self, target, ndiff):
+        """Iterate over conflicts between object and nested diff.
+
+        This method calls appropriate handler's `check` method according to
+        the diff type.
+
+        Args:
+            target: Object to check.
+            ndiff: Nested diff.
+
+        Returns:
+            Iterator over paths to conflicting values.
+
+        Raises:
+            ValueError: Unsupported diff type passed.
+
+        """
+        if 'D' in ndiff:
+            try:
+                extension_id = ndiff['E']
+                try:
+                    checker = self._checkers_by_ext[extension_id]
+                except KeyError:
+                    raise ValueError(
+                        f'unsupported extension: {extension_id}',
+                    ) from None
+            except KeyError:
+                cls = ndiff['D'].__class__
+
+                try:
+                    checker = self._checkers_by_cls[cls]
+                except KeyError:
+                    raise ValueError(
+                        f'unsupported diff type: {cls.__name__}',
+                    ) from None
+
+            return checker(self, target, ndiff)
+
+        return self.default_checker(self, target, ndiff)
+
+    def compile(self, ndiff):
+        """Compile nested diff into plan to patch many targets by it.
+
+        Nested dicts and lists patched in place are flattened into groups of
+        operations by paths of their containers, handlers for the rest of
+        subdiffs are resolved once, so patching by plan does not walk the
+        diff again. Plans made by copy-on-write or transactional patchers
+        just call `patch` method.
+
+        Args:
+            ndiff: Nested diff.
+
+        Returns:
+            PatchPlan object.
+
+        Raises:
+            ValueError: Unsupported patch type passed.
+
+        """
+        if (
+            self.copy_on_write
+            or self.transactional
+            or self._get_flat_items(ndiff) is None
+        ):
+            return PatchPlan(self, [], ndiff)
+
+        groups = []
+        self._compile(ndiff, (), groups)
+
+        return PatchPlan(self, groups)
+
+    def _compile(self, ndiff, path, groups):
+        """Append groups of operations for nested diff and its subdiffs."""
+        removed = []
+        assigned = []
+        patched = []
+
+        for key, subdiff in self._get_flat_items(ndiff):
+            if 'N' in subdiff:
+                assigned.append((key, subdiff['N']))
+            elif 'D' in subdiff:
+                if self._get_flat_items(subdiff) is None:
+                    patcher = self._get_patcher(subdiff)
+                    patched.append((key, patcher, subdiff))
+                else:
+                    self._compile(subdiff, (*path, key), groups)
+            elif 'A' in subdiff:
+                assigned.append((key, subdiff['A']))
+            elif 'R' in subdiff:
+                removed.append(key)
+
+        if removed or assigned or patched:
+            groups.append((path, removed, assigned, patched))
+
+    def _get_flat_items(self, ndiff):
+        """Return keys and subdiffs of diff patched in place, None if not.
+
+        Only diffs patched by builtin dict and list handlers are flattened.
+
+        """
+        if 'D' not in ndiff or 'E' in ndiff:
+            return None
+
+        func = getattr(self._get_patcher(ndiff), '__func__', None)
+
+        if func is nested_diff.handlers.DictHandler.patch:
+            return ndiff['D'].items()
+
+        if func not in _LIST_PATCH_FUNCS or any(
+            'A' in i or 'R' in i for i in ndiff['D']
+        ):
+            return None
+
+        items = []
+        i = 0
+        for subdiff in ndiff['D']:
+            if 'I' in subdiff:
+                i = subdiff['I']
+            items.append((i, subdiff))
+            i += 1
+
+        return items
+
+    def compose(self, a, b):  # noqa: C901 PLR0911 PLR0912
+        """Compose two sequential nested diffs into one.
+
+        Patching by returned diff gives the same result as patching by the
+        first diff and then by the second one. Old values of the resulting
+        diff are taken from the first diff when available.
+
+        Args:
+            a: First nested diff.
+            b: Nested diff to apply after the first one.
+
+        Returns:
+            Nested diff.
+
+        Raises:
+            ValueError: Incompatible or unsupported diffs passed.
+
+        """
+        if not b or 'U' in b:
+            return a
+
+        if not a or 'U' in a:
+            return b
+
+        if 'R' in a:
+            if 'A' in b:
+                return {'N': b['A'], 'O': a['R']}
+            raise ValueError('unable to compose diffs for removed object')
+
+        if 'A' in b:
+            raise ValueError('unable to compose diffs for existing object')
+
+        if 'R' in b:
+            if 'A' in a:
+                return {}
+            return {'R': a.get('O', b['R'])}
+
+        if 'A' in a:
+            if 'N' in b:
+                return {'A': b['N']}
+            return {'A': self.patch(copy.deepcopy(a['A']), b)}
+
+        if 'N' in a or 'N' in b:
+            try:
+                diff = {'N': b['N']}
+            except KeyError:
+                diff = {'N': self.patch(copy.deepcopy(a['N']), b)}
+
+            if 'O' in a:
+                diff['O'] = a['O']
+            return diff
+
+        if 'D' not in a or 'D' not in b:
+            raise ValueError(
+                'unable to compose diffs without new values or subdiffs',
+            )
+
+        ext_a, ext_b = a.get('E'), b.get('E')
+        if ext_a is None and ext_b in self._keyed_exts:
+            ext_a = ext_b  # keyed list handlers compose non keyed diffs too
+        elif ext_b is None and ext_a in self._keyed_exts:
+            ext_b = ext_a
+
+        if ext_a != ext_b or a['D'].__class__ is not b['D'].__class__:
+            raise ValueError('unable to compose diffs for different types')
+
+        if ext_b is not None:
+            try:
+                composer = self._composers_by_ext[ext_b]
+            except KeyError:
+                raise ValueError(f'unsupported extension: {ext_b}') from None
+        else:
+            cls = b['D'].__class__
+
+            try:
+                composer = self._composers_by_cls[cls]
+            except KeyError:
+                raise ValueError(
+                    f'unsupported diff type: {cls.__name__}',
+                ) from None
+
+        return composer(self, a, b)
+
+    def invert(self, ndiff):
+        """Invert nested diff.
+
+        Patching by returned diff reverts changes made by the passed one.
+        Diff should contain old values (made with enabled `O` and `R` ops
+        and disabled `trimR`).
+
+        Args:
+            ndiff: Nested diff.
+
+        Returns:
+            Nested diff.
+
+        Raises:
+            ValueError: Unsupported or incomplete diff passed.
+
         """
         if 'D' in ndiff:
             try:
                 extension_id = ndiff['E']
                 try:
-                    patcher = self._patchers_by_ext[extension_id]
+                    inverter = self._inverters_by_ext[extension_id]
                 except KeyError:
                     raise ValueError(
                         f'unsupported extension: {extension_id}',
@@ -226,15 +1471,43 @@ class Patcher:
                 cls = ndiff['D'].__class__
 
                 try:
-                    patcher = self._patchers_by_cls[cls]
+                    inverter = self._inverters_by_cls[cls]
                 except KeyError:
                     raise ValueError(
-                        f'unsupported patch type: {cls.__name__}',
+                        f'unsupported diff type: {cls.__name__}',
                     ) from None
 
-            return patcher(self, target, ndiff)
+            return inverter(self, ndiff)
 
-        return self.default_patcher(self, target, ndiff)
+        if 'A' in ndiff:
+            return {'R': ndiff['A']}
+
+        if 'R' in ndiff:
+            return {'A': ndiff['R']}
+
+        if 'N' in ndiff or 'O' in ndiff:
+            try:
+                return {'N': ndiff['O'], 'O': ndiff['N']}
+            except KeyError:
+                raise ValueError(
+                    'unable to invert diff without old or new value',
+                ) from None
+
+        return ndiff
+
+    @contextmanager
+    def _transaction(self):
+        """Revert journaled changes on failure."""
+        self.journal = []
+
+        try:
+            yield
+        except BaseException:
+            for undo in reversed(self.journal):
+                undo()
+            raise
+        finally:
+            self.journal = None
 
     def set_handler(self, handler):
         """Set handler.
@@ -244,9 +1517,102 @@ class Patcher:
 
         """
         self._patchers_by_cls[handler.handled_type] = handler.patch
+        self._checkers_by_cls[handler.handled_type] = handler.check
+        self._composers_by_cls[handler.handled_type] = handler.compose
+        self._inverters_by_cls[handler.handled_type] = handler.invert
 
         if handler.extension_id is not None:
             self._patchers_by_ext[handler.extension_id] = handler.patch
+            self._checkers_by_ext[handler.extension_id] = handler.check
+            self._composers_by_ext[handler.extension_id] = handler.compose
+            self._inverters_by_ext[handler.extension_id] = handler.invert
+
+            if isinstance(handler, _KEYED_HANDLERS):
+                self._keyed_exts.add(handler.extension_id)
+            else:
+                self._keyed_exts.discard(handler.extension_id)
+
+
+class PatchPlan:
+    """Nested diff compiled by `Patcher.compile` to patch many targets."""
+
+    __slots__ = ('groups', 'ndiff', 'patcher')
+
+    def __init__(self, patcher, groups, ndiff=None):
+        """Initialize patch plan.
+
+        Args:
+            patcher: Patcher the plan compiled by.
+            groups: List of tuples: path to container, keys to remove, keys
+                and values to assign, keys, handlers' patch methods and
+                subdiffs to patch values by.
+            ndiff: Nested diff to patch by when it was not flattened.
+
+        """
+        self.patcher = patcher
+        self.groups = groups
+        self.ndiff = ndiff
+
+    def patch(self, target):
+        """Patch object by plan.
+
+        Args:
+            target: Object to patch.
+
+        Returns:
+            Patched object.
+
+        """
+        if self.ndiff is not None:
+            return self.patcher.patch(target, self.ndiff)
+
+        patcher = self.patcher
+
+        for path, removed, assigned, patched in self.groups:
+            container = target
+            for key in path:
+                container = container[key]
+
+            for key in removed:
+                del container[key]
+            for key, value in assigned:
+                container[key] = value
+            for key, patch, subdiff in patched:
+                container[key] = patch(patcher, container[key], subdiff)
+
+        return target
+
+    def patch_many(self, targets, *, executor=None):
+        """Patch list of objects by plan.
+
+        Args:
+            targets: List of objects to patch.
+            executor: concurrent.futures executor to patch by pool of
+                workers, targets are patched one by one by current thread
+                when omitted. Targets are sent to workers in batches, plan
+                and targets should be picklable for process based executors
+                and patched copies are returned then, targets themselves
+                stay unchanged.
+
+        Returns:
+            List of patched objects.
+
+        """
+        if executor is None:
+            return [self.patch(target) for target in targets]
+
+        size = len(targets) // ((os.cpu_count() or 1) * 8) or 1
+        futures = [
+            executor.submit(_patch_batch, self, targets[i : i + size])
+            for i in range(0, len(targets), size)
+        ]
+
+        return [obj for future in futures for obj in future.result()]
+
+
+def _patch_batch(plan, targets):
+    """Patch batch of targets, pool worker's function."""
+    return [plan.patch(target) for target in targets]
 
 
 class Iterator:
@@ -270,6 +1636,10 @@ class Iterator:
         for handler in TYPE_HANDLERS if handlers is None else handlers:
             self.set_handler(handler)
 
+        if handlers is None:
+            self.set_handler(nested_diff.handlers.MultisetHandler())
+            self.set_handler(nested_diff.handlers.KeyedListHandler())
+
     def _get_iterator(self, ndiff):
         """Return appropriate iterator for passed nested diff."""
         try:
@@ -314,6 +1684,94 @@ class Iterator:
 
             stack.append(self._get_iterator(subdiff))
 
+    def iterate_paths(
+        self,
+        ndiff,
+        *,
+        paths=None,
+        prune=None,
+        max_depth=None,
+        changed_only=False,
+    ):
+        """Iterate over nested diff tracking paths.
+
+        Skipped subdiffs are not traversed at all, so filters are much
+        cheaper than checking paths of all iterated diffs.
+
+        Args:
+            ndiff: Nested diff to iterate.
+            paths: Iterable of path patterns (tuples of keys and indexes,
+                `...` matches any key or index), only subdiffs with matching
+                paths and their subdiffs are yielded.
+            prune: Callable, called with path and subdiff for each nested
+                diff, subdiff is skipped when it returns true.
+            max_depth: Subdiffs deeper than this are skipped, ones at this
+                depth are yielded as leaves.
+            changed_only: Skip unchanged subdiffs, yield leaves only.
+
+        Yields:
+            Tuples with path (tuple of keys and indexes) and diff.
+
+        >>> from nested_diff import Iterator, diff
+        >>>
+        >>> a = {'spec': {'replicas': 1, 'image': 'app:1'}, 'status': 'ok'}
+        >>> b = {'spec': {'replicas': 2, 'image': 'app:1'}, 'status': 'ok'}
+        >>>
+        >>> for path, subdiff in Iterator().iterate_paths(
+        ...     diff(a, b),
+        ...     paths=[('spec', ...)],
+        ...     changed_only=True,
+        ... ):
+        ...     print(path, subdiff)
+        ('spec', 'replicas') {'N': 2, 'O': 1}
+        >>>
+
+        """
+        live = None if paths is None else _match_path(list(paths), ())
+        path = ()
+        stack = []
+
+        while True:
+            if not (
+                live == []  # no patterns match the path
+                or (changed_only and ('U' in ndiff or not ndiff))
+                or (prune is not None and prune(path, ndiff))
+            ):
+                if 'D' not in ndiff or (
+                    max_depth is not None and len(path) >= max_depth
+                ):
+                    if live is None:
+                        yield path, ndiff
+                else:
+                    if live is None and not changed_only:
+                        yield path, ndiff
+                    stack.append((self._get_iterator(ndiff), path, live))
+
+            while stack:
+                iterator, parent, parent_live = stack[-1]
+
+                try:
+                    ndiff, key, subdiff = next(iterator)
+                except StopIteration:
+                    stack.pop()
+                    continue
+
+                if subdiff is None:  # not iterable diff (sets, texts, etc)
+                    if changed_only and parent_live is None:
+                        yield parent, ndiff
+                    continue
+
+                ndiff = subdiff
+                path = (*parent, key)
+                live = (
+                    None
+                    if parent_live is None
+                    else _match_path(parent_live, path)
+                )
+                break
+            else:
+                return
+
     def set_handler(self, handler):
         """Set handler.
 
@@ -327,9 +1785,117 @@ class Iterator:
             self._iters_by_ext[handler.extension_id] = handler.iterate_diff
 
 
+def _match_path(patterns, path):
+    """Return patterns still matching path, None when path matched fully.
+
+    Patterns should match parent path already.
+
+    """
+    depth = len(path)
+
+    if depth:
+        key = path[-1]
+        patterns = [
+            p for p in patterns if p[depth - 1] is ... or p[depth - 1] == key
+        ]
+
+    if any(len(p) == depth for p in patterns):
+        return None
+
+    return patterns
+
+
+def _get_pooled(key, factory):
+    """Return instance made by factory, reused by current thread for key.
+
+    Least recently made instances are dropped when pool is full. Unhashable
+    keys (options) are not pooled at all.
+
+    """
+    try:
+        pool = _POOL.instances
+    except AttributeError:
+        pool = _POOL.instances = {}
+
+    try:
+        return pool[key]
+    except KeyError:
+        pass
+    except TypeError:  # unhashable options
+        return factory()
+
+    if len(pool) >= _POOL_SIZE:
+        del pool[next(iter(pool))]
+
+    instance = pool[key] = factory()
+
+    return instance
+
+
+def _get_pooled_patcher(kwargs):
+    if kwargs.get('handlers') is not None:
+        # may be a one-shot iterator or unhashable list
+        kwargs['handlers'] = tuple(kwargs['handlers'])
+
+    return _get_pooled(
+        (Patcher, tuple(sorted(kwargs.items()))),
+        lambda: Patcher(**kwargs),
+    )
+
+
+def _make_differ(extra_handlers, kwargs):
+    differ = Differ(**kwargs)
+
+    for handler in extra_handlers:
+        differ.set_handler(handler)
+
+    return differ
+
+
+def compose(*diffs, **kwargs):
+    """Compose sequential nested diffs into one.
+
+    Patching by returned diff gives the same result as patching by passed
+    diffs one by one, but walks target just once.
+
+    Args:
+        diffs: Nested diffs in order of application.
+        kwargs: Passed to Patcher's constructor as is.
+
+    Returns:
+        Nested diff.
+
+    >>> a = [0, 1]
+    >>> b = [1, 2]
+    >>> c = [1, 2, 3]
+    >>>
+    >>> ndiff = compose(diff(a, b, U=False), diff(b, c, U=False))
+    >>> ndiff
+    {'D': [{'R': 0}, {'A': 2, 'I': 2}, {'A': 3}]}
+    >>> patch(a, ndiff) == c
+    True
+    >>>
+
+    """
+    patcher = _get_pooled_patcher(kwargs)
+    diffs = list(diffs) or [{}]
+
+    # pairwise, so long chains are not composed into one ever growing diff
+    while len(diffs) > 1:
+        composed = [
+            patcher.compose(a, b) for a, b in zip(diffs[::2], diffs[1::2])
+        ]
+        diffs = composed + diffs[len(composed) * 2 :]
+
+    return diffs[0]
+
+
 def diff(a, b, extra_handlers=(), **kwargs):
     """Calculate diff for two objects.
 
+    Differs are reused by subsequent calls with the same options (handlers
+    are compared by identity) in the same thread.
+
     Args:
         a: First object to diff.
         b: Second object to diff.
@@ -340,17 +1906,89 @@ def diff(a, b, extra_handlers=(), **kwargs):
         Nested diff.
 
     """
-    differ = Differ(**kwargs)
-
-    for handler in extra_handlers:
-        differ.set_handler(handler)
+    extra_handlers = tuple(extra_handlers)  # may be a one-shot iterator
+    differ = _get_pooled(
+        (Differ, extra_handlers, tuple(sorted(kwargs.items()))),
+        lambda: _make_differ(extra_handlers, kwargs),
+    )
 
     return differ.diff(a, b)[1]
 
 
+def fingerprint(obj):
+    """Calculate stable structural hash for an object.
+
+    Fingerprints are calculated bottom-up: container's fingerprint is a hash
+    of it's type and items fingerprints (regardless of items order for dicts
+    and sets), scalar's one is a hash of it's type and value. Thus objects
+    with equal fingerprints are equal for differ, while equal objects may
+    have different fingerprints (`1` and `1.0` for example).
+
+    Other objects may provide fingerprints via `__nested_diff_fingerprint__`
+    method returning bytes (or None) without materializing their contents.
+    Objects without such method, NaNs and containers with any of them inside
+    have no fingerprints.
+
+    Registered type handlers are not taken into account: fingerprints reflect
+    structural equality only, so objects equal for a handler (floats within
+    a tolerance for example) may have different fingerprints.
+
+    Args:
+        obj: Object to calculate fingerprint for.
+
+    Returns:
+        Fingerprint (bytes) or None.
+
+    >>> fingerprint({'one': [1, 2]}) == fingerprint({'one': [1, 2]})
+    True
+    >>> fingerprint([1]) == fingerprint([1.0])
+    False
+    >>> fingerprint([float('nan')]) is None
+    True
+    >>>
+
+    """
+    fingerprint = _get_fingerprint(obj, {})
+
+    return None if fingerprint is _UNKNOWN else fingerprint[0]
+
+
+def invert(ndiff, **kwargs):
+    """Invert nested diff.
+
+    Inverted diff reverts changes, so no need to calculate diff for objects
+    once again for rollback. Passed diff should contain old values: made
+    with enabled `O` and `R` ops and disabled `trimR`.
+
+    Args:
+        ndiff: Nested diff.
+        kwargs: Passed to Patcher's constructor as is.
+
+    Returns:
+        Nested diff.
+
+    >>> a = [0, 1]
+    >>> b = [1, 2]
+    >>>
+    >>> ndiff = diff(a, b, U=False)
+    >>> invert(ndiff)
+    {'D': [{'A': 0}, {'R': 2, 'I': 1}]}
+    >>> patch(b, invert(ndiff)) == a
+    True
+    >>>
+
+    """
+    patcher = _get_pooled_patcher(kwargs)
+
+    return patcher.invert(ndiff)
+
+
 def patch(target, ndiff, **kwargs):
     """Patch object using nested diff.
 
+    Patchers are reused by subsequent calls with the same options in the
+    same thread.
+
     Args:
         target: Object to patch.
         ndiff: Nested diff.
@@ -360,4 +1998,6 @@ def patch(target, ndiff, **kwargs):
         Patched object.
 
     """
-    return Patcher(**kwargs).patch(target, ndiff)
+    patcher = _get_pooled_patcher(kwargs)
+
+    return patcher.patch(target, ndiff)
@@ -59,6 +59,33 @@ class App(nested_diff.cli.App):
         Returns:
             Tuple: equality flag and nested diff.
 
+        """
+        return self.get_differ(**kwargs).diff(a, b)
+
+    def equal(self, a, b, **kwargs):
+        """Check objects are equal; stops on first found difference.
+
+        Args:
+            a: First object to compare.
+            b: Second object to compare.
+            kwargs: Passed to get_differ method as is.
+
+        Returns:
+            True when objects are equal, False otherwise.
+
+        """
+        return self.get_differ(**kwargs).equal(a, b)
+
+    def get_differ(self, **kwargs):
+        """Create differ according to cli options.
+
+        Args:
+            kwargs: Merged (with higher priority) with cli options and passed
+                to nested_diff.Differ constructor.
+
+        Returns:
+            nested_diff.Differ object.
+
         """
         diff_opts = {
             'A': self.args.A,
@@ -75,18 +102,31 @@ class App(nested_diff.cli.App):
         else:
             diff_opts['R'] = int(diff_opts['R'])
 
+        algorithm = self.args.algorithm
+
         differ = nested_diff.Differ(**diff_opts)
         differ.set_handler(nested_diff.cli.ListOfDocumentsHandler())
         differ.set_handler(nested_diff.cli.YamlNodeHandler())
 
+        if algorithm != 'difflib':
+            differ.set_handler(
+                nested_diff.handlers.ListHandler(algorithm=algorithm),
+            )
+            differ.set_handler(
+                nested_diff.handlers.TupleHandler(algorithm=algorithm),
+            )
+
         if self.args.text_ctx >= 0:
             differ.set_handler(
-                nested_diff.handlers.TextHandler(context=self.args.text_ctx),
+                nested_diff.handlers.TextHandler(
+                    context=self.args.text_ctx,
+                    algorithm=algorithm,
+                ),
             )
 
-        return differ.diff(a, b)
+        return differ
 
-    def generate_diffs(self):  # noqa: C901
+    def generate_diffs(self):  # noqa: C901 PLR0912
         """Generate diffs."""
         a = None
         headers_enabled = False
@@ -117,7 +157,10 @@ class App(nested_diff.cli.App):
                     a = b
                     continue
 
-                equal, diff = self.diff(a['data'], b['data'])
+                if self.args.quiet:
+                    equal, diff = self.equal(a['data'], b['data']), None
+                else:
+                    equal, diff = self.diff(a['data'], b['data'])
 
                 try:
                     name_a = os.environ['HEADER_NAME_A']
@@ -139,6 +182,20 @@ class App(nested_diff.cli.App):
         """Return parser for optional part (dash prefixed) of CLI args."""
         parser = super().get_optional_args_parser()
 
+        parser.add_argument(
+            '--algorithm',
+            choices=(
+                'difflib',
+                'histogram',
+                'myers',
+                'patience',
+                'positional',
+                'sorted',
+            ),
+            default='difflib',
+            help='lists and texts items matching algorithm; default is '
+            '"%(default)s"',
+        )
         parser.add_argument(
             '--show',
             action='store_true',
@@ -260,6 +317,8 @@ class App(nested_diff.cli.App):
                 exit_code = 1
 
             if self.args.quiet:
+                if not equal:
+                    break  # exit code is known already
                 continue
 
             self.args.out.write(diff_header)
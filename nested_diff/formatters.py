@@ -94,6 +94,8 @@ class AbstractFormatter:
             handlers = (
                 *nested_diff.TYPE_HANDLERS,
                 nested_diff.handlers.TextHandler(),
+                nested_diff.handlers.MultisetHandler(),
+                nested_diff.handlers.KeyedListHandler(),
             )
 
         for handler in handlers:
@@ -14,15 +14,35 @@
 
 """Type handlers for nedted diff."""
 
-from difflib import SequenceMatcher
+from bisect import bisect_left
+from collections import Counter
+from copy import copy, deepcopy
+from functools import partial
+from itertools import chain, islice
 from math import isnan
+from operator import itemgetter
+
+import nested_diff
+from nested_diff.matchers import PatienceMatcher, get_matcher
 
 
 class TypeHandler:
     """Base class for type handlers.
 
-    Handlers provide diff, patch, generate_formatted_diff and iterate_diff
-    methods for specific type.
+    Handlers provide diff, patch, check, compose, invert,
+    generate_formatted_diff and iterate_diff methods for specific type.
+
+    Handlers instances are shared: default ones by all differs, patchers and
+    formatters, any of them by forked differs of `Differ.diff_parallel`
+    running in threads. So all of these methods (and diff_stepwise) may be
+    called concurrently and must not keep per call state in handler's
+    attributes. Per run state belongs to the differ (or patcher) passed to
+    the methods, which itself is not thread-safe.
+
+    Patch method should not change target when patcher's `copy_on_write` is
+    set: changed shallow copy is returned instead. When patcher's `journal`
+    is not None, callables reverting changes should be appended to it before
+    changing target in place.
 
     """
 
@@ -32,6 +52,8 @@ class TypeHandler:
     type_prefix = ''
     type_suffix = ''
 
+    diff_stepwise = None
+
     def diff(self, differ, a, b):
         """Calculate diff for two objects.
 
@@ -47,7 +69,7 @@ class TypeHandler:
         diff = {}
         equal = True
 
-        if differ.dump(a) == differ.dump(b):
+        if differ.get_dump(a) == differ.get_dump(b):
             if differ.op_u:
                 diff['U'] = a
         else:
@@ -82,6 +104,83 @@ class TypeHandler:
 
         raise ValueError(diff)
 
+    def check(self, patcher, target, diff):  # noqa: ARG002
+        """Check object may be patched by nested diff cleanly.
+
+        Old, removed and unchanged values should be equal to target. Removed
+        values set to None are not compared: they may be trimmed.
+
+        Args:
+            patcher: nested_diff.Patcher object.
+            target: Object to check.
+            diff: Nested diff.
+
+        Yields:
+            Paths (lists of keys and indexes) to conflicting values,
+            relative to target.
+
+        Raises:
+            ValueError: Diff checking is not supported.
+
+        """
+        if 'D' in diff:
+            raise ValueError(
+                f'unable to check diff using {self.__class__.__name__}',
+            )
+
+        for tag in 'ORU':
+            if tag in diff:
+                value = diff[tag]
+                if (
+                    target != value
+                    and (tag != 'R' or value is not None)  # may be trimmed
+                    # NaNs are not equal to themselves
+                    and (target == target or value == value)  # noqa: PLR0124
+                ):
+                    yield []
+                return
+
+    def compose(self, patcher, a, b):  # noqa: ARG002
+        """Compose two sequential nested diffs into one.
+
+        Called by patcher only when both diffs contain nested diffs ('D').
+
+        Args:
+            patcher: nested_diff.Patcher object.
+            a: First nested diff.
+            b: Nested diff to apply after the first one.
+
+        Returns:
+            Nested diff.
+
+        Raises:
+            ValueError: Diffs composition is not supported.
+
+        """
+        raise ValueError(
+            f'unable to compose diffs using {self.__class__.__name__}',
+        )
+
+    def invert(self, patcher, diff):  # noqa: ARG002
+        """Invert nested diff.
+
+        Called by patcher only for diffs containing nested diffs ('D').
+
+        Args:
+            patcher: nested_diff.Patcher object.
+            diff: Nested diff.
+
+        Returns:
+            Nested diff.
+
+        Raises:
+            ValueError: Diff inversion is not supported.
+
+        """
+        raise ValueError(
+            f'unable to invert diff using {self.__class__.__name__}',
+        )
+
     def iterate_diff(self, iterator, diff):  # noqa: ARG002
         """Iterate over nested diff.
 
@@ -157,19 +256,18 @@ class FloatHandler(ScalarHandler):
         """
         super().__init__()
 
-        if nans_equal:
-            orig_diff_method = self.diff
-
-            def _diff_nan_wrapper(differ, a, b):
-                if isnan(a) and isnan(b):
-                    if differ.op_u:
-                        return True, {'U': a}
+        if nans_equal:  # bound method, not closure: handler is picklable
+            self.diff = self._diff_nans_equal
 
-                    return True, {}
+    def _diff_nans_equal(self, differ, a, b):
+        """Calculate diff for two floats, NaNs are equal."""
+        if isnan(a) and isnan(b):
+            if differ.op_u:
+                return True, {'U': a}
 
-                return orig_diff_method(differ, a, b)
+            return True, {}
 
-            self.diff = _diff_nan_wrapper
+        return self.__class__.diff(self, differ, a, b)
 
 
 class StrHandler(ScalarHandler):
@@ -193,7 +291,7 @@ class DictHandler(TypeHandler):
     type_prefix = '{'
     type_suffix = '}'
 
-    def diff(self, differ, a, b):
+    def diff(self, differ, a, b):  # noqa: C901 PLR0912
         """Calculate diff for two dict objects.
 
         Args:
@@ -214,6 +312,19 @@ class DictHandler(TypeHandler):
         >>>
 
         """
+        if differ.native_eq and a == b:
+            return True, {'U': a} if differ.op_u else {}
+
+        if differ.quick:
+            if a.keys() != b.keys():
+                return False, {}
+
+            for key, old in a.items():
+                if not differ.diff(old, b[key])[0]:
+                    return False, {}
+
+            return True, {}
+
         diff = {}
         equal = True
 
@@ -250,6 +361,75 @@ class DictHandler(TypeHandler):
 
         return equal, diff
 
+    def diff_stepwise(self, differ, a, b):  # noqa: C901 PLR0912
+        """Calculate diff for two dict objects step by step.
+
+        Generator version of `diff` method used by iterative differ: it yields
+        key and pair of values for each subdiff required and expects tuple with
+        equality flag and subdiff sent back.
+
+        Args:
+            differ: nested_diff.Differ object.
+            a: First dict to diff.
+            b: Second dict to diff.
+
+        Yields:
+            Tuples with key, old and new values.
+
+        Returns:
+            Tuple: equality flag and nested diff.
+
+        """
+        if differ.native_eq and a == b:
+            return True, {'U': a} if differ.op_u else {}
+
+        if differ.quick:
+            if a.keys() != b.keys():
+                return False, {}
+
+            for key, old in a.items():
+                subequal, _ = yield key, old, b[key]
+                if not subequal:
+                    return False, {}
+
+            return True, {}
+
+        diff = {}
+        equal = True
+
+        for key in set(a).union(b):
+            try:
+                old = a[key]
+                try:
+                    new = b[key]
+                except KeyError:  # removed
+                    if differ.op_r:
+                        diff[key] = {'R': None if differ.op_trim_r else old}
+
+                    equal = False
+                    continue
+            except KeyError:  # added
+                if differ.op_a:
+                    diff[key] = {'A': b[key]}
+
+                equal = False
+                continue
+
+            subequal, subdiff = yield key, old, new
+
+            if not subequal:
+                equal = False
+
+            if subdiff:
+                diff[key] = subdiff
+
+        if diff:
+            diff = {'U': a} if equal else {'D': diff}
+        elif equal and differ.op_u:
+            diff = {'U': a}
+
+        return equal, diff
+
     def patch(self, patcher, target, diff):
         """Patch dict object.
 
@@ -262,16 +442,102 @@ class DictHandler(TypeHandler):
             Patched dict.
 
         """
+        if patcher.copy_on_write:
+            target = copy(target)
+
+        journal = patcher.journal
+
         for key, subdiff in diff['D'].items():
             if 'D' in subdiff or 'N' in subdiff:
-                target[key] = patcher.patch(target[key], subdiff)
+                value = patcher.patch(target[key], subdiff)
             elif 'A' in subdiff:
-                target[key] = subdiff['A']
+                value = subdiff['A']
             elif 'R' in subdiff:
-                del target[key]
+                value = target.pop(key)
+                if journal is not None:
+                    journal.append(partial(target.__setitem__, key, value))
+                continue
+            else:
+                continue
+
+            if journal is not None:
+                journal.append(_get_restorer(target, key))
+            target[key] = value
 
         return target
 
+    def check(self, patcher, target, diff):
+        """Check dict may be patched by nested diff cleanly.
+
+        Changed and removed keys should exist in target, added ones should
+        not.
+
+        Args:
+            patcher: nested_diff.Patcher object.
+            target: dict object to check.
+            diff: Nested diff.
+
+        Yields:
+            Paths to conflicting values.
+
+        """
+        if not isinstance(target, self.handled_type):
+            yield []
+            return
+
+        for key, subdiff in diff['D'].items():
+            if 'A' in subdiff:
+                if key in target:
+                    yield [key]
+            elif key in target:
+                for path in patcher.iter_conflicts(target[key], subdiff):
+                    yield [key, *path]
+            elif subdiff:
+                yield [key]
+
+    def compose(self, patcher, a, b):
+        """Compose two sequential dict diffs into one.
+
+        Args:
+            patcher: nested_diff.Patcher object.
+            a: First dict diff.
+            b: Dict diff to apply after the first one.
+
+        Returns:
+            Nested diff.
+
+        """
+        diff = dict(a['D'])
+
+        for key, subdiff in b['D'].items():
+            if key in diff:
+                subdiff = patcher.compose(diff[key], subdiff)  # noqa: PLW2901
+
+            if subdiff:
+                diff[key] = subdiff
+            else:
+                diff.pop(key, None)
+
+        return {'D': diff} if diff else {}
+
+    def invert(self, patcher, diff):
+        """Invert dict diff.
+
+        Args:
+            patcher: nested_diff.Patcher object.
+            diff: Dict diff.
+
+        Returns:
+            Nested diff.
+
+        """
+        return {
+            'D': {
+                key: patcher.invert(subdiff)
+                for key, subdiff in diff['D'].items()
+            },
+        }
+
     def iterate_diff(self, iterator, diff):
         """Iterate over dict diff.
 
@@ -315,12 +581,23 @@ class ListHandler(TypeHandler):
     type_prefix = '['
     type_suffix = ']'
 
-    def __init__(self):
-        """Initialize handler."""
+    def __init__(self, *, algorithm=None):
+        """Initialize handler.
+
+        Args:
+            algorithm: Sequence matching algorithm: `difflib` (default),
+                `histogram`, `myers`, `patience`, `positional` or `sorted`.
+                Items with the same indexes are diffed against each other
+                in `positional` mode, tail items are reported as
+                added/removed. `sorted` expects both lists to be sorted
+                and matches items by one merge pass.
+
+        """
         super().__init__()
-        self.lcs = SequenceMatcher(isjunk=None, autojunk=False)
+        get_matcher(algorithm)  # fail early for unsupported algorithm
+        self.algorithm = algorithm
 
-    def diff(self, differ, a, b):  # noqa: C901 PLR0912
+    def diff(self, differ, a, b):
         """Calculate diff for two list objects.
 
         Args:
@@ -341,17 +618,55 @@ class ListHandler(TypeHandler):
         >>>
 
         """
-        self.lcs.set_seq1(tuple(differ.dump(i) for i in a))
-        self.lcs.set_seq2(tuple(differ.dump(i) for i in b))
+        steps = self.diff_stepwise(differ, a, b)
+
+        try:
+            _, old, new = next(steps)
+            while True:
+                _, old, new = steps.send(differ.diff(old, new))
+        except StopIteration as stop:
+            return stop.value
+
+    def diff_stepwise(self, differ, a, b):  # noqa: C901 PLR0911 PLR0912
+        """Calculate diff for two list objects step by step.
+
+        Generator version of `diff` method, see DictHandler.diff_stepwise for
+        details.
+
+        Args:
+            differ: nested_diff.Differ object.
+            a: First list to diff.
+            b: Second list to diff.
+
+        Yields:
+            Tuples with index, old and new values.
+
+        Returns:
+            Tuple: equality flag and nested diff.
+
+        """
+        if differ.native_eq and a == b:
+            return True, {'U': a} if differ.op_u else {}
+
+        if differ.quick:
+            if len(a) != len(b):
+                return False, {}
+
+            for i, (old, new) in enumerate(zip(a, b)):
+                subequal, _ = yield i, old, new
+                if not subequal:
+                    return False, {}
+
+            return True, {}
 
         diff = []
         equal = True
         i = j = 0
         force_index = False
 
-        for ai, bj, _ in self.lcs.get_matching_blocks():
+        for ai, bj, _ in self.get_matching_blocks(differ, a, b):
             while i < ai and j < bj:
-                subequal, subdiff = differ.diff(a[i], b[j])
+                subequal, subdiff = yield i, a[i], b[j]
                 if subdiff:
                     diff.append(subdiff)
                     if force_index:
@@ -400,7 +715,75 @@ class ListHandler(TypeHandler):
 
         return equal, {}
 
-    def patch(self, patcher, target, diff):
+    def get_matching_blocks(self, differ, a, b):
+        """Return matching blocks for two lists.
+
+        Common prefix and suffix are matched in linear time (items are
+        compared by identity first, so keys are computed only for not
+        identical items), rest of the items are matched by their keys using
+        handler's matcher. No items are matched in positional mode: they
+        are diffed pairwise by their indexes. Items themselves, not their
+        keys, are passed to the matcher in sorted mode.
+
+        Args:
+            differ: nested_diff.Differ object.
+            a: First list.
+            b: Second list.
+
+        Returns:
+            List of (i, j, size) triples, same as returned by
+            difflib.SequenceMatcher.get_matching_blocks.
+
+        """
+        if self.algorithm == 'positional':
+            return [(len(a), len(b), 0)]
+
+        item_key = differ.item_key
+        lo, ahi, bhi = 0, len(a), len(b)
+
+        while (
+            lo < ahi
+            and lo < bhi
+            and (a[lo] is b[lo] or item_key(a[lo]) == item_key(b[lo]))
+        ):
+            lo += 1
+
+        while (
+            ahi > lo
+            and bhi > lo
+            and (
+                a[ahi - 1] is b[bhi - 1]
+                or item_key(a[ahi - 1]) == item_key(b[bhi - 1])
+            )
+        ):
+            ahi -= 1
+            bhi -= 1
+
+        blocks = [(0, 0, lo)] if lo else []
+
+        if lo < ahi and lo < bhi:
+            matcher = get_matcher(self.algorithm)  # per call: reentrancy
+
+            if self.algorithm == 'sorted':  # keys don't keep items order
+                matcher.set_seqs(a[lo:ahi], b[lo:bhi])
+            else:
+                matcher.set_seq1(tuple(map(item_key, a[lo:ahi])))
+                matcher.set_seq2(tuple(map(item_key, b[lo:bhi])))
+
+            blocks.extend(
+                (i + lo, j + lo, size)
+                for i, j, size in matcher.get_matching_blocks()
+                if size
+            )
+
+        if ahi < len(a):
+            blocks.append((ahi, bhi, len(a) - ahi))
+
+        blocks.append((len(a), len(b), 0))
+
+        return blocks
+
+    def patch(self, patcher, target, diff):  # noqa: C901 PLR0912
         """Patch list object.
 
         Args:
@@ -412,25 +795,168 @@ class ListHandler(TypeHandler):
             Patched list.
 
         """
-        i, j = 0, 0  # index, scatter
+        subdiffs = diff['D']
+
+        if patcher.copy_on_write:
+            target = copy(target)
+
+        if not any('A' in i or 'R' in i for i in subdiffs):
+            i = 0
+            for subdiff in subdiffs:  # same length, patch in place
+                if 'I' in subdiff:
+                    i = subdiff['I']
+                if 'D' in subdiff or 'N' in subdiff:
+                    value = patcher.patch(target[i], subdiff)
+                    if patcher.journal is not None:
+                        patcher.journal.append(_get_restorer(target, i))
+                    target[i] = value
+                i += 1
 
-        for subdiff in diff['D']:
+            return target
+
+        # rebuild list in one pass: insert/del are O(n) each
+        patched = []
+        items = iter(target)
+        i = 0  # index in the target
+
+        for subdiff in subdiffs:
             if 'I' in subdiff:
-                i = subdiff['I'] + j
+                size = len(patched)
+                patched.extend(islice(items, subdiff['I'] - i))
+                if len(patched) - size < subdiff['I'] - i:
+                    raise IndexError('list index out of range')
+                i = subdiff['I']
+
+            if 'A' in subdiff:
+                patched.append(subdiff['A'])
+                continue
+
+            try:
+                item = next(items)
+            except StopIteration:
+                raise IndexError('list index out of range') from None
+            i += 1
 
             if 'D' in subdiff or 'N' in subdiff:
-                target[i] = patcher.patch(target[i], subdiff)
-            elif 'A' in subdiff:
-                target.insert(i, subdiff['A'])
-                j += 1
-            elif 'R' in subdiff:
-                del target[i]
-                j -= 1
+                patched.append(patcher.patch(item, subdiff))
+            elif 'R' not in subdiff:
+                patched.append(item)
+
+        patched.extend(items)
+
+        if patcher.journal is not None:
+            _journal_items(patcher.journal, target)
+        _set_items(target, patched)
+
+        return target
+
+    def check(self, patcher, target, diff):
+        """Check list may be patched by nested diff cleanly.
+
+        Args:
+            patcher: nested_diff.Patcher object.
+            target: list to check.
+            diff: Nested diff.
+
+        Yields:
+            Paths to conflicting values.
+
+        """
+        if not isinstance(target, self.handled_type):
+            yield []
+            return
+
+        i = 0  # index in the target
+
+        for subdiff in diff['D']:
+            if 'I' in subdiff:
+                i = subdiff['I']
+
+            if 'A' in subdiff:
+                if i > len(target):
+                    yield [i]
                 continue
 
+            if i < len(target):
+                for path in patcher.iter_conflicts(target[i], subdiff):
+                    yield [i, *path]
+            else:
+                yield [i]
+
             i += 1
 
-        return target
+    def compose(self, patcher, a, b):
+        """Compose two sequential list diffs into one.
+
+        Args:
+            patcher: nested_diff.Patcher object.
+            a: First list diff.
+            b: List diff to apply after the first one.
+
+        Returns:
+            Nested diff.
+
+        """
+        ops = _compose_seq_ops(
+            patcher,
+            _get_seq_ops(a['D']),
+            _get_seq_ops(b['D']),
+        )
+        diff = []
+        src = 0  # index in the source list
+
+        for op, idx, subdiff in ops:
+            subdiff = {  # noqa: PLW2901
+                tag: value for tag, value in subdiff.items() if tag != 'I'
+            }
+            if idx != src:
+                subdiff['I'] = idx
+            diff.append(subdiff)
+
+            src = idx if op == 'A' else idx + 1
+
+        return {'D': a['D'].__class__(diff)} if diff else {}
+
+    def invert(self, patcher, diff):
+        """Invert list diff.
+
+        Args:
+            patcher: nested_diff.Patcher object.
+            diff: List diff.
+
+        Returns:
+            Nested diff.
+
+        """
+        inverted = []
+        src = 0  # index in the source list
+        dst = 0  # index in the patched one, source for inverted diff
+        expected = 0  # dst if index is omitted in inverted diff
+
+        for subdiff in diff['D']:
+            if 'I' in subdiff:
+                dst += subdiff['I'] - src
+                src = subdiff['I']
+
+            subdiff = patcher.invert(  # noqa: PLW2901
+                {tag: value for tag, value in subdiff.items() if tag != 'I'},
+            )
+            if dst != expected:
+                subdiff['I'] = dst
+            inverted.append(subdiff)
+
+            if 'A' in subdiff:  # removed from the source
+                src += 1
+                expected = dst
+            elif 'R' in subdiff:  # added to the source
+                dst += 1
+                expected = dst
+            else:
+                src += 1
+                dst += 1
+                expected = dst
+
+        return {'D': diff['D'].__class__(inverted)}
 
     def iterate_diff(self, iterator, diff):  # noqa: ARG002
         """Iterate over nested diff.
@@ -489,14 +1015,17 @@ class TupleHandler(ListHandler):
     type_prefix = '('
     type_suffix = ')'
 
-    def diff(self, differ, a, b):
-        """Calculate diff for two tuple objects.
+    def diff_stepwise(self, differ, a, b):
+        """Calculate diff for two tuple objects step by step.
 
         Args:
             differ: nested_diff.Differ object.
             a: First tuple to diff.
             b: Second tuple to diff.
 
+        Yields:
+            Tuples with index, old and new values.
+
         Returns:
             Tuple: equality flag and nested diff.
 
@@ -510,7 +1039,7 @@ class TupleHandler(ListHandler):
         >>>
 
         """
-        equal, diff = super().diff(differ, a, b)
+        equal, diff = yield from super().diff_stepwise(differ, a, b)
 
         try:
             diff['D'] = tuple(diff['D'])
@@ -534,13 +1063,623 @@ class TupleHandler(ListHandler):
         return tuple(super().patch(patcher, list(target), diff))
 
 
-class SetHandler(TypeHandler):
-    """set handler."""
+class KeyedListHandler(ListHandler):
+    """list of records handler.
 
-    extension_id = 3
-    handled_type = set
+    Items are matched by their keys (for example `id` or `name` field of
+    dicts) instead of their positions, reordered items are reported as
+    moved. Lists with missing, unhashable or duplicate keys are diffed the
+    same way as ListHandler does.
 
-    def diff(self, differ, a, b):
+    Diff for items is a list of subdiffs, ordered as items of the second
+    list (removed items are at the end), `I` of each subdiff contains item
+    index in the first list and index in the second one (None for added and
+    removed items respectively).
+
+    """
+
+    extension_id = 6
+
+    def __init__(self, key=None, **kwargs):
+        """Initialize handler.
+
+        Args:
+            key: Items field name or callable returning item's key.
+            kwargs: Passed to ListHandler's constructor as is.
+
+        """
+        super().__init__(**kwargs)
+
+        if key is None or callable(key):
+            self.key = key
+        else:
+            self.key = itemgetter(key)
+
+    def get_keys(self, items):
+        """Return list of items keys.
+
+        Args:
+            items: List to get keys for.
+
+        Returns:
+            List of keys or None if keys are missing or not unique.
+
+        """
+        if self.key is None:
+            return None
+
+        try:
+            keys = list(map(self.key, items))
+            if len(set(keys)) == len(keys):
+                return keys
+        except (AttributeError, IndexError, KeyError, TypeError):
+            pass
+
+        return None
+
+    def diff_stepwise(self, differ, a, b):  # noqa: C901 PLR0912
+        """Calculate diff for two lists of records step by step.
+
+        Generator version of `diff` method, see DictHandler.diff_stepwise for
+        details.
+
+        Args:
+            differ: nested_diff.Differ object.
+            a: First list to diff.
+            b: Second list to diff.
+
+        Yields:
+            Tuples with index, old and new values.
+
+        Returns:
+            Tuple: equality flag and nested diff.
+
+        >>> from nested_diff import Differ
+        >>>
+        >>> a = [{'id': 1, 'v': 'a'}, {'id': 2, 'v': 'b'}, {'id': 3}]
+        >>> b = [{'id': 2, 'v': 'B'}, {'id': 1, 'v': 'a'}]
+        >>>
+        >>> differ = Differ(O=False, U=False)
+        >>> differ.set_handler(KeyedListHandler(key='id'))
+        >>>
+        >>> differ.diff(a, b)
+        (False,
+         {'D': [{'D': {'v': {'N': 'B'}}, 'I': [1, 0]},
+                {'R': {'id': 3}, 'I': [2, None]}],
+          'E': 6})
+        >>>
+
+        """
+        keys_a = keys_b = None
+
+        if not differ.quick and not (differ.native_eq and a == b):
+            keys_a = self.get_keys(a)
+            if keys_a is not None:
+                keys_b = self.get_keys(b)
+
+        if keys_b is None:
+            return (yield from super().diff_stepwise(differ, a, b))
+
+        positions = {key: i for i, key in enumerate(keys_a)}
+
+        # items keeping their relative order, rest of them are moved
+        kept = {
+            j
+            for j, _ in PatienceMatcher.get_anchors(
+                [
+                    (j, positions[key])
+                    for j, key in enumerate(keys_b)
+                    if key in positions
+                ],
+            )
+        }
+
+        diff = []
+        equal = True
+
+        for j, key in enumerate(keys_b):
+            try:
+                i = positions.pop(key)
+            except KeyError:
+                equal = False
+                if differ.op_a:
+                    diff.append({'A': b[j], 'I': [None, j]})
+                continue
+
+            subequal, subdiff = yield j, a[i], b[j]
+
+            if not subequal:
+                equal = False
+
+            if j not in kept:
+                equal = False
+            elif not subdiff:
+                continue
+
+            subdiff['I'] = [i, j]
+            diff.append(subdiff)
+
+        if positions:  # removed
+            equal = False
+            if differ.op_r:
+                diff.extend(
+                    {'R': None if differ.op_trim_r else a[i], 'I': [i, None]}
+                    for i in sorted(positions.values())
+                )
+
+        if equal:
+            return equal, {'U': a} if differ.op_u else {}
+
+        if diff:
+            return equal, {'D': diff, 'E': self.extension_id}
+
+        return equal, {}
+
+    def patch(self, patcher, target, diff):
+        """Patch list object.
+
+        Args:
+            patcher: nested_diff.Patcher object.
+            target: list to patch.
+            diff: Nested diff.
+
+        Returns:
+            Patched list.
+
+        """
+        if 'E' not in diff:
+            return super().patch(patcher, target, diff)
+
+        if patcher.copy_on_write:
+            target = copy(target)
+
+        placed = {}  # new index: item
+        taken = set()  # old indexes
+
+        for subdiff in diff['D']:
+            i, j = subdiff['I']
+
+            if 'A' in subdiff:
+                placed[j] = subdiff['A']
+                continue
+
+            taken.add(i)
+
+            if 'D' in subdiff or 'N' in subdiff:
+                placed[j] = patcher.patch(target[i], subdiff)
+            elif 'R' not in subdiff:  # moved
+                placed[j] = target[i]
+
+        rest = (item for i, item in enumerate(target) if i not in taken)
+        length = len(target) - len(taken) + len(placed)
+
+        if patcher.journal is not None:
+            _journal_items(patcher.journal, target)
+        target[:] = [
+            placed[j] if j in placed else next(rest) for j in range(length)
+        ]
+
+        return target
+
+    def check(self, patcher, target, diff):
+        """Check list may be patched by nested diff cleanly.
+
+        Args:
+            patcher: nested_diff.Patcher object.
+            target: list to check.
+            diff: Nested diff.
+
+        Yields:
+            Paths to conflicting values.
+
+        """
+        if 'E' not in diff:
+            yield from super().check(patcher, target, diff)
+            return
+
+        if not isinstance(target, self.handled_type):
+            yield []
+            return
+
+        for subdiff in diff['D']:
+            if 'A' in subdiff:
+                continue
+
+            i = subdiff['I'][0]
+            if i < len(target):
+                for path in patcher.iter_conflicts(target[i], subdiff):
+                    yield [i, *path]
+            else:
+                yield [i]
+
+    def compose(self, patcher, a, b):  # noqa: C901
+        """Compose two sequential list diffs into one.
+
+        Keyed list diff may be composed with usual list diff (made for list
+        with missing or duplicate keys), result is a keyed list diff then.
+
+        Args:
+            patcher: nested_diff.Patcher object.
+            a: First list diff.
+            b: List diff to apply after the first one.
+
+        Returns:
+            Nested diff.
+
+        """
+        if 'E' not in a and 'E' not in b:
+            return super().compose(patcher, a, b)
+
+        # lists with unsuitable keys are diffed as usual lists
+        a = _get_keyed_diff(a)
+        b = _get_keyed_diff(b)
+        origins = {}  # intermediate index: (old index, subdiff)
+        removed = []
+
+        for subdiff in a['D']:
+            i, j = subdiff['I']
+            if j is None:
+                removed.append(subdiff)
+            else:
+                origins[j] = i, subdiff
+
+        taken_a = sorted(i for i, _ in _get_indexes(a) if i is not None)
+        placed_a = sorted(origins)
+        taken_b = sorted(i for i, _ in _get_indexes(b) if i is not None)
+        placed_b = sorted(j for _, j in _get_indexes(b) if j is not None)
+        items = {}  # new index: subdiff
+
+        def add(i, j, subdiff_a, subdiff_b):
+            subdiff = patcher.compose(
+                {tag: v for tag, v in subdiff_a.items() if tag != 'I'},
+                {tag: v for tag, v in subdiff_b.items() if tag != 'I'},
+            )
+            if i is None and not subdiff:  # added and then removed
+                return
+
+            subdiff['I'] = [i, j]
+            if j is None:
+                removed.append(subdiff)
+            else:
+                items[j] = subdiff
+
+        for subdiff in b['D']:
+            pos, j = subdiff['I']
+            if pos is None:  # added
+                items[j] = subdiff
+                continue
+
+            try:
+                i, subdiff_a = origins.pop(pos)
+            except KeyError:  # not moved by the first diff
+                rank = pos - bisect_left(placed_a, pos)
+                i, subdiff_a = _get_nth_absent(taken_a, rank), {}
+
+            add(i, j, subdiff_a, subdiff)
+
+        for pos, (i, subdiff_a) in origins.items():  # not moved by the second
+            rank = pos - bisect_left(taken_b, pos)
+            add(i, _get_nth_absent(placed_b, rank), subdiff_a, {})
+
+        diff = [items[j] for j in sorted(items)]
+        diff.extend(sorted(removed, key=lambda x: x['I'][0]))
+
+        return {'D': diff, 'E': self.extension_id} if diff else {}
+
+    def invert(self, patcher, diff):
+        """Invert list diff.
+
+        Args:
+            patcher: nested_diff.Patcher object.
+            diff: List diff.
+
+        Returns:
+            Nested diff.
+
+        """
+        if 'E' not in diff:
+            return super().invert(patcher, diff)
+
+        items = []
+        removed = []  # added by the diff
+
+        for subdiff in diff['D']:
+            i, j = subdiff['I']
+            subdiff = patcher.invert(  # noqa: PLW2901
+                {tag: value for tag, value in subdiff.items() if tag != 'I'},
+            )
+            subdiff['I'] = [j, i]
+            (removed if i is None else items).append(subdiff)
+
+        items.sort(key=lambda x: x['I'][1])
+        items.extend(removed)
+
+        return {'D': items, 'E': self.extension_id}
+
+    def iterate_diff(self, iterator, diff):
+        """Iterate over nested diff.
+
+        Args:
+            iterator: nested_diff.Iterator object.
+            diff: Nested diff.
+
+        Yields:
+            Tuples with diff, key and subdiff for each nested diff.
+
+        """
+        if 'E' not in diff:
+            yield from super().iterate_diff(iterator, diff)
+            return
+
+        for subdiff in diff['D']:
+            i, j = subdiff['I']
+            yield diff, i if j is None else j, subdiff
+
+    def generate_formatted_diff(self, formatter, diff, depth):
+        """Generate formatted list diff."""
+        if 'E' not in diff:
+            yield from super().generate_formatted_diff(formatter, diff, depth)
+            return
+
+        for subdiff in diff['D']:
+            i, j = subdiff['I']
+
+            if len(subdiff) == 1:  # moved, but not changed
+                yield from formatter.generate_key(
+                    j,
+                    'D',
+                    self.handled_type,
+                    depth,
+                )
+                yield from formatter.generate_string(
+                    f'moved from index {i}',
+                    'H',
+                    depth + 1,
+                )
+                continue
+
+            for tag in formatter.tags:
+                if tag in subdiff:
+                    yield from formatter.generate_key(
+                        i if j is None else j,
+                        tag,
+                        self.handled_type,
+                        depth,
+                    )
+                    break
+
+            yield from formatter.generate_diff(subdiff, depth=depth + 1)
+
+
+class MultisetHandler(ListHandler):
+    """list as multiset (bag) handler.
+
+    Items order is ignored, items are matched by their keys (see Differ's
+    `item_key` option) using counting, so diff is calculated in linear
+    time. Diff is a list of unchanged, removed and added items, the same
+    way as for sets. Lists diffs without extension id are patched,
+    iterated and formatted the same way as ListHandler does.
+
+    """
+
+    extension_id = 7
+
+    def diff(self, differ, a, b):  # noqa: C901
+        """Calculate diff for two lists as for multisets.
+
+        Args:
+            differ: nested_diff.Differ object.
+            a: First list to diff.
+            b: Second list to diff.
+
+        Returns:
+            Tuple: equality flag and nested diff.
+
+        >>> from nested_diff import Differ
+        >>>
+        >>> a = ['x', 'y', 'y', 'z']
+        >>> b = ['y', 'x', 'x', 'y']
+        >>>
+        >>> Differ(handlers=[MultisetHandler()], U=False).diff(a, b)
+        (False, {'D': [{'A': 'x'}, {'R': 'z'}], 'E': 7})
+        >>>
+
+        """
+        if differ.native_eq and a == b:
+            return True, {'U': a} if differ.op_u else {}
+
+        item_key = differ.item_key
+
+        if differ.quick:
+            return Counter(map(item_key, a)) == Counter(map(item_key, b)), {}
+
+        unmatched = {}  # key: items from a
+
+        for item in a:
+            unmatched.setdefault(item_key(item), []).append(item)
+
+        diff = []
+        equal = True
+
+        for item in b:
+            key = item_key(item)
+
+            try:
+                items = unmatched[key]
+            except KeyError:
+                equal = False
+                if differ.op_a:
+                    diff.append({'A': item})
+                continue
+
+            old = items.pop()
+            if not items:
+                del unmatched[key]
+
+            if differ.op_u:
+                diff.append({'U': old})
+
+        if unmatched:
+            equal = False
+            if differ.op_r:
+                # ignore trimR opt here: value required for removal
+                for items in unmatched.values():
+                    diff.extend({'R': item} for item in items)
+
+        if diff:
+            return equal, {'D': diff, 'E': self.extension_id}
+
+        return equal, {}
+
+    def patch(self, patcher, target, diff):
+        """Patch list object as multiset.
+
+        Args:
+            patcher: nested_diff.Patcher object.
+            target: list object to patch.
+            diff: Nested diff.
+
+        Returns:
+            Patched list.
+
+        """
+        if 'E' not in diff:
+            return super().patch(patcher, target, diff)
+
+        if patcher.copy_on_write:
+            target = copy(target)
+        elif patcher.journal is not None:
+            _journal_items(patcher.journal, target)
+
+        added = [i['A'] for i in diff['D'] if 'A' in i]
+        removed = [i['R'] for i in diff['D'] if 'R' in i]
+
+        if removed:  # rebuild list in one pass: remove is O(n) each
+            _set_items(target, _remove_items(chain(target, added), removed)[0])
+        else:
+            target.extend(added)
+
+        return target
+
+    def check(self, patcher, target, diff):
+        """Check list may be patched by nested diff cleanly.
+
+        Removed items should be in the target.
+
+        Args:
+            patcher: nested_diff.Patcher object.
+            target: list object to check.
+            diff: Nested diff.
+
+        Yields:
+            Paths to conflicting values, empty path (list) for multiset
+            diff not matching target.
+
+        """
+        if 'E' not in diff:
+            yield from super().check(patcher, target, diff)
+            return
+
+        if not isinstance(target, self.handled_type):
+            yield []
+            return
+
+        removed = [i['R'] for i in diff['D'] if 'R' in i]
+
+        if _remove_items(target, removed)[1]:
+            yield []
+
+    def compose(self, patcher, a, b):
+        """Compose two sequential multiset diffs into one.
+
+        Args:
+            patcher: nested_diff.Patcher object.
+            a: First multiset diff.
+            b: Multiset diff to apply after the first one.
+
+        Returns:
+            Nested diff.
+
+        """
+        if 'E' not in b:
+            return super().compose(patcher, a, b)
+
+        diff = [
+            subdiff
+            for subdiff in chain(a['D'], b['D'])
+            if 'A' in subdiff or 'R' in subdiff
+        ]
+
+        return {'D': diff, 'E': self.extension_id} if diff else {}
+
+    def invert(self, patcher, diff):
+        """Invert multiset diff.
+
+        Args:
+            patcher: nested_diff.Patcher object.
+            diff: Multiset diff.
+
+        Returns:
+            Nested diff.
+
+        """
+        if 'E' not in diff:
+            return super().invert(patcher, diff)
+
+        inverted = []
+
+        for subdiff in diff['D']:
+            if 'A' in subdiff:
+                inverted.append({'R': subdiff['A']})
+            elif 'R' in subdiff:
+                inverted.append({'A': subdiff['R']})
+            else:
+                inverted.append(subdiff)
+
+        return {'D': inverted, 'E': self.extension_id}
+
+    def iterate_diff(self, iterator, diff):
+        """Iterate over nested diff.
+
+        Args:
+            iterator: nested_diff.Iterator object.
+            diff: Nested diff.
+
+        Yields:
+            Tuples with diff, key and subdiff for each nested diff, multiset
+            diffs are not iterable.
+
+        """
+        if 'E' not in diff:
+            yield from super().iterate_diff(iterator, diff)
+            return
+
+        yield diff, None, None
+
+    def generate_formatted_diff(self, formatter, diff, depth):
+        """Generate formatted multiset diff."""
+        if 'E' not in diff:
+            yield from super().generate_formatted_diff(formatter, diff, depth)
+            return
+
+        for subdiff in diff['D']:
+            for tag in ('R', 'A', 'U'):
+                try:
+                    value = subdiff[tag]
+                except KeyError:
+                    continue
+
+                yield from formatter.generate_value(value, tag, depth)
+                break
+
+
+class SetHandler(TypeHandler):
+    """set handler."""
+
+    extension_id = 3
+    handled_type = set
+
+    def diff(self, differ, a, b):
         """Calculate diff for two set objects.
 
         Args:
@@ -561,6 +1700,12 @@ class SetHandler(TypeHandler):
         >>>
 
         """
+        if differ.native_eq and a == b:
+            return True, {'U': a} if differ.op_u else {}
+
+        if differ.quick:
+            return a == b, {}
+
         diff = []
         equal = True
 
@@ -583,7 +1728,7 @@ class SetHandler(TypeHandler):
 
         return equal, {}
 
-    def patch(self, patcher, target, diff):  # noqa: ARG002
+    def patch(self, patcher, target, diff):
         """Patch set object.
 
         Args:
@@ -595,17 +1740,97 @@ class SetHandler(TypeHandler):
             Patched set.
 
         """
+        if patcher.copy_on_write:
+            target = copy(target)
+
+        journal = patcher.journal
+
         for subdiff in diff['D']:
-            try:
-                target.add(subdiff['A'])
-            except KeyError:  # noqa: PERF203
-                try:
-                    target.remove(subdiff['R'])
-                except KeyError:
-                    pass
+            if 'A' in subdiff:
+                item = subdiff['A']
+                if journal is not None and item not in target:
+                    journal.append(partial(target.discard, item))
+                target.add(item)
+            elif 'R' in subdiff:
+                item = subdiff['R']
+                if journal is not None and item in target:
+                    journal.append(partial(target.add, item))
+                target.discard(item)
 
         return target
 
+    def check(self, patcher, target, diff):  # noqa: ARG002
+        """Check set may be patched by nested diff cleanly.
+
+        Removed items should be in the target, added ones should not.
+
+        Args:
+            patcher: nested_diff.Patcher object.
+            target: set object to check.
+            diff: Nested diff.
+
+        Yields:
+            Empty path (list) when diff does not match target.
+
+        """
+        if not isinstance(target, self.handled_type):
+            yield []
+            return
+
+        for subdiff in diff['D']:
+            if ('A' in subdiff and subdiff['A'] in target) or (
+                'R' in subdiff and subdiff['R'] not in target
+            ):
+                yield []
+                return
+
+    def compose(self, patcher, a, b):  # noqa: ARG002
+        """Compose two sequential set diffs into one.
+
+        Args:
+            patcher: nested_diff.Patcher object.
+            a: First set diff.
+            b: Set diff to apply after the first one.
+
+        Returns:
+            Nested diff.
+
+        """
+        ops = {}  # item: last op for it
+
+        for subdiff in chain(a['D'], b['D']):
+            if 'A' in subdiff:
+                ops[subdiff['A']] = subdiff
+            elif 'R' in subdiff:
+                ops[subdiff['R']] = subdiff
+
+        diff = list(ops.values())
+
+        return {'D': diff, 'E': self.extension_id} if diff else {}
+
+    def invert(self, patcher, diff):  # noqa: ARG002
+        """Invert set diff.
+
+        Args:
+            patcher: nested_diff.Patcher object.
+            diff: Set diff.
+
+        Returns:
+            Nested diff.
+
+        """
+        inverted = []
+
+        for subdiff in diff['D']:
+            if 'A' in subdiff:
+                inverted.append({'R': subdiff['A']})
+            elif 'R' in subdiff:
+                inverted.append({'A': subdiff['R']})
+            else:
+                inverted.append(subdiff)
+
+        return {'D': inverted, 'E': self.extension_id}
+
     def generate_formatted_diff(self, formatter, diff, depth):
         """Generate formatted set diff."""
         for subdiff in diff['D']:
@@ -646,15 +1871,18 @@ class TextHandler(TypeHandler):
     extension_id = 5
     handled_type = str
 
-    def __init__(self, context=3):
+    def __init__(self, context=3, *, algorithm=None):
         """Initialize handler.
 
         Args:
             context: Amount of context lines.
+            algorithm: Lines matching algorithm: `difflib` (default),
+                `histogram`, `myers`, `patience`, `positional` or `sorted`.
 
         """
         super().__init__()
-        self.lcs = SequenceMatcher(isjunk=None, autojunk=False)
+        get_matcher(algorithm)  # fail early for unsupported algorithm
+        self.algorithm = algorithm
         self.context = context
 
     def diff(self, differ, a, b):
@@ -680,6 +1908,9 @@ class TextHandler(TypeHandler):
         >>>
 
         """
+        if differ.quick:
+            return a == b, {}
+
         lines_a = a.split('\n', -1)
         lines_b = b.split('\n', -1)
 
@@ -689,10 +1920,10 @@ class TextHandler(TypeHandler):
         diff = []
         equal = True
 
-        self.lcs.set_seq1(lines_a)
-        self.lcs.set_seq2(lines_b)
+        matcher = get_matcher(self.algorithm)  # per call: reentrancy
+        matcher.set_seqs(lines_a, lines_b)
 
-        for group in self.lcs.get_grouped_opcodes(self.context):
+        for group in matcher.get_grouped_opcodes(self.context):
             diff.append(
                 {
                     'I': [
@@ -741,28 +1972,150 @@ class TextHandler(TypeHandler):
             ValueError: Items and/or ops doesn't match diff/object.
 
         """
-        offset = 0
-        target = target.split('\n', -1)
+        lines = target.split('\n', -1)
+        patched = []
+        idx = 0  # index in the target lines
 
         for subdiff in diff['D']:
             if 'I' in subdiff:  # hunk started
-                idx = subdiff['I'][0] + offset
+                patched.extend(lines[idx : subdiff['I'][0]])
+                idx = subdiff['I'][0]
             elif 'A' in subdiff:
-                target.insert(idx, subdiff['A'])
-                offset += 1
-                idx += 1
+                patched.append(subdiff['A'])
             elif 'R' in subdiff:
-                if target.pop(idx) != subdiff['R']:
+                if lines[idx] != subdiff['R']:
                     raise ValueError('Removing line does not match')
-                offset -= 1
+                idx += 1
             elif 'U' in subdiff:
-                if target[idx] != subdiff['U']:
+                if lines[idx] != subdiff['U']:
                     raise ValueError('Unchanged line does not match')
+                patched.append(lines[idx])
                 idx += 1
             else:
                 raise ValueError('Unsupported operation')
 
-        return '\n'.join(target)
+        patched.extend(lines[idx:])
+
+        return '\n'.join(patched)
+
+    def check(self, patcher, target, diff):  # noqa: ARG002
+        """Check text may be patched by nested diff cleanly.
+
+        Hunks should be in range and their removed and unchanged lines should
+        match target ones.
+
+        Args:
+            patcher: nested_diff.Patcher object.
+            target: string to check.
+            diff: Nested diff.
+
+        Yields:
+            Empty path (list) when diff does not match target.
+
+        """
+        if not isinstance(target, self.handled_type):
+            yield []
+            return
+
+        lines = target.split('\n', -1)
+        idx = 0  # index in the target lines
+
+        for subdiff in diff['D']:
+            if 'I' in subdiff:  # hunk started
+                idx = subdiff['I'][0]
+                if idx > len(lines):
+                    break
+            elif 'A' not in subdiff:
+                if idx >= len(lines) or lines[idx] != subdiff.get(
+                    'R',
+                    subdiff.get('U'),
+                ):
+                    break
+                idx += 1
+        else:
+            return
+
+        yield []
+
+    def compose(self, patcher, a, b):
+        """Compose two sequential text diffs into one.
+
+        Resulting hunks contain only context lines of the passed diffs.
+
+        Args:
+            patcher: nested_diff.Patcher object.
+            a: First text diff.
+            b: Text diff to apply after the first one.
+
+        Returns:
+            Nested diff.
+
+        """
+        ops = _compose_seq_ops(
+            patcher,
+            _get_text_ops(a['D']),
+            _get_text_ops(b['D']),
+        )
+        diff = []
+        src = None  # index of the next line in the source text
+        offset = 0  # new index - old index
+
+        for op, idx, subdiff in ops:
+            if idx != src:  # hunk started
+                hunk = [idx, idx, idx + offset, idx + offset]
+                diff.append({'I': hunk})
+
+            if op == 'A':
+                hunk[3] += 1
+                offset += 1
+                src = idx
+            else:
+                hunk[1] += 1
+                if op == 'R':
+                    offset -= 1
+                else:
+                    hunk[3] += 1
+                src = idx + 1
+
+            diff.append({op: subdiff[op]})
+
+        return {'D': diff, 'E': self.extension_id} if diff else {}
+
+    def invert(self, patcher, diff):  # noqa: ARG002
+        """Invert text diff.
+
+        Args:
+            patcher: nested_diff.Patcher object.
+            diff: Text diff.
+
+        Returns:
+            Nested diff.
+
+        """
+        inverted = []
+        added = []  # removed lines, emitted after removed ones
+
+        for subdiff in diff['D']:
+            if 'R' in subdiff:
+                added.append({'A': subdiff['R']})
+                continue
+
+            if 'A' in subdiff:
+                inverted.append({'R': subdiff['A']})
+                continue
+
+            inverted.extend(added)
+            added.clear()
+
+            if 'I' in subdiff:
+                o0, o1, n0, n1 = subdiff['I']
+                inverted.append({'I': [n0, n1, o0, o1]})
+            else:
+                inverted.append(subdiff)
+
+        inverted.extend(added)
+
+        return {'D': inverted, 'E': self.extension_id}
 
     def generate_formatted_diff(self, formatter, diff, depth):
         """Generate unified text diff."""
@@ -793,3 +2146,243 @@ class TextHandler(TypeHandler):
             return f'{start + 1},{length}'
 
         return str(start + 1)
+
+
+def _get_seq_ops(diff):
+    """Return list of (op, source index, subdiff) tuples for list diff."""
+    ops = []
+    src = 0
+
+    for subdiff in diff:
+        if 'I' in subdiff:
+            src = subdiff['I']
+
+        if 'A' in subdiff:
+            ops.append(('A', src, subdiff))
+            continue
+
+        if 'D' in subdiff or 'N' in subdiff:
+            ops.append(('C', src, subdiff))
+        elif 'R' in subdiff:
+            ops.append(('R', src, subdiff))
+        else:
+            ops.append(('U', src, subdiff))
+
+        src += 1
+
+    return ops
+
+
+def _get_text_ops(diff):
+    """Return list of (op, source index, subdiff) tuples for text diff."""
+    ops = []
+
+    for subdiff in diff:
+        if 'I' in subdiff:
+            src = subdiff['I'][0]
+        elif 'A' in subdiff:
+            ops.append(('A', src, subdiff))
+        else:
+            ops.append(('R' if 'R' in subdiff else 'U', src, subdiff))
+            src += 1
+
+    return ops
+
+
+def _compose_seq_ops(patcher, ops_a, ops_b):
+    """Compose sequences ops into list of (op, source index, subdiff)."""
+    ops = []
+    pos = 0  # index in the intermediate sequence
+    src = 0  # index in the source sequence
+    ops_b = iter(ops_b)
+    op_b = next(ops_b, None)
+
+    for op_a in chain(ops_a, (None,)):
+        # items not touched by the first diff, endless after it's last op
+        while op_b is not None and (
+            op_a is None or src + op_b[1] - pos < op_a[1]
+        ):
+            op, idx, subdiff_b = op_b
+            if idx < pos:
+                raise ValueError('diff items are not ordered')
+
+            src += idx - pos
+            pos = idx
+            ops.append((op, src, subdiff_b))
+
+            if op != 'A':
+                src += 1
+                pos += 1
+
+            op_b = next(ops_b, None)
+
+        if op_a is None:
+            break
+
+        kind, idx, _ = op_a
+        pos += idx - src
+        src = idx if kind == 'A' else idx + 1
+
+        if kind == 'R':  # not in the intermediate sequence
+            ops.append(op_a)
+            continue
+
+        while op_b is not None and op_b[1] == pos and op_b[0] == 'A':
+            ops.append(('A', idx, op_b[2]))
+            op_b = next(ops_b, None)
+
+        if op_b is not None and op_b[1] == pos:
+            op_a = _compose_seq_op(patcher, op_a, op_b)  # noqa: PLW2901
+            op_b = next(ops_b, None)
+
+        if op_a is not None:
+            ops.append(op_a)
+
+        pos += 1
+
+    return ops
+
+
+def _compose_seq_op(patcher, op_a, op_b):  # noqa: PLR0911
+    """Compose ops for the same item, return None when item is discarded."""
+    kind, idx, subdiff = op_a
+    op, _, subdiff_b = op_b
+
+    if op == 'U':
+        return op_a
+
+    if kind == 'A':
+        if op == 'R':
+            return None
+        return (
+            kind,
+            idx,
+            {'A': patcher.patch(deepcopy(subdiff['A']), subdiff_b)},
+        )
+
+    if op == 'R':
+        if kind == 'C' and 'O' in subdiff:
+            return op, idx, {'R': subdiff['O']}
+        if kind == 'U':
+            return op, idx, {'R': subdiff['U']}
+        return op, idx, subdiff_b
+
+    if kind == 'C':
+        subdiff = patcher.compose(subdiff, subdiff_b)
+        return (op, idx, subdiff) if subdiff else None
+
+    return op, idx, subdiff_b
+
+
+def _get_indexes(diff):
+    """Return list of (old index, new index) pairs for keyed list diff."""
+    return [subdiff['I'] for subdiff in diff['D']]
+
+
+def _get_keyed_diff(diff):
+    """Return keyed list diff for a list diff (passed as is if keyed)."""
+    if 'E' in diff:
+        return diff
+
+    items = []
+    removed = []
+    src = 0  # index in the source list
+    dst = 0  # index in the patched one
+
+    for subdiff in diff['D']:
+        if 'I' in subdiff:
+            dst += subdiff['I'] - src
+            src = subdiff['I']
+
+        subdiff = {  # noqa: PLW2901
+            tag: value for tag, value in subdiff.items() if tag != 'I'
+        }
+        if 'A' in subdiff:
+            subdiff['I'] = [None, dst]
+            dst += 1
+        elif 'R' in subdiff:
+            subdiff['I'] = [src, None]
+            src += 1
+        else:
+            subdiff['I'] = [src, dst]
+            src += 1
+            dst += 1
+
+        (removed if 'R' in subdiff else items).append(subdiff)
+
+    return {'D': items + removed, 'E': KeyedListHandler.extension_id}
+
+
+def _get_nth_absent(numbers, n):
+    """Return n-th (from zero) non-negative integer absent in sorted list."""
+    for number in numbers:
+        if number > n:
+            break
+        n += 1
+
+    return n
+
+
+def _get_restorer(target, key):
+    """Return callable restoring target's item (or it's absence)."""
+    try:
+        return partial(target.__setitem__, key, target[key])
+    except KeyError:
+        return partial(target.pop, key, None)
+
+
+def _journal_items(journal, target):
+    """Journal restoring of all target's items."""
+    if hasattr(target, 'extend'):  # patch fails before changes otherwise
+        journal.append(partial(_set_items, target, list(target)))
+
+
+def _remove_items(items, removed):
+    """Return list of items without removed ones and amount of absent ones.
+
+    Unhashable items are matched by fingerprints, ones without fingerprints
+    (or equal ones with different fingerprints) are compared one by one.
+
+    """
+    counts = Counter()
+    unhashable = {}  # fingerprint: removed items
+
+    for item in removed:
+        try:
+            counts[item] += 1
+        except TypeError:  # noqa: PERF203
+            key = nested_diff.fingerprint(item)
+            unhashable.setdefault(key, []).append(item)
+
+    rest = []
+
+    for item in items:
+        try:
+            if counts[item]:
+                counts[item] -= 1
+                continue
+        except TypeError:
+            if unhashable:
+                key = nested_diff.fingerprint(item)
+                if key is not None and unhashable.get(key):
+                    unhashable[key].pop()
+                    continue
+
+        rest.append(item)
+
+    absent = sum(counts.values())
+
+    for item in chain.from_iterable(unhashable.values()):
+        try:
+            rest.remove(item)
+        except ValueError:  # noqa: PERF203
+            absent += 1
+
+    return rest, absent
+
+
+def _set_items(target, items):
+    """Replace all target's items."""
+    extend = target.extend  # fail before clearing for inappropriate types
+    target.clear()
+    extend(items)
@@ -0,0 +1,671 @@
+# Copyright 2026 Michael Samoglyadov
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Sequence matchers for nested diff."""
+
+import abc
+from difflib import Match, SequenceMatcher
+
+__all__ = [
+    'DifflibMatcher',
+    'HistogramMatcher',
+    'Matcher',
+    'MyersMatcher',
+    'PatienceMatcher',
+    'PositionalMatcher',
+    'SortedMatcher',
+    'get_matcher',
+]
+
+
+class Matcher(SequenceMatcher, abc.ABC):
+    """Base class for alternative sequence matchers.
+
+    Drop-in replacement for difflib.SequenceMatcher in nested diff handlers:
+    only `set_seq1`, `set_seq2`, `set_seqs`, `get_matching_blocks`,
+    `get_opcodes` and `get_grouped_opcodes` methods are supported. Items
+    are compared by `==` and should be hashable.
+
+    """
+
+    def __init__(self, a='', b=''):
+        """Initialize matcher.
+
+        Args:
+            a: First sequence.
+            b: Second sequence.
+
+        """
+        self.a = self.b = None
+        self.set_seqs(a, b)
+
+    def set_seq1(self, a):
+        """Set first sequence to be compared.
+
+        Args:
+            a: Sequence.
+
+        """
+        self.a = a
+        self.matching_blocks = self.opcodes = None
+
+    def set_seq2(self, b):
+        """Set second sequence to be compared.
+
+        Args:
+            b: Sequence.
+
+        """
+        self.b = b
+        self.matching_blocks = self.opcodes = None
+
+    def get_matching_blocks(self):
+        """Return list of triples describing matching subsequences.
+
+        Same as difflib.SequenceMatcher.get_matching_blocks.
+
+        Returns:
+            List of Match(a, b, size) triples, last one is a dummy
+            Match(len(a), len(b), 0).
+
+        """
+        if self.matching_blocks is not None:
+            return self.matching_blocks
+
+        la, lb = len(self.a), len(self.b)
+        blocks = []
+        i = j = k = 0
+
+        for i1, j1, k1 in sorted(self.match(0, la, 0, lb)):
+            if i + k == i1 and j + k == j1:  # adjacent, join them
+                k += k1
+            else:
+                if k:
+                    blocks.append(Match(i, j, k))
+                i, j, k = i1, j1, k1
+
+        if k:
+            blocks.append(Match(i, j, k))
+
+        blocks.append(Match(la, lb, 0))
+        self.matching_blocks = blocks
+
+        return blocks
+
+    @abc.abstractmethod
+    def match(self, alo, ahi, blo, bhi):
+        """Find matching subsequences in a[alo:ahi] and b[blo:bhi].
+
+        Args:
+            alo: First sequence range start.
+            ahi: First sequence range end.
+            blo: Second sequence range start.
+            bhi: Second sequence range end.
+
+        Returns:
+            List of (i, j, size) triples in arbitrary order.
+
+        """
+
+    def trim(self, alo, ahi, blo, bhi, blocks):
+        """Match common prefix and suffix of a[alo:ahi] and b[blo:bhi].
+
+        Args:
+            alo: First sequence range start.
+            ahi: First sequence range end.
+            blo: Second sequence range start.
+            bhi: Second sequence range end.
+            blocks: List to append found matches to.
+
+        Returns:
+            Range boundaries with prefix and suffix excluded.
+
+        """
+        a, b = self.a, self.b
+
+        i, j = alo, blo
+        while i < ahi and j < bhi and a[i] == b[j]:
+            i += 1
+            j += 1
+
+        if i > alo:
+            blocks.append((alo, blo, i - alo))
+            alo, blo = i, j
+
+        i, j = ahi, bhi
+        while i > alo and j > blo and a[i - 1] == b[j - 1]:
+            i -= 1
+            j -= 1
+
+        if i < ahi:
+            blocks.append((i, j, ahi - i))
+            ahi, bhi = i, j
+
+        return alo, ahi, blo, bhi
+
+
+class DifflibMatcher(Matcher):
+    """difflib.SequenceMatcher based matcher.
+
+    Common prefix and suffix are matched in linear time, only the rest is
+    passed to SequenceMatcher (with disabled autojunk heuristic).
+
+    >>> DifflibMatcher(a='abcabba', b='cbabac').get_matching_blocks()
+    [Match(a=0, b=2, size=2), Match(a=2, b=5, size=1), Match(a=7, b=6, \
+size=0)]
+    >>>
+
+    """
+
+    def __init__(self, a='', b=''):
+        """Initialize matcher.
+
+        Args:
+            a: First sequence.
+            b: Second sequence.
+
+        """
+        self.matcher = SequenceMatcher(isjunk=None, autojunk=False)
+        super().__init__(a, b)
+
+    def match(self, alo, ahi, blo, bhi):
+        """Find matching subsequences in a[alo:ahi] and b[blo:bhi].
+
+        Args:
+            alo: First sequence range start.
+            ahi: First sequence range end.
+            blo: Second sequence range start.
+            bhi: Second sequence range end.
+
+        Returns:
+            List of (i, j, size) triples in arbitrary order.
+
+        """
+        blocks = []
+        alo, ahi, blo, bhi = self.trim(alo, ahi, blo, bhi, blocks)
+
+        if alo < ahi and blo < bhi:
+            self.matcher.set_seqs(self.a[alo:ahi], self.b[blo:bhi])
+            blocks.extend(
+                (i + alo, j + blo, size)
+                for i, j, size in self.matcher.get_matching_blocks()
+                if size
+            )
+            self.matcher.set_seqs('', '')  # release slices
+
+        return blocks
+
+
+class MyersMatcher(Matcher):
+    """Myers O(ND) difference algorithm.
+
+    Linear space variant: ranges are split by middle snakes until common
+    prefixes and suffixes cover them. Result is a longest common subsequence,
+    fast for similar sequences, where D (amount of differences) is small.
+
+    >>> MyersMatcher(a='abcabba', b='cbabac').get_matching_blocks()
+    [Match(a=1, b=1, size=1), Match(a=3, b=2, size=2), Match(a=6, b=4, \
+size=1), Match(a=7, b=6, size=0)]
+    >>>
+
+    """
+
+    def match(self, alo, ahi, blo, bhi):
+        """Find matching subsequences in a[alo:ahi] and b[blo:bhi].
+
+        Args:
+            alo: First sequence range start.
+            ahi: First sequence range end.
+            blo: Second sequence range start.
+            bhi: Second sequence range end.
+
+        Returns:
+            List of (i, j, size) triples in arbitrary order.
+
+        """
+        blocks = []
+        stack = [(alo, ahi, blo, bhi)]
+
+        while stack:
+            alo, ahi, blo, bhi = self.trim(*stack.pop(), blocks)
+
+            if alo == ahi or blo == bhi:
+                continue
+
+            split = self.bisect(alo, ahi, blo, bhi)
+            if split is not None:
+                x, y = split
+                stack.append((alo, x, blo, y))
+                stack.append((x, ahi, y, bhi))
+
+        return blocks
+
+    def bisect(self, alo, ahi, blo, bhi):  # noqa: C901 PLR0912
+        """Find middle snake for a[alo:ahi] and b[blo:bhi].
+
+        Args:
+            alo: First sequence range start.
+            ahi: First sequence range end.
+            blo: Second sequence range start.
+            bhi: Second sequence range end.
+
+        Returns:
+            Tuple with split point or None when there is no common items.
+
+        """
+        a, b = self.a, self.b
+        n, m = ahi - alo, bhi - blo
+        max_d = (n + m + 1) // 2
+        offset = max_d
+        v_len = 2 * max_d + 2
+        vf = [-1] * v_len  # furthest forward x for each diagonal
+        vf[offset + 1] = 0
+        vr = vf[:]  # same for reversed path
+        delta = n - m
+        front = delta % 2 != 0  # which path overlaps first
+        kf_start = kf_end = kr_start = kr_end = 0
+
+        for d in range(max_d):
+            for k in range(-d + kf_start, d + 1 - kf_end, 2):
+                ko = offset + k
+                if k == -d or (k != d and vf[ko - 1] < vf[ko + 1]):
+                    x = vf[ko + 1]
+                else:
+                    x = vf[ko - 1] + 1
+                y = x - k
+
+                while x < n and y < m and a[alo + x] == b[blo + y]:
+                    x += 1
+                    y += 1
+
+                vf[ko] = x
+
+                if x > n:  # out of right edge
+                    kf_end += 2
+                elif y > m:  # out of bottom edge
+                    kf_start += 2
+                elif front:
+                    ro = offset + delta - k
+                    if 0 <= ro < v_len and vr[ro] != -1 and x >= n - vr[ro]:
+                        return alo + x, blo + y
+
+            for k in range(-d + kr_start, d + 1 - kr_end, 2):
+                ko = offset + k
+                if k == -d or (k != d and vr[ko - 1] < vr[ko + 1]):
+                    x = vr[ko + 1]
+                else:
+                    x = vr[ko - 1] + 1
+                y = x - k
+
+                while x < n and y < m and a[ahi - x - 1] == b[bhi - y - 1]:
+                    x += 1
+                    y += 1
+
+                vr[ko] = x
+
+                if x > n:
+                    kr_end += 2
+                elif y > m:
+                    kr_start += 2
+                elif not front:
+                    fo = offset + delta - k
+                    if 0 <= fo < v_len and vf[fo] != -1 and vf[fo] >= n - x:
+                        return alo + vf[fo], blo + vf[fo] - delta + k
+
+        return None
+
+
+class PatienceMatcher(MyersMatcher):
+    """Patience diff algorithm.
+
+    Items unique in both sequences are matched using longest increasing
+    subsequence and used as anchors, ranges between them are processed the
+    same way recursively. Ranges without unique items are matched using
+    Myers algorithm. Result is not necessarily a longest common subsequence,
+    but tends to be more readable for human.
+
+    >>> PatienceMatcher(a='abcabba', b='cbabac').get_matching_blocks()
+    [Match(a=1, b=1, size=1), Match(a=3, b=2, size=2), Match(a=6, b=4, \
+size=1), Match(a=7, b=6, size=0)]
+    >>>
+
+    """
+
+    def match(self, alo, ahi, blo, bhi):
+        """Find matching subsequences in a[alo:ahi] and b[blo:bhi].
+
+        Args:
+            alo: First sequence range start.
+            ahi: First sequence range end.
+            blo: Second sequence range start.
+            bhi: Second sequence range end.
+
+        Returns:
+            List of (i, j, size) triples in arbitrary order.
+
+        """
+        a, b = self.a, self.b
+        blocks = []
+        stack = [(alo, ahi, blo, bhi)]
+
+        while stack:
+            alo, ahi, blo, bhi = self.trim(*stack.pop(), blocks)
+
+            if alo == ahi or blo == bhi:
+                continue
+
+            positions = {}  # item: [index in a, index in b]
+            for i in range(alo, ahi):
+                positions[a[i]] = None if a[i] in positions else [i, None]
+
+            for j in range(blo, bhi):
+                pos = positions.get(b[j])
+                if pos is not None:
+                    if pos[1] is None:
+                        pos[1] = j
+                    else:
+                        positions[b[j]] = None
+
+            pairs = [p for p in positions.values() if p and p[1] is not None]
+            anchors = self.get_anchors(sorted(pairs))
+
+            if not anchors:
+                blocks.extend(super().match(alo, ahi, blo, bhi))
+                continue
+
+            for i, j in anchors:
+                blocks.append((i, j, 1))
+                stack.append((alo, i, blo, j))
+                alo, blo = i + 1, j + 1
+
+            stack.append((alo, ahi, blo, bhi))
+
+        return blocks
+
+    @staticmethod
+    def get_anchors(pairs):
+        """Return longest increasing by second item subsequence of pairs.
+
+        Args:
+            pairs: List of (i, j) pairs sorted by first item.
+
+        Returns:
+            List of pairs.
+
+        """
+        tails = []  # tails of piles, indexes in pairs
+        tail_js = []
+        backrefs = []
+
+        for idx, (_, j) in enumerate(pairs):
+            lo, hi = 0, len(tail_js)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if tail_js[mid] < j:
+                    lo = mid + 1
+                else:
+                    hi = mid
+
+            backrefs.append(tails[lo - 1] if lo else None)
+
+            if lo == len(tails):
+                tails.append(idx)
+                tail_js.append(j)
+            else:
+                tails[lo] = idx
+                tail_js[lo] = j
+
+        anchors = []
+        idx = tails[-1] if tails else None
+
+        while idx is not None:
+            anchors.append(pairs[idx])
+            idx = backrefs[idx]
+
+        anchors.reverse()
+
+        return anchors
+
+
+class HistogramMatcher(MyersMatcher):
+    """Histogram diff algorithm.
+
+    Extension of patience algorithm for ranges without unique items: common
+    subsequence containing least frequent in first range item is used as an
+    anchor. Ranges where all common items are too frequent are matched using
+    Myers algorithm.
+
+    >>> HistogramMatcher(a='abcabba', b='cbabac').get_matching_blocks()
+    [Match(a=2, b=0, size=1), Match(a=5, b=1, size=2), Match(a=7, b=6, \
+size=0)]
+    >>>
+
+    """
+
+    max_chain = 64
+
+    def match(self, alo, ahi, blo, bhi):  # noqa: C901
+        """Find matching subsequences in a[alo:ahi] and b[blo:bhi].
+
+        Args:
+            alo: First sequence range start.
+            ahi: First sequence range end.
+            blo: Second sequence range start.
+            bhi: Second sequence range end.
+
+        Returns:
+            List of (i, j, size) triples in arbitrary order.
+
+        """
+        a, b = self.a, self.b
+        blocks = []
+        stack = [(alo, ahi, blo, bhi)]
+
+        while stack:
+            alo, ahi, blo, bhi = self.trim(*stack.pop(), blocks)
+
+            if alo == ahi or blo == bhi:
+                continue
+
+            occurrences = {}
+            for i in range(alo, ahi):
+                occurrences.setdefault(a[i], []).append(i)
+
+            best = None  # (rarity, -size), i, j, size
+            common = False
+            j = blo
+
+            while j < bhi:
+                found = occurrences.get(b[j])
+                next_j = j + 1
+
+                if found is not None:
+                    common = True
+                    if len(found) > self.max_chain:
+                        found = ()
+
+                for i in found or ():
+                    si, sj, ei, ej = self.extend(i, j, alo, ahi, blo, bhi)
+                    rarity = min(len(occurrences[a[x]]) for x in range(si, ei))
+                    rank = rarity, si - ei
+
+                    if best is None or rank < best[0]:
+                        best = rank, si, sj, ei - si
+
+                    next_j = max(next_j, ej)
+
+                j = next_j
+
+            if best is None:
+                if common:  # all common items are too frequent
+                    blocks.extend(super().match(alo, ahi, blo, bhi))
+                continue
+
+            _, i, j, size = best
+            blocks.append((i, j, size))
+            stack.append((alo, i, blo, j))
+            stack.append((i + size, ahi, j + size, bhi))
+
+        return blocks
+
+    def extend(self, i, j, alo, ahi, blo, bhi):  # noqa: PLR0913
+        """Extend match of a[i] and b[j] within a[alo:ahi] and b[blo:bhi].
+
+        Args:
+            i: First sequence item index.
+            j: Second sequence item index.
+            alo: First sequence range start.
+            ahi: First sequence range end.
+            blo: Second sequence range start.
+            bhi: Second sequence range end.
+
+        Returns:
+            Tuple with matched ranges starts and ends: si, sj, ei, ej.
+
+        """
+        a, b = self.a, self.b
+        si, sj, ei, ej = i, j, i + 1, j + 1
+
+        while si > alo and sj > blo and a[si - 1] == b[sj - 1]:
+            si -= 1
+            sj -= 1
+
+        while ei < ahi and ej < bhi and a[ei] == b[ej]:
+            ei += 1
+            ej += 1
+
+        return si, sj, ei, ej
+
+
+class PositionalMatcher(Matcher):
+    """Index aligned matcher.
+
+    Items are matched only when they are equal and have the same indexes,
+    so sequences are compared in one linear pass. Suitable for vectors,
+    time series and other fixed layout sequences.
+
+    >>> PositionalMatcher(a='abcd', b='axcde').get_matching_blocks()
+    [Match(a=0, b=0, size=1), Match(a=2, b=2, size=2), Match(a=4, b=5, \
+size=0)]
+    >>>
+
+    """
+
+    def match(self, alo, ahi, blo, bhi):
+        """Find matching subsequences in a[alo:ahi] and b[blo:bhi].
+
+        Args:
+            alo: First sequence range start.
+            ahi: First sequence range end.
+            blo: Second sequence range start.
+            bhi: Second sequence range end.
+
+        Returns:
+            List of (i, j, size) triples in arbitrary order.
+
+        """
+        a, b = self.a, self.b
+        blocks = []
+        start = None
+
+        for i, j in zip(range(alo, ahi), range(blo, bhi)):
+            if a[i] == b[j]:
+                if start is None:
+                    start = i, j
+            elif start is not None:
+                blocks.append((*start, i - start[0]))
+                start = None
+
+        if start is not None:
+            size = min(ahi - start[0], bhi - start[1])
+            blocks.append((*start, size))
+
+        return blocks
+
+
+class SortedMatcher(MyersMatcher):
+    """Merge walk matcher for sorted sequences.
+
+    Both sequences are expected to be sorted, so they are matched by one
+    merge pass in linear time. Items are compared using `<` operator, Myers
+    algorithm is used when items are not comparable.
+
+    >>> SortedMatcher(a=[1, 2, 4, 5], b=[0, 1, 2, 3, 5]).get_matching_blocks()
+    [Match(a=0, b=1, size=2), Match(a=3, b=4, size=1), Match(a=4, b=5, \
+size=0)]
+    >>>
+
+    """
+
+    def match(self, alo, ahi, blo, bhi):
+        """Find matching subsequences in a[alo:ahi] and b[blo:bhi].
+
+        Args:
+            alo: First sequence range start.
+            ahi: First sequence range end.
+            blo: Second sequence range start.
+            bhi: Second sequence range end.
+
+        Returns:
+            List of (i, j, size) triples in arbitrary order.
+
+        """
+        a, b = self.a, self.b
+        blocks = []
+        i, j = alo, blo
+
+        try:
+            while i < ahi and j < bhi:
+                if a[i] < b[j]:
+                    i += 1
+                elif b[j] < a[i]:
+                    j += 1
+                else:
+                    blocks.append((i, j, 1))
+                    i += 1
+                    j += 1
+        except TypeError:  # not comparable items
+            return super().match(alo, ahi, blo, bhi)
+
+        return blocks
+
+
+MATCHERS = {
+    'difflib': DifflibMatcher,
+    'histogram': HistogramMatcher,
+    'myers': MyersMatcher,
+    'patience': PatienceMatcher,
+    'positional': PositionalMatcher,
+    'sorted': SortedMatcher,
+}
+
+
+def get_matcher(algorithm=None):
+    """Return sequence matcher for algorithm.
+
+    Args:
+        algorithm: Algorithm name, one of `difflib` (default), `histogram`,
+            `myers`, `patience`, `positional` or `sorted`.
+
+    Returns:
+        Sequence matcher object.
+
+    Raises:
+        ValueError: Unsupported algorithm passed.
+
+    """
+    try:
+        return MATCHERS[algorithm or 'difflib']()
+    except KeyError:
+        raise ValueError(f'unsupported algorithm: {algorithm}') from None
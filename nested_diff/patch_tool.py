@@ -24,6 +24,9 @@ examples:
   patch document:
     %(prog)s target.json patch.json
 
+  check patch applies cleanly, target stays unchanged:
+    %(prog)s --check target.json patch.json
+
   redefine serialization options:
     %(prog)s --ofmt json --ofmt-opts '{"indent": null}' target.json patch.json
 """
@@ -48,6 +51,20 @@ class App(nested_diff.cli.App):
 
         return super().get_dumper(fmt, **kwargs)
 
+    def get_optional_args_parser(self):
+        """Return parser for optional part (dash prefixed) of CLI args."""
+        parser = super().get_optional_args_parser()
+
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help="don't patch target, just check patch applies cleanly; paths "
+            'to conflicting values are printed as JSON arrays, exit code is 1 '
+            'when any found',
+        )
+
+        return parser
+
     def get_positional_args_parser(self):
         """Return parser for positional part of CLI args."""
         parser = super().get_positional_args_parser()
@@ -67,6 +84,20 @@ class App(nested_diff.cli.App):
 
         return parser
 
+    @staticmethod
+    def check(target, diff):
+        """Check object may be patched by nested diff cleanly.
+
+        Args:
+            target: Object to check.
+            diff: Nested diff.
+
+        Returns:
+            List of paths to conflicting values.
+
+        """
+        return nested_diff.Patcher().check(target, diff, find_all=True)
+
     @staticmethod
     def patch(target, diff):
         """Patch object using nested diff..
@@ -83,10 +114,19 @@ class App(nested_diff.cli.App):
 
     def run(self):
         """Patch app entry point."""
-        patched = self.patch(
-            self.load(self.args.target_file),
-            self.load(self.args.patch_file),
-        )
+        target = self.load(self.args.target_file)
+        diff = self.load(self.args.patch_file)
+
+        if self.args.check:
+            import json  # noqa: PLC0415
+
+            conflicts = self.check(target, diff)
+            for path in conflicts:
+                sys.stdout.write(json.dumps(path, default=repr) + '\n')
+
+            return 1 if conflicts else 0
+
+        patched = self.patch(target, diff)
 
         self.args.target_file.seek(0)
         self.dumper.dump(self.args.target_file, patched)
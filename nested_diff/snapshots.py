@@ -0,0 +1,389 @@
+# Copyright 2026 Michael Samoglyadov
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Versions storage: full keyframes and nested diffs in between."""
+
+import abc
+import copy
+import os
+import pickle
+import sqlite3
+import threading
+from bisect import bisect_right, insort
+from concurrent.futures import ThreadPoolExecutor
+
+from nested_diff import Differ, Patcher
+
+__all__ = [
+    'DirectoryStore',
+    'SnapshotStore',
+    'SqliteStore',
+]
+
+DIFF = 'diff'
+KEYFRAME = 'keyframe'
+
+_PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+
+class SnapshotStore(abc.ABC):
+    """Base class for snapshots stores.
+
+    Every version except the first one is stored as a diff against previous
+    version. First version and then every `keyframe_interval`-th one are
+    also stored as is (keyframes), so version is reconstructed by patching
+    nearest preceding keyframe with less than `keyframe_interval` diffs.
+    Keyframes are written by background thread, chains are just a bit longer
+    until it is done.
+
+    Data is serialized by pickle, so stores should not be shared with
+    untrusted parties. Subclasses provide storage by `read`, `write`,
+    `list_versions` and `close` methods.
+
+    """
+
+    def __init__(
+        self,
+        *,
+        keyframe_interval=32,
+        differ=None,
+        patcher=None,
+        background=True,
+    ):
+        """Initialize store.
+
+        Args:
+            keyframe_interval: Max distance between keyframes.
+            differ: Differ to calculate diffs, new one with disabled old,
+                unchanged and removed values is used when omitted.
+            patcher: Patcher to reconstruct versions.
+            background: Write keyframes by background thread.
+
+        """
+        self.keyframe_interval = keyframe_interval
+        self.differ = differ or Differ(O=False, U=False, trimR=True)
+        self.patcher = patcher or Patcher()
+
+        self._lock = threading.RLock()
+        self._executor = ThreadPoolExecutor(1) if background else None
+        self._keyframes = sorted(self.list_versions(KEYFRAME))
+        versions = self.list_versions(DIFF) + self._keyframes
+        self._count = max(versions) + 1 if versions else 0
+        self._last = None  # last version, to diff new one against
+        self._scheduled = self._keyframes[-1] if self._keyframes else 0
+
+    def __enter__(self):
+        """Return store itself."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close store."""
+        self.close()
+
+    def __len__(self):
+        """Return amount of stored versions."""
+        return self._count
+
+    def close(self):
+        """Wait for background writes to be finished."""
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def compact(self):
+        """Write missed keyframes.
+
+        Useful when keyframe interval decreased or background writes were
+        interrupted.
+
+        """
+        with self._lock:
+            if not self._count:
+                return
+
+            obj = self._load(KEYFRAME, 0)
+            base = 0
+            keyframes = set(self._keyframes)
+
+            for version in range(1, self._count):
+                obj = self.patcher.patch(obj, self._load(DIFF, version))
+
+                if version in keyframes:
+                    base = version
+                elif version - base >= self.keyframe_interval:
+                    self._write_keyframe(version, obj)
+                    base = version
+
+            self._scheduled = max(self._scheduled, self._keyframes[-1])
+
+    def get(self, version=-1):
+        """Reconstruct stored version.
+
+        Args:
+            version: Version number, negative ones are counted from the end.
+
+        Returns:
+            Reconstructed object.
+
+        Raises:
+            IndexError: No such version.
+
+        """
+        with self._lock:
+            if version < 0:
+                version += self._count
+
+            if not 0 <= version < self._count:
+                raise IndexError('version out of range')
+
+            base = self._keyframes[bisect_right(self._keyframes, version) - 1]
+            obj = self._load(KEYFRAME, base)
+            diffs = [self._load(DIFF, i) for i in range(base + 1, version + 1)]
+
+        # patchers keep per run state (journal), so a copy is used by each
+        # call: reads are not serialized while patching
+        patcher = copy.copy(self.patcher)
+        for diff in diffs:
+            obj = patcher.patch(obj, diff)
+
+        return obj
+
+    def put(self, obj):
+        """Store new version of an object.
+
+        Args:
+            obj: Object to store. Copy of the object is made, so it may be
+                changed afterwards.
+
+        Returns:
+            Version number.
+
+        """
+        obj = copy.deepcopy(obj)
+
+        with self._lock:
+            version = self._count
+
+            if version == 0:
+                self._write_keyframe(version, obj)
+            else:
+                if self._last is None:
+                    self._last = self.get(version - 1)
+
+                _, diff = self.differ.diff(self._last, obj)
+                self.write(DIFF, version, pickle.dumps(diff, _PROTOCOL))
+
+                if version - self._scheduled >= self.keyframe_interval:
+                    self._scheduled = version
+                    if self._executor is None:
+                        self._write_keyframe(version, obj)
+                    else:
+                        self._executor.submit(
+                            self._write_keyframe,
+                            version,
+                            obj,  # not changed: next version is a new copy
+                        )
+
+            self._count += 1
+            self._last = obj
+
+        return version
+
+    def _load(self, kind, version):
+        return pickle.loads(self.read(kind, version))  # noqa: S301
+
+    def _write_keyframe(self, version, obj):
+        data = pickle.dumps(obj, _PROTOCOL)
+
+        with self._lock:
+            self.write(KEYFRAME, version, data)
+            insort(self._keyframes, version)
+
+    @abc.abstractmethod
+    def list_versions(self, kind):
+        """Return stored versions.
+
+        Args:
+            kind: 'keyframe' or 'diff'.
+
+        """
+
+    @abc.abstractmethod
+    def read(self, kind, version):
+        """Return stored data.
+
+        Args:
+            kind: 'keyframe' or 'diff'.
+            version: Version number.
+
+        """
+
+    @abc.abstractmethod
+    def write(self, kind, version, data):
+        """Store data.
+
+        Args:
+            kind: 'keyframe' or 'diff'.
+            version: Version number.
+            data: Serialized keyframe or diff (bytes).
+
+        """
+
+
+class DirectoryStore(SnapshotStore):
+    """Store snapshots as files in local directory."""
+
+    def __init__(self, path, **kwargs):
+        """Initialize store.
+
+        Args:
+            path: Directory path, created when not exists.
+            kwargs: Passed to SnapshotStore as is.
+
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+        super().__init__(**kwargs)
+
+    def list_versions(self, kind):
+        """Return stored versions.
+
+        Args:
+            kind: 'keyframe' or 'diff'.
+
+        Returns:
+            List of versions numbers.
+
+        """
+        suffix = '.' + kind
+
+        return [
+            int(name[: -len(suffix)])
+            for name in os.listdir(self.path)
+            if name.endswith(suffix)
+        ]
+
+    def read(self, kind, version):
+        """Return stored data.
+
+        Args:
+            kind: 'keyframe' or 'diff'.
+            version: Version number.
+
+        Returns:
+            Bytes.
+
+        """
+        with open(self._get_path(kind, version), 'rb') as f:
+            return f.read()
+
+    def write(self, kind, version, data):
+        """Store data.
+
+        File is written under temporary name and renamed then, so readers
+        never see partially written files.
+
+        Args:
+            kind: 'keyframe' or 'diff'.
+            version: Version number.
+            data: Serialized keyframe or diff (bytes).
+
+        """
+        path = self._get_path(kind, version)
+
+        with open(path + '.tmp', 'wb') as f:
+            f.write(data)
+
+        os.replace(path + '.tmp', path)
+
+    def _get_path(self, kind, version):
+        return os.path.join(self.path, f'{version}.{kind}')
+
+
+class SqliteStore(SnapshotStore):
+    """Store snapshots in SQLite database."""
+
+    def __init__(self, path, **kwargs):
+        """Initialize store.
+
+        Args:
+            path: Database path, created when not exists.
+            kwargs: Passed to SnapshotStore as is.
+
+        """
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            'CREATE TABLE IF NOT EXISTS snapshots ('
+            'kind TEXT, version INTEGER, data BLOB, '
+            'PRIMARY KEY (kind, version))',
+        )
+
+        super().__init__(**kwargs)
+
+    def close(self):
+        """Wait for background writes to be finished and close database."""
+        super().close()
+        self.db.close()
+
+    def list_versions(self, kind):
+        """Return stored versions.
+
+        Args:
+            kind: 'keyframe' or 'diff'.
+
+        Returns:
+            List of versions numbers.
+
+        """
+        with self._lock:
+            rows = self.db.execute(
+                'SELECT version FROM snapshots WHERE kind = ?',
+                (kind,),
+            )
+
+            return [row[0] for row in rows]
+
+    def read(self, kind, version):
+        """Return stored data.
+
+        Args:
+            kind: 'keyframe' or 'diff'.
+            version: Version number.
+
+        Returns:
+            Bytes.
+
+        """
+        with self._lock:
+            (data,) = self.db.execute(
+                'SELECT data FROM snapshots WHERE kind = ? AND version = ?',
+                (kind, version),
+            ).fetchone()
+
+            return data
+
+    def write(self, kind, version, data):
+        """Store data.
+
+        Args:
+            kind: 'keyframe' or 'diff'.
+            version: Version number.
+            data: Serialized keyframe or diff (bytes).
+
+        """
+        with self._lock, self.db:  # commit when done
+            self.db.execute(
+                'INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?)',
+                (kind, version, data),
+            )
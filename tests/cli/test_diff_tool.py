@@ -174,6 +174,42 @@ def test_text_default(capsys, expected, rpath):
     assert captured.out == expected
 
 
+@pytest.mark.parametrize('algorithm', ['histogram', 'myers', 'patience'])
+def test_text_algorithm(capsys, content, rpath, algorithm):
+    exit_code = nested_diff.diff_tool.App(
+        args=(
+            rpath('shared.text.a.json'),
+            rpath('shared.text.b.json'),
+            '--algorithm',
+            algorithm,
+        ),
+    ).run()
+
+    captured = capsys.readouterr()
+    assert captured.err == ''
+    assert exit_code == 1
+
+    expected = content(rpath('test_diff_tool.test_text_default.exp'))
+    assert captured.out == expected
+
+
+def test_positional_algorithm(capsys, expected, rpath):
+    exit_code = nested_diff.diff_tool.App(
+        args=(
+            rpath('shared.vector.a.json'),
+            rpath('shared.vector.b.json'),
+            '--algorithm',
+            'positional',
+        ),
+    ).run()
+
+    captured = capsys.readouterr()
+    assert captured.err == ''
+    assert exit_code == 1
+
+    assert captured.out == expected
+
+
 def test_text_default_term(capsys, expected, rpath):
     exit_code = nested_diff.diff_tool.App(
         args=(
@@ -485,6 +521,31 @@ def test_quiet_diff(capsys, rpath):
     assert captured.out == ''
 
 
+def test_quiet_diff_stops_on_first_difference(rpath):
+    compared = []
+
+    class TestApp(nested_diff.diff_tool.App):
+        def diff(self, a, b, **kwargs):  # noqa: ARG002 # pragma nocover
+            raise AssertionError('must not be called in quiet mode')
+
+        def equal(self, a, b, **kwargs):
+            compared.append((a, b))
+            return super().equal(a, b, **kwargs)
+
+    exit_code = TestApp(
+        args=(
+            rpath('shared.lists.a.json'),
+            rpath('shared.lists.a.json'),
+            rpath('shared.lists.b.json'),
+            rpath('shared.lists.a.json'),
+            '--quiet',
+        ),
+    ).run()
+
+    assert exit_code == 1
+    assert len(compared) == 2
+
+
 def test_exit_code_diff_absent(rpath):
     exit_code = nested_diff.diff_tool.App(
         args=(
@@ -804,6 +865,42 @@ def test_yaml_streams(capsys, expected, rpath):
     assert captured.out == expected
 
 
+@pytest.mark.parametrize(
+    ('algorithm', 'expected'),
+    [
+        ('difflib', [{'R': 0}]),
+        ('positional', [{'N': 1, 'O': 0}, {'N': 2, 'O': 1}, {'R': 2}]),
+    ],
+)
+def test_yaml_streams_algorithm(capsys, tmp_path, algorithm, expected):
+    a = tmp_path / 'a.yaml'
+    a.write_text('--- 0\n--- 1\n--- 2\n')
+    b = tmp_path / 'b.yaml'
+    b.write_text('--- 1\n--- 2\n')
+
+    exit_code = nested_diff.diff_tool.App(
+        args=(
+            '--algorithm',
+            algorithm,
+            '--ofmt',
+            'json',
+            '-U',
+            '0',
+            str(a),
+            str(b),
+        ),
+    ).run()
+
+    captured = capsys.readouterr()
+    assert captured.err == ''
+    assert exit_code == 1
+
+    assert json.loads(captured.out) == {
+        'D': expected,
+        'E': 'nested_diff.ListOfDocuments',
+    }
+
+
 def test_yaml_stream_vs_single(capsys, expected, rpath):
     exit_code = nested_diff.diff_tool.App(
         args=(
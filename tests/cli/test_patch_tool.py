@@ -237,3 +237,46 @@ def test_arg_files_absent():
         nested_diff.patch_tool.App(args=('/file/not/exists')).run()
 
     assert e.value.code == 2
+
+
+def test_check(capsys, content, rpath, tmp_path):
+    target_file_name = f'{tmp_path}.got.json'
+    copyfile(
+        rpath('shared.lists.a.json'),
+        target_file_name,
+    )
+    exit_code = nested_diff.patch_tool.App(
+        args=(
+            '--check',
+            target_file_name,
+            rpath('shared.lists.patch.json'),
+        ),
+    ).run()
+
+    captured = capsys.readouterr()
+    assert captured.out == ''
+    assert captured.err == ''
+    assert exit_code == 0
+
+    assert content(target_file_name) == content(rpath('shared.lists.a.json'))
+
+
+def test_check_conflicts(capsys, content, rpath, tmp_path):
+    target_file_name = f'{tmp_path}.got.json'
+    with open(target_file_name, 'w') as f:
+        f.write('[0, [], 3]')
+
+    exit_code = nested_diff.patch_tool.App(
+        args=(
+            '--check',
+            target_file_name,
+            rpath('shared.lists.patch.json'),
+        ),
+    ).run()
+
+    captured = capsys.readouterr()
+    assert captured.out == '[1, 1]\n'
+    assert captured.err == ''
+    assert exit_code == 1
+
+    assert content(target_file_name) == '[0, [], 3]'
@@ -146,6 +146,30 @@ RESULTS = {
     'inf_vs_inf': {
         'result': '<div class="nDvD"><div>  <div class="nDvU">inf</div></div></div>',
     },
+    'keyed_lists': {
+        'result': '<div class="nDvD"><div># <div class="nDvE">&lt;list&gt;</div></div><div>  <div class="nDkD">[0]</div></div><div class="nDvD"><div>    <div class="nDkU">{&#x27;id&#x27;}</div></div><div class="nDvD"><div>      <div class="nDvU">2</div></div></div><div>    <div class="nDkO">{&#x27;v&#x27;}</div></div><div class="nDvD"><div>-     <div class="nDvO">&#x27;b&#x27;</div></div><div>+     <div class="nDvN">&#x27;B&#x27;</div></div></div></div><div>  <div class="nDkU">[1]</div></div><div class="nDvD"><div>    <div class="nDvU">{&#x27;id&#x27;: 1, &#x27;v&#x27;: &#x27;a&#x27;}</div></div></div><div>+ <div class="nDkA">[2]</div></div><div class="nDvD"><div>+   <div class="nDvA">{&#x27;id&#x27;: 4}</div></div></div><div>  <div class="nDkU">[3]</div></div><div class="nDvD"><div>    <div class="nDvU">{&#x27;id&#x27;: 5}</div></div></div><div>- <div class="nDkR">[2]</div></div><div class="nDvD"><div>-   <div class="nDvR">{&#x27;id&#x27;: 3}</div></div></div></div>',
+    },
+    'keyed_lists_duplicate_keys': {
+        'result': '<div class="nDvD"><div>  <div class="nDkU">[0]</div></div><div class="nDvD"><div>    <div class="nDvU">{&#x27;id&#x27;: 1}</div></div></div><div>- <div class="nDkR">[1]</div></div><div class="nDvD"><div>-   <div class="nDvR">{&#x27;id&#x27;: 1}</div></div></div></div>',
+    },
+    'keyed_lists_equal': {
+        'result': '<div class="nDvD"><div>  <div class="nDvU">[{&#x27;id&#x27;: 1}, {&#x27;id&#x27;: 2}]</div></div></div>',
+    },
+    'keyed_lists_equal_noU': {
+        'result': '<div class="nDvD"></div>',
+    },
+    'keyed_lists_moved_noU': {
+        'result': '<div class="nDvD"><div># <div class="nDvE">&lt;list&gt;</div></div><div>  <div class="nDkD">[0]</div></div><div>    <div class="nDvH">moved from index 2</div></div></div>',
+    },
+    'keyed_lists_noAR': {
+        'result': '<div class="nDvD"><div># <div class="nDvE">&lt;list&gt;</div></div><div>  <div class="nDkD">[0]</div></div><div class="nDvD"><div>    <div class="nDkO">{&#x27;v&#x27;}</div></div><div class="nDvD"><div>-     <div class="nDvO">0</div></div><div>+     <div class="nDvN">1</div></div></div></div></div>',
+    },
+    'keyed_lists_noU': {
+        'result': '<div class="nDvD"><div># <div class="nDvE">&lt;list&gt;</div></div><div>  <div class="nDkD">[0]</div></div><div class="nDvD"><div>    <div class="nDkO">{&#x27;v&#x27;}</div></div><div class="nDvD"><div>-     <div class="nDvO">&#x27;b&#x27;</div></div><div>+     <div class="nDvN">&#x27;B&#x27;</div></div></div></div><div>+ <div class="nDkA">[2]</div></div><div class="nDvD"><div>+   <div class="nDvA">{&#x27;id&#x27;: 4}</div></div></div><div>- <div class="nDkR">[2]</div></div><div class="nDvD"><div>-   <div class="nDvR">{&#x27;id&#x27;: 3}</div></div></div></div>',
+    },
+    'keyed_lists_trimR': {
+        'result': '<div class="nDvD"><div># <div class="nDvE">&lt;list&gt;</div></div><div>- <div class="nDkR">[0]</div></div><div class="nDvD"><div>-   <div class="nDvR">None</div></div></div></div>',
+    },
     'line_added_to_empty_string': {
         'result': '<div class="nDvD"><div># <div class="nDvE">&lt;str&gt;</div></div><div>  <div class="nDvH">@@ -1 +1,2 @@</div></div><div>  <div class="nDvU"></div></div><div>+ <div class="nDvA"></div></div></div>',
     },
@@ -203,6 +227,21 @@ RESULTS = {
     'mixed_specific_structures': {
         'result': '<div class="nDvD"><div>  <div class="nDkO">(0)</div></div><div class="nDvD"><div>-   <div class="nDvO">()</div></div><div>+   <div class="nDvN">frozenset()</div></div></div><div>  <div class="nDkD">(1)</div></div><div class="nDvD"><div>#   <div class="nDvE">&lt;set&gt;</div></div><div>+   <div class="nDvA">True</div></div></div></div>',
     },
+    'multiset_lists': {
+        'result': '<div class="nDvD"><div># <div class="nDvE">&lt;list&gt;</div></div><div>  <div class="nDvU">&#x27;y&#x27;</div></div><div>  <div class="nDvU">&#x27;x&#x27;</div></div><div>+ <div class="nDvA">&#x27;x&#x27;</div></div><div>  <div class="nDvU">&#x27;y&#x27;</div></div><div>- <div class="nDvR">&#x27;z&#x27;</div></div></div>',
+    },
+    'multiset_lists_equal': {
+        'result': '<div class="nDvD"><div># <div class="nDvE">&lt;list&gt;</div></div><div>  <div class="nDvU">1</div></div><div>  <div class="nDvU">[0]</div></div><div>  <div class="nDvU">1</div></div></div>',
+    },
+    'multiset_lists_equal_noU': {
+        'result': '<div class="nDvD"></div>',
+    },
+    'multiset_lists_noAR': {
+        'result': '<div class="nDvD"></div>',
+    },
+    'multiset_lists_noU': {
+        'result': '<div class="nDvD"><div># <div class="nDvE">&lt;list&gt;</div></div><div>+ <div class="nDvA">&#x27;x&#x27;</div></div><div>- <div class="nDvR">&#x27;z&#x27;</div></div></div>',
+    },
     'nan_vs_0.0_nans_equal_opt_enabled': {
         'result': '<div class="nDvD"><div>- <div class="nDvO">nan</div></div><div>+ <div class="nDvN">0.0</div></div></div>',
     },
@@ -356,6 +395,12 @@ RESULTS = {
     'simple_strings_in_text_mode': {
         'result': '<div class="nDvD"><div>- <div class="nDvO">&#x27;bar&#x27;</div></div><div>+ <div class="nDvN">&#x27;baz&#x27;</div></div></div>',
     },
+    'sorted_lists': {
+        'result': '<div class="nDvD"><div>+ <div class="nDkA">[0]</div></div><div class="nDvD"><div>+   <div class="nDvA">0</div></div></div><div>  <div class="nDkU">[1]</div></div><div class="nDvD"><div>    <div class="nDvU">1</div></div></div><div>  <div class="nDkU">[2]</div></div><div class="nDvD"><div>    <div class="nDvU">2</div></div></div><div>  <div class="nDkO">[3]</div></div><div class="nDvD"><div>-   <div class="nDvO">4</div></div><div>+   <div class="nDvN">3</div></div></div><div>  <div class="nDkU">[4]</div></div><div class="nDvD"><div>    <div class="nDvU">5</div></div></div><div>  <div class="nDkU">[5]</div></div><div class="nDvD"><div>    <div class="nDvU">7</div></div></div></div>',
+    },
+    'sorted_lists_noU': {
+        'result': '<div class="nDvD"><div>+ <div class="nDkA">[0]</div></div><div class="nDvD"><div>+   <div class="nDvA">0</div></div></div><div>  <div class="nDkO">[2]</div></div><div class="nDvD"><div>-   <div class="nDvO">4</div></div><div>+   <div class="nDvN">3</div></div></div></div>',
+    },
     'str_vs_bytes': {
         'result': '<div class="nDvD"><div>- <div class="nDvO">&#x27;a&#x27;</div></div><div>+ <div class="nDvN">b&#x27;a&#x27;</div></div></div>',
     },
@@ -405,7 +450,7 @@ RESULTS = {
         'result': '<div class="nDvD"><div># <div class="nDvE">&lt;str&gt;</div></div><div>  <div class="nDvH">@@ -1,3 +1,2 @@</div></div><div>  <div class="nDvU">A</div></div><div>- <div class="nDvR">B</div></div><div>  <div class="nDvU">C</div></div></div>',
     },
     'text_multiple_hunks': {
-        'result': '<div class="nDvD"><div># <div class="nDvE">&lt;str&gt;</div></div><div>  <div class="nDvH">@@ -1 +1 @@</div></div><div>+ <div class="nDvA">A</div></div><div>  <div class="nDvH">@@ -3 +4 @@</div></div><div>- <div class="nDvR">C</div></div></div>',
+        'result': '<div class="nDvD"><div># <div class="nDvE">&lt;str&gt;</div></div><div>  <div class="nDvH">@@ -2 +2 @@</div></div><div>+ <div class="nDvA">A</div></div><div>  <div class="nDvH">@@ -3 +4 @@</div></div><div>- <div class="nDvR">C</div></div></div>',
     },
     'text_trailing_newlines': {
         'result': '<div class="nDvD"><div># <div class="nDvE">&lt;str&gt;</div></div><div>  <div class="nDvH">@@ -1,3 +1,3 @@</div></div><div>  <div class="nDvU">A</div></div><div>- <div class="nDvR">B</div></div><div>+ <div class="nDvA">b</div></div><div>  <div class="nDvU"></div></div></div>',
@@ -146,6 +146,30 @@ RESULTS = {
     'inf_vs_inf': {
         'result': '  inf\x1b[0m\n',
     },
+    'keyed_lists': {
+        'result': "\x1b[34m# <list>\x1b[0m\n  [0]\x1b[0m\n    {'id'}\x1b[0m\n      2\x1b[0m\n    {'v'}\x1b[0m\n\x1b[31m-     'b'\x1b[0m\n\x1b[32m+     'B'\x1b[0m\n  [1]\x1b[0m\n    {'id': 1, 'v': 'a'}\x1b[0m\n\x1b[1;32m+ [2]\x1b[0m\n\x1b[32m+   {'id': 4}\x1b[0m\n  [3]\x1b[0m\n    {'id': 5}\x1b[0m\n\x1b[1;31m- [2]\x1b[0m\n\x1b[31m-   {'id': 3}\x1b[0m\n",
+    },
+    'keyed_lists_duplicate_keys': {
+        'result': "  [0]\x1b[0m\n    {'id': 1}\x1b[0m\n\x1b[1;31m- [1]\x1b[0m\n\x1b[31m-   {'id': 1}\x1b[0m\n",
+    },
+    'keyed_lists_equal': {
+        'result': "  [{'id': 1}, {'id': 2}]\x1b[0m\n",
+    },
+    'keyed_lists_equal_noU': {
+        'result': '',
+    },
+    'keyed_lists_moved_noU': {
+        'result': '\x1b[34m# <list>\x1b[0m\n  [0]\x1b[0m\n\x1b[35m    moved from index 2\x1b[0m\n',
+    },
+    'keyed_lists_noAR': {
+        'result': "\x1b[34m# <list>\x1b[0m\n  [0]\x1b[0m\n    {'v'}\x1b[0m\n\x1b[31m-     0\x1b[0m\n\x1b[32m+     1\x1b[0m\n",
+    },
+    'keyed_lists_noU': {
+        'result': "\x1b[34m# <list>\x1b[0m\n  [0]\x1b[0m\n    {'v'}\x1b[0m\n\x1b[31m-     'b'\x1b[0m\n\x1b[32m+     'B'\x1b[0m\n\x1b[1;32m+ [2]\x1b[0m\n\x1b[32m+   {'id': 4}\x1b[0m\n\x1b[1;31m- [2]\x1b[0m\n\x1b[31m-   {'id': 3}\x1b[0m\n",
+    },
+    'keyed_lists_trimR': {
+        'result': '\x1b[34m# <list>\x1b[0m\n\x1b[1;31m- [0]\x1b[0m\n\x1b[31m-   None\x1b[0m\n',
+    },
     'line_added_to_empty_string': {
         'result': '\x1b[34m# <str>\x1b[0m\n\x1b[35m  @@ -1 +1,2 @@\x1b[0m\n  \x1b[0m\n\x1b[32m+ \x1b[0m\n',
     },
@@ -203,6 +227,21 @@ RESULTS = {
     'mixed_specific_structures': {
         'result': '  (0)\x1b[0m\n\x1b[31m-   ()\x1b[0m\n\x1b[32m+   frozenset()\x1b[0m\n  (1)\x1b[0m\n\x1b[34m#   <set>\x1b[0m\n\x1b[32m+   True\x1b[0m\n',
     },
+    'multiset_lists': {
+        'result': "\x1b[34m# <list>\x1b[0m\n  'y'\x1b[0m\n  'x'\x1b[0m\n\x1b[32m+ 'x'\x1b[0m\n  'y'\x1b[0m\n\x1b[31m- 'z'\x1b[0m\n",
+    },
+    'multiset_lists_equal': {
+        'result': '\x1b[34m# <list>\x1b[0m\n  1\x1b[0m\n  [0]\x1b[0m\n  1\x1b[0m\n',
+    },
+    'multiset_lists_equal_noU': {
+        'result': '',
+    },
+    'multiset_lists_noAR': {
+        'result': '',
+    },
+    'multiset_lists_noU': {
+        'result': "\x1b[34m# <list>\x1b[0m\n\x1b[32m+ 'x'\x1b[0m\n\x1b[31m- 'z'\x1b[0m\n",
+    },
     'nan_vs_0.0_nans_equal_opt_enabled': {
         'result': '\x1b[31m- nan\x1b[0m\n\x1b[32m+ 0.0\x1b[0m\n',
     },
@@ -356,6 +395,12 @@ RESULTS = {
     'simple_strings_in_text_mode': {
         'result': "\x1b[31m- 'bar'\x1b[0m\n\x1b[32m+ 'baz'\x1b[0m\n",
     },
+    'sorted_lists': {
+        'result': '\x1b[1;32m+ [0]\x1b[0m\n\x1b[32m+   0\x1b[0m\n  [1]\x1b[0m\n    1\x1b[0m\n  [2]\x1b[0m\n    2\x1b[0m\n  [3]\x1b[0m\n\x1b[31m-   4\x1b[0m\n\x1b[32m+   3\x1b[0m\n  [4]\x1b[0m\n    5\x1b[0m\n  [5]\x1b[0m\n    7\x1b[0m\n',
+    },
+    'sorted_lists_noU': {
+        'result': '\x1b[1;32m+ [0]\x1b[0m\n\x1b[32m+   0\x1b[0m\n  [2]\x1b[0m\n\x1b[31m-   4\x1b[0m\n\x1b[32m+   3\x1b[0m\n',
+    },
     'str_vs_bytes': {
         'result': "\x1b[31m- 'a'\x1b[0m\n\x1b[32m+ b'a'\x1b[0m\n",
     },
@@ -405,7 +450,7 @@ RESULTS = {
         'result': '\x1b[34m# <str>\x1b[0m\n\x1b[35m  @@ -1,3 +1,2 @@\x1b[0m\n  A\x1b[0m\n\x1b[31m- B\x1b[0m\n  C\x1b[0m\n',
     },
     'text_multiple_hunks': {
-        'result': '\x1b[34m# <str>\x1b[0m\n\x1b[35m  @@ -1 +1 @@\x1b[0m\n\x1b[32m+ A\x1b[0m\n\x1b[35m  @@ -3 +4 @@\x1b[0m\n\x1b[31m- C\x1b[0m\n',
+        'result': '\x1b[34m# <str>\x1b[0m\n\x1b[35m  @@ -2 +2 @@\x1b[0m\n\x1b[32m+ A\x1b[0m\n\x1b[35m  @@ -3 +4 @@\x1b[0m\n\x1b[31m- C\x1b[0m\n',
     },
     'text_trailing_newlines': {
         'result': '\x1b[34m# <str>\x1b[0m\n\x1b[35m  @@ -1,3 +1,3 @@\x1b[0m\n  A\x1b[0m\n\x1b[31m- B\x1b[0m\n\x1b[32m+ b\x1b[0m\n  \x1b[0m\n',
@@ -146,6 +146,30 @@ RESULTS = {
     'inf_vs_inf': {
         'result': '  inf\n',
     },
+    'keyed_lists': {
+        'result': "# <list>\n  [0]\n    {'id'}\n      2\n    {'v'}\n-     'b'\n+     'B'\n  [1]\n    {'id': 1, 'v': 'a'}\n+ [2]\n+   {'id': 4}\n  [3]\n    {'id': 5}\n- [2]\n-   {'id': 3}\n",
+    },
+    'keyed_lists_duplicate_keys': {
+        'result': "  [0]\n    {'id': 1}\n- [1]\n-   {'id': 1}\n",
+    },
+    'keyed_lists_equal': {
+        'result': "  [{'id': 1}, {'id': 2}]\n",
+    },
+    'keyed_lists_equal_noU': {
+        'result': '',
+    },
+    'keyed_lists_moved_noU': {
+        'result': '# <list>\n  [0]\n    moved from index 2\n',
+    },
+    'keyed_lists_noAR': {
+        'result': "# <list>\n  [0]\n    {'v'}\n-     0\n+     1\n",
+    },
+    'keyed_lists_noU': {
+        'result': "# <list>\n  [0]\n    {'v'}\n-     'b'\n+     'B'\n+ [2]\n+   {'id': 4}\n- [2]\n-   {'id': 3}\n",
+    },
+    'keyed_lists_trimR': {
+        'result': '# <list>\n- [0]\n-   None\n',
+    },
     'line_added_to_empty_string': {
         'result': '# <str>\n  @@ -1 +1,2 @@\n  \n+ \n',
     },
@@ -203,6 +227,21 @@ RESULTS = {
     'mixed_specific_structures': {
         'result': '  (0)\n-   ()\n+   frozenset()\n  (1)\n#   <set>\n+   True\n',
     },
+    'multiset_lists': {
+        'result': "# <list>\n  'y'\n  'x'\n+ 'x'\n  'y'\n- 'z'\n",
+    },
+    'multiset_lists_equal': {
+        'result': '# <list>\n  1\n  [0]\n  1\n',
+    },
+    'multiset_lists_equal_noU': {
+        'result': '',
+    },
+    'multiset_lists_noAR': {
+        'result': '',
+    },
+    'multiset_lists_noU': {
+        'result': "# <list>\n+ 'x'\n- 'z'\n",
+    },
     'nan_vs_0.0_nans_equal_opt_enabled': {
         'result': '- nan\n+ 0.0\n',
     },
@@ -356,6 +395,12 @@ RESULTS = {
     'simple_strings_in_text_mode': {
         'result': "- 'bar'\n+ 'baz'\n",
     },
+    'sorted_lists': {
+        'result': '+ [0]\n+   0\n  [1]\n    1\n  [2]\n    2\n  [3]\n-   4\n+   3\n  [4]\n    5\n  [5]\n    7\n',
+    },
+    'sorted_lists_noU': {
+        'result': '+ [0]\n+   0\n  [2]\n-   4\n+   3\n',
+    },
     'str_vs_bytes': {
         'result': "- 'a'\n+ b'a'\n",
     },
@@ -405,7 +450,7 @@ RESULTS = {
         'result': '# <str>\n  @@ -1,3 +1,2 @@\n  A\n- B\n  C\n',
     },
     'text_multiple_hunks': {
-        'result': '# <str>\n  @@ -1 +1 @@\n+ A\n  @@ -3 +4 @@\n- C\n',
+        'result': '# <str>\n  @@ -2 +2 @@\n+ A\n  @@ -3 +4 @@\n- C\n',
     },
     'text_trailing_newlines': {
         'result': '# <str>\n  @@ -1,3 +1,3 @@\n  A\n- B\n+ b\n  \n',
@@ -1,7 +1,13 @@
 import sys
 from pickle import dumps
 
-from nested_diff.handlers import FloatHandler, TextHandler
+from nested_diff.handlers import (
+    FloatHandler,
+    KeyedListHandler,
+    ListHandler,
+    MultisetHandler,
+    TextHandler,
+)
 
 
 def get_tests():
@@ -45,6 +51,102 @@ def get_tests():
             'b': float('inf'),
             'diff': {'U': float('inf')},
         },
+        'keyed_lists': {
+            'a': [
+                {'id': 1, 'v': 'a'},
+                {'id': 2, 'v': 'b'},
+                {'id': 3},
+                {'id': 5},
+            ],
+            'b': [
+                {'id': 2, 'v': 'B'},
+                {'id': 1, 'v': 'a'},
+                {'id': 4},
+                {'id': 5},
+            ],
+            'diff': {
+                'D': [
+                    {
+                        'D': {'id': {'U': 2}, 'v': {'N': 'B', 'O': 'b'}},
+                        'I': [1, 0],
+                    },
+                    {'U': {'id': 1, 'v': 'a'}, 'I': [0, 1]},
+                    {'A': {'id': 4}, 'I': [None, 2]},
+                    {'U': {'id': 5}, 'I': [3, 3]},
+                    {'R': {'id': 3}, 'I': [2, None]},
+                ],
+                'E': 6,
+            },
+            'handlers': {KeyedListHandler: {'key': 'id'}},
+        },
+        'keyed_lists_duplicate_keys': {
+            'a': [{'id': 1}, {'id': 1}],
+            'b': [{'id': 1}],
+            'diff': {'D': [{'U': {'id': 1}}, {'R': {'id': 1}}]},
+            'handlers': {KeyedListHandler: {'key': 'id'}},
+        },
+        'keyed_lists_equal': {
+            'a': [{'id': 1}, {'id': 2}],
+            'b': [{'id': 1}, {'id': 2}],
+            'diff': {'U': [{'id': 1}, {'id': 2}]},
+            'handlers': {KeyedListHandler: {'key': 'id'}},
+        },
+        'keyed_lists_equal_noU': {
+            'a': [{'id': 1}, {'id': 2}],
+            'b': [{'id': 1}, {'id': 2}],
+            'diff': {},
+            'diff_opts': {'U': False},
+            'handlers': {KeyedListHandler: {'key': 'id'}},
+        },
+        'keyed_lists_moved_noU': {
+            'a': [{'id': 1}, {'id': 2}, {'id': 3}],
+            'b': [{'id': 3}, {'id': 1}, {'id': 2}],
+            'diff': {'D': [{'I': [2, 0]}], 'E': 6},
+            'diff_opts': {'U': False},
+            'handlers': {KeyedListHandler: {'key': 'id'}},
+        },
+        'keyed_lists_noAR': {
+            'a': [{'id': 1}, {'id': 2, 'v': 0}],
+            'b': [{'id': 2, 'v': 1}, {'id': 3}],
+            'diff': {
+                'D': [{'D': {'v': {'N': 1, 'O': 0}}, 'I': [1, 0]}],
+                'E': 6,
+            },
+            'diff_opts': {'A': False, 'R': False, 'U': False},
+            'handlers': {KeyedListHandler: {'key': 'id'}},
+            'patched': [{'id': 2, 'v': 1}, {'id': 1}],
+        },
+        'keyed_lists_noU': {
+            'a': [
+                {'id': 1, 'v': 'a'},
+                {'id': 2, 'v': 'b'},
+                {'id': 3},
+                {'id': 5},
+            ],
+            'b': [
+                {'id': 2, 'v': 'B'},
+                {'id': 1, 'v': 'a'},
+                {'id': 4},
+                {'id': 5},
+            ],
+            'diff': {
+                'D': [
+                    {'D': {'v': {'N': 'B', 'O': 'b'}}, 'I': [1, 0]},
+                    {'A': {'id': 4}, 'I': [None, 2]},
+                    {'R': {'id': 3}, 'I': [2, None]},
+                ],
+                'E': 6,
+            },
+            'diff_opts': {'U': False},
+            'handlers': {KeyedListHandler: {'key': 'id'}},
+        },
+        'keyed_lists_trimR': {
+            'a': [{'id': 1}, {'id': 2}],
+            'b': [{'id': 2}],
+            'diff': {'D': [{'R': None, 'I': [0, None]}], 'E': 6},
+            'diff_opts': {'U': False, 'trimR': True},
+            'handlers': {KeyedListHandler: {'key': 'id'}},
+        },
         'line_added_to_empty_string': {
             'a': '',
             'b': '\n',
@@ -189,7 +291,7 @@ def get_tests():
             'b': 'A\nA\nB',
             'diff': {
                 'D': [
-                    {'I': [0, 0, 0, 1]},
+                    {'I': [1, 1, 1, 2]},
                     {'A': 'A'},
                     {'I': [2, 3, 3, 3]},
                     {'R': 'C'},
@@ -227,6 +329,53 @@ def get_tests():
             },
             'handlers': {TextHandler: {'context': 3}},
         },
+        'multiset_lists': {
+            'a': ['x', 'y', 'y', 'z'],
+            'b': ['y', 'x', 'x', 'y'],
+            'diff': {
+                'D': [
+                    {'U': 'y'},
+                    {'U': 'x'},
+                    {'A': 'x'},
+                    {'U': 'y'},
+                    {'R': 'z'},
+                ],
+                'E': 7,
+            },
+            'handlers': {MultisetHandler: {}},
+            'patched': ['x', 'y', 'y', 'x'],
+        },
+        'multiset_lists_equal': {
+            'a': [[0], 1, 1],
+            'b': [1, [0], 1],
+            'diff': {'D': [{'U': 1}, {'U': [0]}, {'U': 1}], 'E': 7},
+            'handlers': {MultisetHandler: {}},
+            'patched': [[0], 1, 1],
+        },
+        'multiset_lists_equal_noU': {
+            'a': [[0], 1, 1],
+            'b': [1, [0], 1],
+            'diff': {},
+            'diff_opts': {'U': False},
+            'handlers': {MultisetHandler: {}},
+            'patched': [[0], 1, 1],
+        },
+        'multiset_lists_noAR': {
+            'a': ['x', 'y', 'y', 'z'],
+            'b': ['y', 'x', 'x', 'y'],
+            'diff': {},
+            'diff_opts': {'A': False, 'R': False, 'U': False},
+            'handlers': {MultisetHandler: {}},
+            'patched': ['x', 'y', 'y', 'z'],
+        },
+        'multiset_lists_noU': {
+            'a': ['x', 'y', 'y', 'z'],
+            'b': ['y', 'x', 'x', 'y'],
+            'diff': {'D': [{'A': 'x'}, {'R': 'z'}], 'E': 7},
+            'diff_opts': {'U': False},
+            'handlers': {MultisetHandler: {}},
+            'patched': ['x', 'y', 'y', 'x'],
+        },
         'set_extended': {
             'a': {1},
             'b': {1, 2},
@@ -269,6 +418,28 @@ def get_tests():
             'diff': {'N': 'baz', 'O': 'bar'},
             'handlers': {TextHandler: {'context': 3}},
         },
+        'sorted_lists': {
+            'a': [1, 2, 4, 5, 7],
+            'b': [0, 1, 2, 3, 5, 7],
+            'diff': {
+                'D': [
+                    {'A': 0},
+                    {'U': 1},
+                    {'U': 2},
+                    {'N': 3, 'O': 4},
+                    {'U': 5},
+                    {'U': 7},
+                ],
+            },
+            'handlers': {ListHandler: {'algorithm': 'sorted'}},
+        },
+        'sorted_lists_noU': {
+            'a': [1, 2, 4, 5, 7],
+            'b': [0, 1, 2, 3, 5, 7],
+            'diff': {'D': [{'A': 0}, {'N': 3, 'O': 4, 'I': 2}]},
+            'diff_opts': {'U': False},
+            'handlers': {ListHandler: {'algorithm': 'sorted'}},
+        },
         'str_vs_bytes': {
             'a': 'a',
             'b': b'a',
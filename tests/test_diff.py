@@ -1,8 +1,12 @@
+import pickle
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
-from nested_diff import Differ, diff, handlers
+import nested_diff
+from nested_diff import Differ, diff, fingerprint, handlers
 from tests.data import specific, standard
 
 TESTS = {}
@@ -10,8 +14,25 @@ TESTS.update(standard.get_tests())
 TESTS.update(specific.get_tests())
 
 
+@pytest.mark.parametrize(
+    'mode',
+    [
+        {},
+        {'iterative': True},
+        {'native_eq': True},
+        {'fingerprints': True},
+        {'fingerprints': True, 'iterative': True},
+    ],
+    ids=[
+        'default',
+        'iterative',
+        'native_eq',
+        'fingerprints',
+        'fingerprints_iterative',
+    ],
+)
 @pytest.mark.parametrize('name', sorted(TESTS.keys()))
-def test_diff(name):
+def test_diff(name, mode):
     try:
         if TESTS[name]['skip']['diff']['cond']:
             pytest.skip(TESTS[name]['skip']['diff'].get('reason', ''))
@@ -22,7 +43,7 @@ def test_diff(name):
     b = TESTS[name]['b']
 
     expected = TESTS[name]['diff']
-    differ = Differ(**TESTS[name].get('diff_opts', {}))
+    differ = Differ(**mode, **TESTS[name].get('diff_opts', {}))
 
     for handler, handler_opts in TESTS[name].get('handlers', {}).items():
         differ.set_handler(handler(**handler_opts))
@@ -35,12 +56,605 @@ def test_diff(name):
         assert got == expected
 
 
+@pytest.mark.parametrize('iterative', [False, True])
+@pytest.mark.parametrize('name', sorted(TESTS.keys()))
+def test_diff_prepared(name, iterative):
+    try:
+        if TESTS[name]['skip']['diff']['cond']:
+            pytest.skip(TESTS[name]['skip']['diff'].get('reason', ''))
+    except KeyError:
+        pass
+
+    a = TESTS[name]['a']
+    b = TESTS[name]['b']
+
+    expected = TESTS[name]['diff']
+    differ = Differ(iterative=iterative, **TESTS[name].get('diff_opts', {}))
+
+    for handler, handler_opts in TESTS[name].get('handlers', {}).items():
+        differ.set_handler(handler(**handler_opts))
+
+    for args in (differ.prepare(a), b), (a, differ.prepare(b)):
+        _, got = differ.diff(*args)
+
+        try:
+            assert TESTS[name]['assert_func'](got, expected)
+        except KeyError:
+            assert got == expected
+
+
+def test_diff_prepared_caches_reused():
+    golden = [[{'k': i}, range(i)] for i in range(10)]
+    dumped = []
+
+    def dumper(obj):
+        dumped.append(obj)
+        return pickle.dumps(obj)
+
+    differ = Differ(U=False, dumper=dumper)
+    prepared = differ.prepare(golden)
+
+    assert len(prepared.item_keys) == 20
+    assert len(dumped) == 10
+
+    diff = differ.diff([], prepared)[1]
+    assert diff['D'][0]['A'] is golden[0]
+    assert next(differ.iter_diff(prepared, [])) == ((0,), 'R', golden[0])
+
+    def same():
+        return [[{'k': i}, range(i)] for i in range(10)]
+
+    # only objects of the other side are dumped, golden ones are cached
+    dumped.clear()
+    assert differ.diff(prepared, same())[0]
+    assert list(differ.iter_diff(same(), prepared)) == []
+    assert differ.diff_parallel(
+        prepared,
+        same(),
+        executor=ThreadPoolExecutor(),
+    )[0]
+    assert differ.equal(prepared, same())
+    assert len(dumped) == 40
+    assert not any(obj is item[1] for obj in dumped for item in golden)
+    assert len(prepared.dumps) == 10  # new entries are not added
+
+
+def test_diff_prepared_custom_item_key():
+    keyed = []
+
+    def item_key(item):
+        keyed.append(item)
+        return item
+
+    differ = Differ(item_key=item_key)
+    prepared = differ.prepare([[0], 1])
+
+    assert not keyed
+    assert not prepared.item_keys
+    assert differ.diff(prepared, [[0], 1])[0]
+
+
+@pytest.mark.parametrize('name', sorted(TESTS.keys()))
+def test_iter_diff_events_presence(name):
+    differ = Differ(**TESTS[name].get('diff_opts', {}))
+
+    for handler, handler_opts in TESTS[name].get('handlers', {}).items():
+        differ.set_handler(handler(**handler_opts))
+
+    events = list(differ.iter_diff(TESTS[name]['a'], TESTS[name]['b']))
+
+    assert bool(events) == bool(TESTS[name]['diff'])
+
+
+def test_iter_diff_dicts():
+    a = {'one': {'x': 1, 'y': 2}, 'two': 2}
+    b = {'one': {'x': 1, 'y': 3}, 'three': 3}
+
+    expected = [
+        (('one', 'x'), 'U', 1),
+        (('one', 'y'), 'O', 2),
+        (('one', 'y'), 'N', 3),
+        (('three',), 'A', 3),
+        (('two',), 'R', 2),
+    ]
+    got = list(Differ().iter_diff(a, b))
+
+    assert sorted(got) == sorted(expected)
+
+
+def test_iter_diff_lists():
+    a = [0, 1, 2, 3, 4]
+    b = [0, 9, 9, 2, 4, 5, 6]
+
+    expected = [
+        ((1,), 'O', 1),
+        ((1,), 'N', 9),
+        ((2,), 'A', 9),
+        ((3,), 'R', 3),
+        ((5,), 'A', 5),
+        ((5,), 'A', 6),
+    ]
+    got = list(Differ(U=False).iter_diff(a, b))
+
+    assert got == expected
+
+
+def test_iter_diff_unchanged_containers():
+    assert list(Differ().iter_diff([], [])) == [((), 'U', [])]
+    assert list(Differ().iter_diff([[]], [[]])) == [((0,), 'U', [])]
+    assert list(Differ(U=False).iter_diff([[]], [[]])) == []
+
+
+def test_iter_diff_terminal_diffs():
+    a = {'set': {1}, 'text': 'a\nb'}
+    b = {'set': {2}, 'text': 'a\nc'}
+
+    differ = Differ(U=False)
+    differ.set_handler(handlers.TextHandler(context=0))
+
+    expected = [
+        (('set',), 'D', {'D': [{'R': 1}, {'A': 2}], 'E': 3}),
+        (
+            ('text',),
+            'D',
+            {'D': [{'I': [1, 2, 1, 2]}, {'R': 'b'}, {'A': 'c'}], 'E': 5},
+        ),
+    ]
+    got = list(differ.iter_diff(a, b))
+
+    assert sorted(got) == expected
+
+
+def test_iter_diff_partly_consumed():
+    differ = Differ(U=False)
+    events = differ.iter_diff([0, 1], [1, 2])
+    next(events)
+
+    assert differ.diff(differ.prepare([1, 2]), [1, 2]) == (True, {})
+    assert differ.equal([1, 2], [1, 2]) is True
+    assert list(events) == [((2,), 'A', 2)]
+
+
+@pytest.mark.parametrize('iterative', [False, True])
+@pytest.mark.parametrize('name', sorted(TESTS.keys()))
+def test_equal(name, iterative):
+    differ = Differ(iterative=iterative)
+
+    for handler, handler_opts in TESTS[name].get('handlers', {}).items():
+        differ.set_handler(handler(**handler_opts))
+
+    expected, _ = differ.diff(TESTS[name]['a'], TESTS[name]['b'])
+    got = differ.equal(TESTS[name]['a'], TESTS[name]['b'])
+
+    assert got is expected
+
+
+def test_equal_stops_on_first_difference():
+    compared = []
+
+    class IntHandler(handlers.IntHandler):
+        def diff(self, differ, a, b):
+            compared.append(a)
+            return super().diff(differ, a, b)
+
+    differ = Differ()
+    differ.set_handler(IntHandler())
+
+    a = [int(i) for i in ('1000', '1001', '1002', '1003')]
+    b = [int(i) for i in ('1000', '1001', '0', '1003')]
+
+    assert differ.equal(a, b) is False
+    assert compared == [1000, 1001, 1002]
+
+    compared.clear()
+    assert differ.equal({'a': 0, 'b': 1}, {'a': 0, 'c': 1}) is False
+    assert compared == []
+
+
+def test_equal_handlers_honored():
+    differ = Differ()
+    differ.set_handler(handlers.FloatHandler(nans_equal=True))
+
+    assert differ.equal([float('nan')], [float('nan')]) is True
+
+    differ.set_handler(handlers.FloatHandler(nans_equal=False))
+
+    assert differ.equal([float('nan')], [float('nan')]) is False
+
+
+def test_native_eq():
+    a = {'list': [0, 1], 'dict': {'k': 'v'}, 'set': {0}, 'tuple': (0,)}
+    b = {'list': [0, 1], 'dict': {'k': 'v'}, 'set': {0}, 'tuple': (0,)}
+
+    got = Differ(native_eq=True).diff(a, b)
+
+    assert got == (True, {'U': a})
+
+    got = Differ(native_eq=True, U=False).diff(a, b)
+
+    assert got == (True, {})
+
+
+def test_native_eq_nans():
+    nan = float('nan')
+
+    got = Differ(native_eq=True).diff([nan], [nan])
+
+    assert got == (True, {'U': [nan]})
+
+    a, b = [float('nan')], [float('nan')]
+    differ = Differ(native_eq=True, U=False)
+
+    assert differ.diff(a, b) == (False, {'D': [{'N': b[0], 'O': a[0]}]})
+
+    differ.set_handler(handlers.FloatHandler(nans_equal=True))
+
+    assert differ.diff(a, b) == (True, {})
+
+
+def test_native_eq_numbers():
+    a = {'int': [1], 'float': [1.0], 'bool': [True]}
+    b = {'int': [True], 'float': [1], 'bool': [1.0]}
+
+    assert Differ(native_eq=True).diff(a, b)[0] is True
+    assert Differ(native_eq=False).diff(a, b)[0] is False
+
+
+@pytest.mark.parametrize('depth', [0, 1, 3])
+@pytest.mark.parametrize('name', sorted(TESTS.keys()))
+def test_diff_parallel(name, depth):
+    try:
+        if TESTS[name]['skip']['diff']['cond']:
+            pytest.skip(TESTS[name]['skip']['diff'].get('reason', ''))
+    except KeyError:
+        pass
+
+    differ = Differ(**TESTS[name].get('diff_opts', {}))
+
+    for handler, handler_opts in TESTS[name].get('handlers', {}).items():
+        differ.set_handler(handler(**handler_opts))
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        _, got = differ.diff_parallel(
+            TESTS[name]['a'],
+            TESTS[name]['b'],
+            depth=depth,
+            executor=executor,
+        )
+
+    try:
+        assert TESTS[name]['assert_func'](got, TESTS[name]['diff'])
+    except KeyError:
+        assert got == TESTS[name]['diff']
+
+
+def test_diff_parallel_process_pool():
+    a = {'one': [{'id': 1, 'v': 0}, {'id': 2}], 'two': 2, 'three': {3}}
+    b = {'one': [{'id': 2}, {'id': 1, 'v': 1}], 'two': 2.0, 'three': {3}}
+
+    differ = Differ(U=False, iterative=True)
+    differ.set_handler(handlers.FloatHandler(nans_equal=True))
+    differ.set_handler(handlers.KeyedListHandler(key='id'), path=['one'])
+
+    expected = differ.diff(a, b)
+
+    for depth in range(3):
+        assert differ.diff_parallel(a, b, depth=depth) == expected
+
+
+def test_diff_parallel_inconsistent_stepwise_diff():
+    class DictHandler(handlers.DictHandler):
+        calls = 0
+
+        def diff_stepwise(self, differ, a, b):
+            self.calls += 1
+            if self.calls > 1:
+                yield None, None, None
+            return (yield from super().diff_stepwise(differ, a, b))
+
+    differ = Differ(handlers=[DictHandler()])
+
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    with pytest.raises(RuntimeError, match='inconsistent subitems'):
+        differ.diff_parallel({'k': 0}, {'k': 1}, executor=executor)
+
+    executor.shutdown()
+
+
+def test_diff_parallel_threads():
+    a = {str(i): [i, 'a\nb\nc', list(range(i))] for i in range(50)}
+    b = {str(i): [i, 'a\nB\nc', list(range(1, i + 2))] for i in range(50)}
+
+    differ = Differ(U=False)
+    differ.set_handler(handlers.TextHandler())
+
+    expected = differ.diff(a, b)
+
+    for depth in range(3):
+        assert differ.diff_parallel(a, b, depth=depth, threads=True) == (
+            expected
+        )
+
+
+def test_shared_handlers_used_concurrently():
+    shared = [handlers.ListHandler(), handlers.TextHandler()]
+
+    pairs = [
+        ([j % i for j in range(100)], [j % (i + 1) for j in range(100)])
+        for i in range(1, 20)
+    ]
+    pairs += [tuple('\n'.join(map(str, x)) for x in pair) for pair in pairs]
+
+    expected = [Differ(handlers=shared).diff(a, b) for a, b in pairs]
+
+    def run(pair):
+        return Differ(handlers=shared).diff(*pair)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for _ in range(3):
+            assert list(executor.map(run, pairs)) == expected
+
+
+def test_differ_fork():
+    differ = Differ(iterative=True)
+    differ.equal([0], [0])
+
+    fork = differ._fork()  # noqa: SLF001
+
+    assert fork.item_key.__self__ is fork
+    assert fork._quick_differ is None  # noqa: SLF001
+    assert fork.diff.__func__ is Differ._diff_iteratively  # noqa: SLF001
+
+    item_key = differ.get_item_key
+    fork = Differ(item_key=item_key)._fork()  # noqa: SLF001
+
+    assert fork.item_key is item_key  # custom item_key is kept as is
+
+
+def test_differ_picklable():
+    differ = Differ(handlers=[handlers.FloatHandler(nans_equal=True)])
+    differ = pickle.loads(pickle.dumps(differ))  # noqa: S301
+
+    assert differ.diff(float('nan'), float('nan'))[0]
+
+
+def test_iterative_deeply_nested():
+    depth = 100_000
+    a = b = None
+
+    for i in range(depth):
+        a = {'k': a, 'i': i}
+        b = {'k': b, 'i': i}
+
+    b = {'k': b, 'extra': 42}
+
+    _, got = Differ(iterative=True, U=False).diff({'k': a}, b)
+
+    assert got == {'D': {'extra': {'A': 42}}}
+
+
+def test_iterative_deeply_changed():
+    depth = 100_000
+    a, b = 0, 1
+
+    for _ in range(depth):
+        a = {'k': a}
+        b = {'k': b}
+
+    equal, got = Differ(iterative=True, O=False, U=False).diff(a, b)
+
+    assert equal is False
+
+    for _ in range(depth):
+        got = got['D']['k']
+
+    assert got == {'N': 1}
+
+
+def test_iterative_deeply_nested_list_items():
+    depth = 100_000
+    a, b = 0, 1
+
+    for _ in range(depth):
+        a = [a]
+        b = [b]
+
+    equal, got = Differ(iterative=True, O=False, U=False).diff([a], [b, 2])
+
+    assert equal is False
+    assert got['D'][1] == {'A': 2}
+
+    got = got['D'][0]
+    for _ in range(depth):
+        got = got['D'][0]
+
+    assert got == {'N': 1}
+
+
+def test_iterative_overridden_diff_method():
+    class ListHandler(handlers.ListHandler):
+        def diff(self, differ, a, b):  # noqa: ARG002
+            return False, {'C': 'overridden'}
+
+    differ = Differ(iterative=True)
+    differ.set_handler(ListHandler())
+
+    assert differ.diff({'k': [0]}, {'k': [1]}) == (
+        False,
+        {'D': {'k': {'C': 'overridden'}}},
+    )
+
+
+def test_path_scoped_handlers():
+    a = {'one': [{'id': 1}, {'id': 2}], 'two': [{'id': 1}, {'id': 2}]}
+    b = {'one': [{'id': 2}, {'id': 1}], 'two': [{'id': 2}, {'id': 1}]}
+
+    differ = Differ(U=False)
+    differ.set_handler(handlers.KeyedListHandler(key='id'), path=['two'])
+
+    expected = (
+        False,
+        {
+            'D': {
+                'one': {'D': [{'A': {'id': 2}}, {'R': {'id': 2}, 'I': 1}]},
+                'two': {'D': [{'I': [1, 0]}], 'E': 6},
+            },
+        },
+    )
+
+    assert differ.diff(a, b) == expected
+    assert sorted(differ.iter_diff(a, b)) == [
+        (('one', 0), 'A', {'id': 2}),
+        (('one', 1), 'R', {'id': 2}),
+        (('two', 0), 'I', [1, 0]),
+    ]
+
+
+def test_path_scoped_handlers_wildcard():
+    a = [{'tags': ['a', 'b'], 'v': 0}, {'tags': ['c', 'd']}]
+    b = [{'tags': ['b', 'a'], 'v': 1}, {'tags': ['d', 'c']}]
+
+    differ = Differ(U=False)
+    differ.set_handler(handlers.KeyedListHandler(key=str), path=(..., 'tags'))
+
+    expected = (
+        False,
+        {
+            'D': [
+                {
+                    'D': {
+                        'tags': {'D': [{'I': [1, 0]}], 'E': 6},
+                        'v': {'N': 1, 'O': 0},
+                    },
+                },
+                {'D': {'tags': {'D': [{'I': [1, 0]}], 'E': 6}}},
+            ],
+        },
+    )
+
+    assert differ.diff(a, b) == expected
+    assert differ.diff({'tags': ['a', 'b']}, {'tags': ['b', 'a']}) == (
+        False,
+        {'D': {'tags': {'D': [{'A': 'b'}, {'R': 'b', 'I': 1}]}}},
+    )
+
+
+def test_path_scoped_handlers_overridden_diff_method():
+    class ListHandler(handlers.ListHandler):
+        def diff(self, differ, a, b):
+            return differ.diff(set(a), set(b))
+
+    a = {'k': [0, 1], 's': [0, 1]}
+    b = {'k': [1, 2], 's': [1, 2]}
+
+    differ = Differ(U=False)
+    differ.set_handler(ListHandler(), path=['s'])
+
+    expected = (
+        False,
+        {
+            'D': {
+                'k': {'D': [{'R': 0}, {'A': 2, 'I': 2}]},
+                's': {'D': [{'R': 0}, {'A': 2}], 'E': 3},
+            },
+        },
+    )
+
+    assert differ.diff(a, b) == expected
+    assert (('s',), 'D', expected[1]['D']['s']) in differ.iter_diff(a, b)
+
+
+def test_item_keys():
+    differ = Differ()
+
+    assert differ.get_item_key('1') == '1'
+    assert len({differ.get_item_key(i) for i in (1, 1.0, True)}) == 3
+    assert differ.get_item_key([0]) == differ.get_item_key([0])
+    assert differ.get_item_key([0]) != differ.get_item_key((0,))
+    assert differ.get_item_key([0]) != differ.get_item_key([False])
+
+
+class Item:
+    # can't be declared inside test (Can't pickle local object)
+    pass
+
+
+def test_item_keys_structural():
+    item = Item()
+    differ = Differ()
+
+    a = [{'x': {item}}, [item, [0]]]
+    b = [{'x': {item}}, [item, [0]]]
+
+    assert differ.get_item_key(a) == differ.get_item_key(b)
+    assert differ.get_item_key(a) != differ.get_item_key(b[::-1])
+
+    shared = [item]
+    recursive = [shared, shared]
+    recursive.append(recursive)
+
+    assert differ.get_item_key(recursive) != differ.get_item_key(a)
+
+
+def test_item_keys_order_independent_for_dicts_and_sets():
+    differ = Differ()
+
+    assert differ._get_structural_key(  # noqa: SLF001
+        [{1: 1, 2: 2}, {1, 2}],
+    ) == differ._get_structural_key(  # noqa: SLF001
+        [{2: 2, 1: 1}, {2, 1}],
+    )
+
+
+def test_dumps_cached_during_run():
+    a = [Item(), Item(), Item()]
+    b = [a[0], a[1], Item()]
+    b[2].changed = True
+    differ = Differ(U=False)
+
+    got = differ.diff(a, b)[1]['D'][0]
+
+    assert got['I'] == 2
+    assert differ.dump_calls == 2  # only changed items dumped, once each
+    assert differ._dumps is None  # noqa: SLF001
+
+    differ.diff(a, b)
+    list(differ.iter_diff(a, b))
+
+    assert differ.dump_calls == 6  # caches dropped between runs
+
+
+def test_item_keys_cached_during_run():
+    shared = [[0]]
+    differ = Differ()
+
+    with differ._caches():  # noqa: SLF001
+        key = differ.get_item_key(shared)
+        shared.append(1)  # keys are not recomputed during the run
+
+        assert differ.get_item_key(shared) == key
+
+    assert differ.get_item_key(shared) != key
+
+
+def test_custom_item_key():
+    a = [{'id': 1, 'v': 0}, {'id': 2, 'v': 0}]
+    b = [{'id': 0, 'v': 0}, {'id': 1, 'v': 1}, {'id': 2, 'v': 0}]
+
+    _, got = Differ(U=False, item_key=lambda x: x['id']).diff(a, b)
+
+    assert got == {
+        'D': [{'A': {'id': 0, 'v': 0}}, {'D': {'v': {'N': 1, 'O': 0}}}],
+    }
+
+
 def test_local_objects():
     def local_function_cant_be_pickled():
         pass
 
     a = [local_function_cant_be_pickled]
-    b = []
+    b = [None]
 
     with pytest.raises(Exception, match="Can't"):
         Differ().diff(a, b)
@@ -156,3 +770,216 @@ def test_text_diff_func_extra_handlers_opt():
     got = diff(a, b, extra_handlers=[handlers.TextHandler(context=3)])
 
     assert got == expected
+
+
+def test_diff_func_differs_pooled(monkeypatch):
+    monkeypatch.setattr(nested_diff, '_POOL', threading.local())
+    monkeypatch.setattr(nested_diff, '_POOL_SIZE', 2)
+
+    text_handler = handlers.TextHandler()
+
+    assert diff('a', 'b', U=False) == {'N': 'b', 'O': 'a'}
+    assert diff('a', 'a', U=False) == {}
+    assert diff('a', 'b', O=False, U=False) == {'N': 'b'}
+    assert diff('a\nb', 'a\nc', extra_handlers=[text_handler])['E'] == 5
+    assert diff([0], [0], handlers=[]) == {'U': [0]}  # unhashable opts
+
+    pool = nested_diff._POOL.instances  # noqa: SLF001
+    assert len(pool) == 2
+    assert (Differ, (), (('U', False),)) not in pool  # evicted
+    (_, differ), _ = pool.items()
+    assert differ.op_o is False
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(diff, 0, 1).result()
+
+    assert len(nested_diff._POOL.instances) == 2  # noqa: SLF001
+
+
+def test_diff_func_extra_handlers_iterator():
+    text_handlers = (h for h in [handlers.TextHandler()])
+    got = diff('a\nb', 'a\nc', extra_handlers=text_handlers)
+
+    assert got['E'] == 5
+
+
+def test_fingerprint():
+    a = {'one': [1, 'a', b'a', None, True], 'two': {0, (1, 2)}, 3: 3.0}
+    b = {3: 3.0, 'two': {(1, 2), 0}, 'one': [1, 'a', b'a', None, True]}
+
+    assert fingerprint(a).hex() == '91e9df0b58dc97ce74c21dfe7aa38125'  # stable
+    assert fingerprint(a) == fingerprint(b)
+    assert fingerprint('a').hex() == fingerprint('a').hex()
+
+    assert fingerprint([1]) != fingerprint([True])
+    assert fingerprint([1]) != fingerprint([1.0])
+    assert fingerprint([1]) != fingerprint((1,))
+    assert fingerprint(['a']) != fingerprint([b'a'])
+    assert fingerprint([[]]) != fingerprint([()])
+    assert fingerprint({'a': 1, 'b': 2}) != fingerprint({'a': 2, 'b': 1})
+
+    recursive = []
+    recursive.append(recursive)
+
+    assert fingerprint(None) is not None
+    assert fingerprint({1: [float('nan')]}) is None
+    assert fingerprint([recursive]) is None
+    assert fingerprint(object()) is None
+
+
+def test_fingerprint_hook():
+    class Lazy:
+        loaded = False
+
+        def __init__(self, digest):
+            self.digest = digest
+
+        def __iter__(self):
+            self.loaded = True
+            return iter(())
+
+        def __nested_diff_fingerprint__(self):
+            return self.digest
+
+    assert fingerprint(Lazy(b'1')) == fingerprint(Lazy(b'1'))
+    assert fingerprint([Lazy(b'1')]) != fingerprint([Lazy(b'2')])
+    assert fingerprint([Lazy(None)]) is None
+
+    class LazyHandler(handlers.TypeHandler):
+        handled_type = Lazy
+
+        def diff(self, differ, a, b):
+            return super().diff(differ, list(a), list(b))
+
+    a = {'x': Lazy(b'1'), 'y': Lazy(b'2')}
+    b = {'x': Lazy(b'1'), 'y': Lazy(b'3')}
+
+    differ = Differ(fingerprints=True, U=False)
+    differ.set_handler(LazyHandler())
+
+    assert differ.diff(a, b) == (True, {})
+    assert not a['x'].loaded
+    assert not b['x'].loaded
+    assert a['y'].loaded
+    assert b['y'].loaded
+
+
+@pytest.mark.parametrize('iterative', [False, True])
+def test_fingerprints_mode_skips_equal_subtrees(iterative):
+    class DictHandler(handlers.DictHandler):
+        calls = 0
+
+        def diff(self, differ, a, b):
+            self.calls += 1
+            return super().diff(differ, a, b)
+
+        def diff_stepwise(self, differ, a, b):
+            self.calls += 1
+            return (yield from super().diff_stepwise(differ, a, b))
+
+    a = {'x': {str(i): {'v': i} for i in range(10)}, 'y': {'v': 0}}
+    b = {'x': {str(i): {'v': i} for i in range(10)}, 'y': {'v': 1}}
+
+    handler = DictHandler()
+    differ = Differ(U=False, fingerprints=True, iterative=iterative)
+    differ.set_handler(handler)
+    golden = differ.prepare(a)
+    cached = len(golden.fingerprints)
+
+    expected = (False, {'D': {'y': {'D': {'v': {'N': 1, 'O': 0}}}}})
+
+    assert differ.diff(golden, b) == expected
+    assert handler.calls == 2  # root and 'y' only
+    assert len(golden.fingerprints) == cached
+    assert differ.diff(a, b) == expected
+
+
+@pytest.mark.parametrize('iterative', [False, True])
+@pytest.mark.parametrize(
+    ('a', 'b', 'extra_handlers'),
+    [
+        ({0, 1}, {1, 0}, ()),
+        ([frozenset((0,)), {0}], [frozenset((0,)), {0}], ()),
+        ([0, 1], [0, 1], (handlers.MultisetHandler(),)),
+        ({'x': [0]}, {'x': [0]}, (handlers.MultisetHandler(),)),
+    ],
+)
+def test_fingerprints_mode_same_format(a, b, extra_handlers, iterative):
+    for opts in ({}, {'U': False}):
+        expected = Differ(**opts)
+        got = Differ(fingerprints=True, iterative=iterative, **opts)
+        for handler in extra_handlers:
+            expected.set_handler(handler)
+            got.set_handler(handler)
+
+        assert got.diff(a, b) == expected.diff(a, b)
+
+    differ = Differ(fingerprints=True)
+    differ.set_handler(handlers.MultisetHandler())
+    differ.set_handler(handlers.ListHandler())
+
+    assert differ.diff([0], [0]) == (True, {'U': [0]})
+
+
+@pytest.mark.parametrize('iterative', [False, True])
+def test_fingerprints_mode_handlers_equality(iterative):
+    class RoundedFloatHandler(handlers.FloatHandler):
+        def diff(self, differ, a, b):
+            return super().diff(differ, round(a, 1), round(b, 1))
+
+    nan = float('nan')
+    a = {'nan': [nan], 'rounded': [0.01], 'same': [0.5]}
+    b = {'nan': [nan], 'rounded': [0.02], 'same': [0.5]}
+
+    # equal for handlers only, fingerprints are different
+    assert fingerprint(a['nan']) is None
+    assert fingerprint(a['rounded']) != fingerprint(b['rounded'])
+
+    for handler in (
+        handlers.FloatHandler(nans_equal=True),
+        RoundedFloatHandler(),
+    ):
+        expected = Differ(U=False)
+        expected.set_handler(handler)
+        got = Differ(U=False, fingerprints=True, iterative=iterative)
+        got.set_handler(handler)
+
+        assert got.diff(a, b) == expected.diff(a, b)
+
+
+def test_native_eq_iterative():
+    a = {'dict': {'k': 'v'}, 'set': {0}}
+    b = {'dict': {'k': 'v'}, 'set': {0}}
+
+    got = Differ(native_eq=True, iterative=True).diff(a, b)
+
+    assert got == (True, {'U': a})
+
+
+def test_native_eq_sets():
+    got = Differ(native_eq=True).diff({0}, {0})
+
+    assert got == (True, {'U': {0}})
+
+
+def test_iter_diff_custom_container():
+    class Container:
+        def __init__(self, items):
+            self.items = items
+
+    class ContainerHandler(handlers.TypeHandler):
+        handled_type = Container
+
+        def diff_stepwise(self, differ, a, b):  # noqa: ARG002
+            equal, _ = yield 'items', a.items, b.items
+
+            return equal, {} if equal else {'D': Container('changed')}
+
+    differ = Differ(U=False)
+    differ.set_handler(ContainerHandler())
+
+    got = list(differ.iter_diff(Container([0]), Container([1])))
+
+    assert got[:2] == [(('items', 0), 'O', 0), (('items', 0), 'N', 1)]
+    assert got[2][:2] == ((), 'D')
+    assert got[2][2]['D'].items == 'changed'
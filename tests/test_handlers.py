@@ -1,6 +1,9 @@
+from collections import deque
+
 import pytest
 
-from nested_diff import Differ, handlers
+from nested_diff import Differ, Iterator, Patcher, handlers
+from nested_diff.formatters import TextFormatter
 
 
 def test_diff_handlers():
@@ -64,3 +67,184 @@ def test_type_handler_diff_equal():
     got = handlers.TypeHandler().diff(Differ(), a, b)
 
     assert got == expected
+
+
+def test_list_handler_common_prefix_and_suffix_trimmed():
+    keyed = []
+
+    def item_key(item):
+        keyed.append(item)
+        return item
+
+    a = list(range(1000))
+    differ = Differ(U=False, item_key=item_key)
+    handler = handlers.ListHandler()
+
+    got = handler.get_matching_blocks(differ, a, [*a[:500], -1, *a[501:]])
+
+    assert got == [(0, 0, 500), (501, 501, 499), (1000, 1000, 0)]
+    assert set(keyed) == {500, -1}  # identical items are not keyed
+
+    got = handler.get_matching_blocks(differ, a, [*a, 1000, 1001])
+
+    assert got == [(0, 0, 1000), (1000, 1002, 0)]
+    assert set(keyed) == {500, -1}
+
+
+def test_keyed_list_handler_callable_key():
+    a = [(1, 'a'), (2, 'b')]
+    b = [(2, 'b'), (1, 'A')]
+
+    differ = Differ(U=False)
+    differ.set_handler(handlers.KeyedListHandler(key=lambda x: x[0]))
+
+    expected = (
+        False,
+        {
+            'D': [
+                {'I': [1, 0]},
+                {'D': ({'I': 1, 'N': 'A', 'O': 'a'},), 'I': [0, 1]},
+            ],
+            'E': 6,
+        },
+    )
+    got = differ.diff(a, b)
+
+    assert got == expected
+    assert Patcher().patch(a, got[1]) == b
+
+
+@pytest.mark.parametrize(
+    ('key', 'a'),
+    [
+        (None, [{'id': 1}, {'id': 2}]),
+        ('id', [{'id': 1}, {}]),  # missing key
+        ('id', [{'id': 1}, {'id': []}]),  # unhashable key
+        ('id', [{'id': 1}, 0]),  # not subscriptable item
+    ],
+)
+def test_keyed_list_handler_falls_back_to_positional_diff(key, a):
+    b = [a[1], a[0]]
+
+    expected = Differ(U=False).diff(a, b)
+
+    differ = Differ(U=False)
+    differ.set_handler(handlers.KeyedListHandler(key=key))
+
+    assert differ.diff(a, b) == expected
+
+
+def test_keyed_list_handler_equal():
+    a = [{'id': 1}, {'id': 2}]
+
+    differ = Differ()
+    differ.set_handler(handlers.KeyedListHandler(key='id'))
+
+    assert differ.equal(a, [{'id': 1}, {'id': 2}])
+    assert not differ.equal(a, [{'id': 2}, {'id': 1}])
+    assert not differ.equal(a, [{'id': 1}, {'id': 3}])
+
+
+def test_list_handler_positional():
+    def item_key(item):
+        raise AssertionError(f'unexpected key calculation for {item}')
+
+    a = [0, 1, 2, 3]
+    b = [1, 2, 3]
+
+    differ = Differ(U=False, item_key=item_key)
+    differ.set_handler(handlers.ListHandler(algorithm='positional'))
+
+    expected = (
+        False,
+        {
+            'D': [
+                {'N': 1, 'O': 0},
+                {'N': 2, 'O': 1},
+                {'N': 3, 'O': 2},
+                {'R': 3},
+            ],
+        },
+    )
+    got = differ.diff(a, b)
+
+    assert got == expected
+    assert differ.diff(b, a)[1]['D'][-1] == {'A': 3}
+    assert Patcher().patch(a, got[1]) == b
+
+
+def test_list_handler_sorted():
+    differ = Differ(U=False)
+    differ.set_handler(handlers.ListHandler(algorithm='sorted'))
+
+    a = list(range(0, 1000, 2))
+    b = list(range(0, 1000, 3))
+    _, diff = differ.diff(a, b)
+
+    assert Patcher().patch(a, diff) == b
+
+
+def test_multiset_handler_equal():
+    differ = Differ(handlers=[handlers.MultisetHandler()])
+
+    assert differ.equal([0, 1, 1], [1, 0, 1])
+    assert not differ.equal([0, 1, 1], [1, 0, 0])
+
+    differ = Differ(handlers=[handlers.MultisetHandler()], native_eq=True)
+
+    assert differ.diff([0, 1], [0, 1]) == (True, {'U': [0, 1]})
+
+
+def test_list_handler_patch_non_sliceable():
+    class DequeHandler(handlers.ListHandler):
+        handled_type = deque
+
+    patcher = Patcher(handlers=[DequeHandler()])
+    diff = {'D': deque([{'R': 0}, {'A': 3, 'I': 2}, {'N': 4, 'O': 2}])}
+
+    assert patcher.patch(deque([0, 1, 2]), diff) == deque([1, 3, 4])
+
+
+def test_multiset_handler_plain_list_diffs():
+    multiset = handlers.MultisetHandler()
+    ndiff = {'D': [{'N': 5, 'O': 2, 'I': 1}]}
+
+    patcher = Patcher()
+    patcher.set_handler(multiset)
+
+    assert patcher.patch([1, 2, 3], ndiff) == [1, 5, 3]
+    assert patcher.check([1, 3, 3], ndiff, find_all=True) == [[1]]
+    assert patcher.invert(ndiff) == {'D': [{'N': 2, 'O': 5, 'I': 1}]}
+    assert patcher.compose(ndiff, {'D': [{'R': 5, 'I': 1}]}) == {
+        'D': [{'R': 2, 'I': 1}],
+    }
+
+    iterator = Iterator()
+    iterator.set_handler(multiset)
+
+    assert list(iterator.iterate_paths(ndiff)) == [
+        ((), ndiff),
+        ((1,), ndiff['D'][0]),
+    ]
+
+    formatter = TextFormatter()
+    expected = formatter.format(ndiff)
+    formatter.set_handler(multiset)
+
+    assert formatter.format(ndiff) == expected
+
+
+@pytest.mark.parametrize(
+    ('target', 'removed', 'expected'),
+    [
+        ([1, 2, 1], [1, 3], [2, 1]),
+        ([{'a': 1}, {'a': 2}, {'a': 1}], [{'a': 1}], [{'a': 2}, {'a': 1}]),
+        ([[0.0], [1]], [[0]], [[1]]),  # equal, but fingerprints differ
+        ([[float('inf')], [object]], [[object]], [[float('inf')]]),
+        ([[1]], [[2]], [[1]]),  # absent
+    ],
+)
+def test_multiset_handler_patch_removed(target, removed, expected):
+    ndiff = {'D': [{'R': i} for i in removed], 'E': 7}
+
+    assert Patcher().patch(target, ndiff) == expected
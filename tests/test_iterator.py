@@ -1,6 +1,6 @@
 import pytest
 
-from nested_diff import Differ, Iterator
+from nested_diff import Differ, Iterator, handlers
 
 
 def test_scalar_diff():
@@ -133,3 +133,128 @@ def test_unknown_containers():
 def test_unsupported_extension():
     with pytest.raises(ValueError, match='unsupported extension: _ext_id_'):
         list(Iterator().iterate({'D': None, 'E': '_ext_id_'}))
+
+
+def test_keyed_list_diff():
+    a = [{'id': 1}, {'id': 2, 'v': 0}, {'id': 3}]
+    b = [{'id': 3}, {'id': 1}, {'id': 2, 'v': 1}]
+    differ = Differ(U=False)
+    differ.set_handler(handlers.KeyedListHandler(key='id'))
+    _, d = differ.diff(a, b)
+
+    expected = [
+        (d, 0, d['D'][0]),
+        (d['D'][0], None, None),
+        (d, 2, d['D'][1]),
+        (d['D'][1], 'v', d['D'][1]['D']['v']),
+        (d['D'][1]['D']['v'], None, None),
+    ]
+
+    got = list(Iterator().iterate(d))
+
+    assert got == expected
+
+
+def test_multiset_diff():
+    d = {'D': [{'R': 'x'}, {'A': 'y'}], 'E': 7}
+
+    assert list(Iterator().iterate(d)) == [(d, None, None)]
+
+
+PATHS_DIFF = {
+    'D': {
+        'spec': {
+            'D': {
+                'hosts': {'D': [{'U': 'a'}, {'D': {'port': {'N': 2}}}]},
+                'tags': {'D': [{'U': 'x'}, {'A': 'y'}], 'E': 3},
+            },
+        },
+        'status': {'U': 'ok'},
+    },
+}
+
+
+def test_iterate_paths():
+    d = PATHS_DIFF
+    spec = d['D']['spec']
+    hosts = spec['D']['hosts']
+
+    expected = [
+        ((), d),
+        (('spec',), spec),
+        (('spec', 'hosts'), hosts),
+        (('spec', 'hosts', 0), hosts['D'][0]),
+        (('spec', 'hosts', 1), hosts['D'][1]),
+        (('spec', 'hosts', 1, 'port'), hosts['D'][1]['D']['port']),
+        (('spec', 'tags'), spec['D']['tags']),
+        (('status',), d['D']['status']),
+    ]
+
+    assert list(Iterator().iterate_paths(d)) == expected
+
+
+def test_iterate_paths_changed_only():
+    d = PATHS_DIFF
+    spec = d['D']['spec']
+
+    expected = [
+        (('spec', 'hosts', 1, 'port'), {'N': 2}),
+        (('spec', 'tags'), spec['D']['tags']),
+    ]
+
+    got = list(Iterator().iterate_paths(d, changed_only=True))
+
+    assert got == expected
+
+
+@pytest.mark.parametrize(
+    ('paths', 'expected'),
+    [
+        ([], []),
+        ([()], [p for p, _ in Iterator().iterate_paths(PATHS_DIFF)]),
+        ([('status',), ('spec', 'tags')], [('spec', 'tags'), ('status',)]),
+        (
+            [('spec', 'hosts', ...)],
+            [
+                ('spec', 'hosts', 0),
+                ('spec', 'hosts', 1),
+                ('spec', 'hosts', 1, 'port'),
+            ],
+        ),
+        ([(..., ..., 1, 'port')], [('spec', 'hosts', 1, 'port')]),
+        ([('spec', 'hosts', 2)], []),
+    ],
+)
+def test_iterate_paths_patterns(paths, expected):
+    got = [p for p, _ in Iterator().iterate_paths(PATHS_DIFF, paths=paths)]
+
+    assert got == expected
+
+
+def test_iterate_paths_prune():
+    visited = []
+
+    def prune(path, subdiff):  # noqa: ARG001
+        visited.append(path)
+        return path == ('spec', 'hosts')
+
+    got = [p for p, _ in Iterator().iterate_paths(PATHS_DIFF, prune=prune)]
+
+    assert got == [(), ('spec',), ('spec', 'tags'), ('status',)]
+    assert visited == [*got[:2], ('spec', 'hosts'), *got[2:]]
+
+
+def test_iterate_paths_max_depth():
+    got = list(Iterator().iterate_paths(PATHS_DIFF, max_depth=1))
+
+    assert got == [
+        ((), PATHS_DIFF),
+        (('spec',), PATHS_DIFF['D']['spec']),
+        (('status',), PATHS_DIFF['D']['status']),
+    ]
+
+    got = list(
+        Iterator().iterate_paths(PATHS_DIFF, max_depth=1, changed_only=True),
+    )
+
+    assert got == [(('spec',), PATHS_DIFF['D']['spec'])]
@@ -0,0 +1,163 @@
+import random
+
+import pytest
+
+from nested_diff import Differ, Patcher, handlers, matchers
+
+ALGORITHMS = ('histogram', 'myers', 'patience', 'positional')
+
+
+def lcs_length(a, b):
+    lengths = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+
+    for i in range(len(a) - 1, -1, -1):
+        for j in range(len(b) - 1, -1, -1):
+            if a[i] == b[j]:
+                lengths[i][j] = lengths[i + 1][j + 1] + 1
+            else:
+                lengths[i][j] = max(lengths[i + 1][j], lengths[i][j + 1])
+
+    return lengths[0][0]
+
+
+def random_sequences(count, max_len=15, alphabet=5):
+    rnd = random.Random(0)  # noqa: S311
+
+    for _ in range(count):
+        yield (
+            [rnd.randrange(alphabet) for _ in range(rnd.randrange(max_len))],
+            [rnd.randrange(alphabet) for _ in range(rnd.randrange(max_len))],
+        )
+
+
+@pytest.mark.parametrize('algorithm', ALGORITHMS)
+def test_matching_blocks(algorithm):
+    matcher = matchers.get_matcher(algorithm)
+
+    for a, b in random_sequences(1000):
+        matcher.set_seqs(a, b)
+        blocks = matcher.get_matching_blocks()
+
+        assert blocks[-1] == (len(a), len(b), 0)
+
+        i = j = 0
+        for ai, bj, size in blocks[:-1]:
+            assert size > 0
+            assert ai >= i
+            assert bj >= j
+            assert (ai, bj) != (i, j) or i == j == 0  # adjacent are joined
+            assert a[ai : ai + size] == b[bj : bj + size]
+            i, j = ai + size, bj + size
+
+        assert matcher.get_matching_blocks() is blocks  # cached
+
+
+def test_myers_finds_longest_common_subsequence():
+    matcher = matchers.MyersMatcher()
+
+    for a, b in random_sequences(1000):
+        matcher.set_seqs(a, b)
+        got = sum(size for _, _, size in matcher.get_matching_blocks())
+
+        assert got == lcs_length(a, b)
+
+
+def test_patience_anchors_unique_items():
+    a, b = 'acc', 'cca'
+
+    assert matchers.MyersMatcher(a, b).get_matching_blocks() == [
+        (1, 0, 2),
+        (3, 3, 0),
+    ]
+    assert matchers.PatienceMatcher(a, b).get_matching_blocks() == [
+        (0, 2, 1),  # unique in both sequences item
+        (3, 3, 0),
+    ]
+
+
+def test_histogram_frequent_items_fallback():
+    matcher = matchers.HistogramMatcher()
+    matcher.max_chain = 1
+
+    matcher.set_seqs('xaxbx', 'axcxb')
+
+    assert matcher.get_matching_blocks() == [
+        (1, 0, 2),
+        (4, 3, 1),
+        (5, 5, 0),
+    ]
+
+    matcher.set_seqs('xaxa', 'axax')  # all items are too frequent
+
+    assert matcher.get_matching_blocks() == [(1, 0, 3), (4, 4, 0)]
+
+
+def test_opcodes():
+    a = ['one', 'two', 'three']
+    b = ['one', '2', 'three', 'four']
+
+    for algorithm in ALGORITHMS:
+        got = matchers.get_matcher(algorithm)
+        got.set_seqs(a, b)
+
+        assert got.get_opcodes() == [
+            ('equal', 0, 1, 0, 1),
+            ('replace', 1, 2, 1, 2),
+            ('equal', 2, 3, 2, 3),
+            ('insert', 3, 3, 3, 4),
+        ]
+
+
+def test_unsupported_algorithm():
+    with pytest.raises(ValueError, match='unsupported algorithm: foo'):
+        matchers.get_matcher('foo')
+
+
+def test_base_matcher_match_abstract():
+    with pytest.raises(TypeError, match='abstract'):
+        matchers.Matcher([0], [1])
+
+
+@pytest.mark.parametrize('algorithm', ALGORITHMS)
+def test_diff_patch(algorithm):
+    differ = Differ(
+        handlers=[
+            handlers.ListHandler(algorithm=algorithm),
+            handlers.TupleHandler(algorithm=algorithm),
+            handlers.TextHandler(algorithm=algorithm),
+        ],
+    )
+    patcher = Patcher()
+
+    for a, b in random_sequences(300, alphabet=3):
+        for old, new in ((a, b), (tuple(a), tuple(b))):
+            _, diff = differ.diff(old, new)
+
+            assert patcher.patch(old, diff) == new
+
+        old = '\n'.join(map(str, a))
+        new = '\n'.join(map(str, b))
+        _, diff = differ.diff(old, new)
+
+        assert patcher.patch(old, diff) == new
+
+
+def test_positional_matches_same_indexes_only():
+    matcher = matchers.PositionalMatcher('abcd', 'bcdab')
+
+    assert matcher.get_matching_blocks() == [(4, 5, 0)]
+
+    matcher.set_seqs('abcd', 'abxd')
+
+    assert matcher.get_matching_blocks() == [(0, 0, 2), (3, 3, 1), (4, 4, 0)]
+
+
+def test_sorted_merge():
+    matcher = matchers.SortedMatcher([1, 3, 5, 7], [0, 3, 4, 5, 6])
+
+    assert matcher.get_matching_blocks() == [(1, 1, 1), (2, 3, 1), (4, 5, 0)]
+
+    matcher.set_seqs([{'x': 0}, {'x': 1}], [{'x': 1}, {'x': 2}])
+
+    # not comparable items, myers algorithm used
+    assert matcher.get_matching_blocks() == [(1, 0, 1), (2, 2, 0)]
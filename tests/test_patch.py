@@ -1,6 +1,9 @@
+import copy
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
-from nested_diff import Differ, Patcher, patch
+from nested_diff import Differ, Patcher, compose, handlers, invert, patch
 from tests.data import specific, standard
 
 TESTS = {}
@@ -10,7 +13,7 @@ TESTS.update(specific.get_tests())
 
 @pytest.mark.parametrize('name', sorted(TESTS.keys()))
 def test_patch(name):
-    target = TESTS[name]['a']
+    target = copy.deepcopy(TESTS[name]['a'])  # shared with test_compose
 
     try:
         expected = TESTS[name]['patched']
@@ -25,9 +28,305 @@ def test_patch(name):
         assert not Differ(U=False).diff(expected, got)[1]
 
 
+@pytest.mark.parametrize('name', sorted(TESTS.keys()))
+def test_patch_copy_on_write(name):
+    target = TESTS[name]['a']
+    original = copy.deepcopy(target)
+
+    try:
+        expected = TESTS[name]['patched']
+    except KeyError:
+        expected = TESTS[name]['b']
+
+    got = Patcher(copy_on_write=True).patch(target, TESTS[name]['diff'])
+
+    try:
+        assert TESTS[name]['assert_func'](got, expected)
+        assert TESTS[name]['assert_func'](target, original)
+    except KeyError:
+        assert not Differ(U=False).diff(expected, got)[1]
+        assert not Differ(U=False).diff(original, target)[1]
+
+
+def test_patch_copy_on_write_shares_unchanged():
+    target = {'a': {'x': [0]}, 'b': [{'y': 1}, {'z': 2}], 'c': {0}}
+    ndiff = {'D': {'b': {'D': [{'D': {'z': {'N': 3}}, 'I': 1}]}}}
+
+    got = patch(target, ndiff, copy_on_write=True)
+
+    assert got == {'a': {'x': [0]}, 'b': [{'y': 1}, {'z': 3}], 'c': {0}}
+    assert target['b'][1] == {'z': 2}
+    assert got['a'] is target['a']
+    assert got['b'][0] is target['b'][0]
+    assert got['c'] is target['c']
+
+
+@pytest.mark.parametrize('name', sorted(TESTS.keys()))
+def test_patch_transactional(name):
+    target = copy.deepcopy(TESTS[name]['a'])
+
+    try:
+        expected = TESTS[name]['patched']
+    except KeyError:
+        expected = TESTS[name]['b']
+
+    patcher = Patcher(transactional=True)
+    got = patcher.patch(target, TESTS[name]['diff'])
+
+    try:
+        assert TESTS[name]['assert_func'](got, expected)
+    except KeyError:
+        assert not Differ(U=False).diff(expected, got)[1]
+
+    assert patcher.journal is None
+
+
+@pytest.mark.parametrize(
+    ('target', 'ndiff', 'exc'),
+    [
+        (  # missing key
+            {'a': 0, 'b': {'c': 1}, 'd': 2},
+            {
+                'D': {
+                    'a': {'N': 1},
+                    'b': {'D': {'c': {'R': 1}}},
+                    'd': {'R': 2},
+                    'e': {'A': 3},
+                    'x': {'D': {}},
+                },
+            },
+            KeyError,
+        ),
+        (  # text mismatch
+            [0, [1, 2], {3}, [4], 'a\nb'],
+            {
+                'D': [
+                    {'N': -1},
+                    {'D': [{'R': 1}, {'A': 0}]},
+                    {'D': [{'R': 3}, {'A': 4}, {'R': 5}], 'E': 3},
+                    {'D': [{'A': 5}], 'E': 7},
+                    {'D': [{'I': [0, 1, 0, 1]}, {'R': 'x'}], 'E': 5},
+                ],
+            },
+            ValueError,
+        ),
+        (  # inappropriate type
+            [{'a': [0, 1]}, {'b': [{'id': 1}, {'id': 2}]}, {'c': 0}],
+            {
+                'D': [
+                    {'D': {'a': {'D': [{'N': 1}, {'N': 0}]}}},
+                    {'D': {'b': {'D': [{'I': [1, 0]}], 'E': 6}}},
+                    {'D': [{'A': 0}]},
+                ],
+            },
+            AttributeError,
+        ),
+        (  # inappropriate type, multiset diff
+            [[0], {}],
+            {'D': [{'D': [{'A': 1}], 'E': 7}, {'D': [{'A': 1}], 'E': 7}]},
+            AttributeError,
+        ),
+    ],
+)
+def test_patch_transactional_rollback(target, ndiff, exc):
+    original = copy.deepcopy(target)
+    patcher = Patcher(transactional=True)
+
+    with pytest.raises(exc):
+        patcher.patch(target, ndiff)
+
+    assert target == original
+    assert patcher.journal is None
+
+
 # Test what doesn't covered by standard tests
 
 
+@pytest.mark.parametrize('name', sorted(TESTS.keys()))
+def test_check(name):
+    assert Patcher().check(TESTS[name]['a'], TESTS[name]['diff']) == []
+
+
+@pytest.mark.parametrize(
+    ('target', 'ndiff', 'expected'),
+    [
+        (0, {'O': 1, 'N': 2}, [[]]),
+        (0, {'R': None}, []),  # trimmed
+        (0, {'U': 1}, [[]]),
+        ([], {'D': {}}, [[]]),
+        (
+            {'a': 0},
+            {'D': {'a': {'A': 1}, 'b': {'N': 1}, 'c': {}}},
+            [['a'], ['b']],
+        ),
+        ({'a': [0]}, {'D': {'a': {'D': [{'R': 1}]}}}, [['a', 0]]),
+        ({}, {'D': [{'U': 0}]}, [[]]),
+        (
+            [0],
+            {'D': [{'A': 1, 'I': 2}, {'U': 0, 'I': 0}, {'U': 1}]},
+            [[2], [1]],
+        ),
+        ([0, 1], {'D': [{'A': 2, 'I': 2}, {'R': 0, 'I': 0}]}, []),
+        ({}, {'D': [], 'E': 6}, [[]]),
+        (
+            [{'id': 1}, {'id': 2}],
+            {
+                'D': [
+                    {'A': {'id': 0}, 'I': [None, 0]},
+                    {'D': {'v': {'A': 1}}, 'I': [1, 1]},
+                    {'I': [0, 2]},
+                    {'R': {'id': 3}, 'I': [2, None]},
+                ],
+                'E': 6,
+            },
+            [[2]],
+        ),
+        (
+            [{'id': 1, 'v': 0}],
+            {'D': [{'D': {'v': {'A': 1}}, 'I': [0, 0]}], 'E': 6},
+            [[0, 'v']],
+        ),
+        ({}, {'D': [{'A': 1}], 'E': 7}, [[]]),
+        ([0, 1], {'D': [{'R': 1}, {'R': 1}, {'A': 2}], 'E': 7}, [[]]),
+        ([0, 1], {'D': [{'R': 1}, {'R': 0}], 'E': 7}, []),
+        ([], {'D': [{'A': 1}], 'E': 3}, [[]]),
+        ({0, 1}, {'D': [{'A': 1}], 'E': 3}, [[]]),
+        ({0, 1}, {'D': [{'R': 2}], 'E': 3}, [[]]),
+        (frozenset((0, 1)), {'D': [{'A': 2}, {'R': 1}], 'E': 4}, []),
+        ([], {'D': [{'I': [0, 1, 0, 1]}, {'R': 'a'}], 'E': 5}, [[]]),
+        ('a', {'D': [{'I': [2, 2, 2, 3]}, {'A': 'b'}], 'E': 5}, [[]]),
+        (
+            'a',
+            {'D': [{'I': [0, 2, 0, 1]}, {'U': 'a'}, {'R': 'b'}], 'E': 5},
+            [[]],
+        ),
+        (
+            'a\nb',
+            {'D': [{'I': [0, 2, 0, 1]}, {'U': 'a'}, {'R': 'x'}], 'E': 5},
+            [[]],
+        ),
+        (
+            'a\nb',
+            {
+                'D': [{'I': [0, 2, 0, 2]}, {'U': 'a'}, {'R': 'b'}, {'A': 'c'}],
+                'E': 5,
+            },
+            [],
+        ),
+    ],
+)
+def test_check_conflicts(target, ndiff, expected):
+    original = copy.deepcopy(target)
+
+    assert Patcher().check(target, ndiff, find_all=True) == expected
+    assert Patcher().check(target, ndiff) == expected[:1]
+    assert target == original
+
+
+@pytest.mark.parametrize(
+    ('diff', 'match'),
+    [
+        ({'D': None, 'E': '_id_'}, 'unsupported extension: _id_'),
+        ({'D': pytest}, 'unsupported diff type: module'),
+    ],
+)
+def test_check_errors(diff, match):
+    with pytest.raises(ValueError, match=match):
+        Patcher().check(None, diff)
+
+
+def test_check_unsupported_by_handler():
+    with pytest.raises(ValueError, match='using TypeHandler'):
+        list(handlers.TypeHandler().check(Patcher(), [], {'D': []}))
+
+
+@pytest.mark.parametrize('name', sorted(TESTS.keys()))
+def test_patch_compiled(name):
+    target = copy.deepcopy(TESTS[name]['a'])
+
+    try:
+        expected = TESTS[name]['patched']
+    except KeyError:
+        expected = TESTS[name]['b']
+
+    got = Patcher().compile(TESTS[name]['diff']).patch(target)
+
+    try:
+        assert TESTS[name]['assert_func'](got, expected)
+    except KeyError:
+        assert not Differ(U=False).diff(expected, got)[1]
+
+
+def test_patch_compiled_flattened():
+    ndiff = {
+        'D': {
+            'a': {'D': {'b': {'D': [{'U': 0}, {'D': {'c': {'N': 1}}}]}}},
+            'd': {'D': [{'A': 0}]},
+            'e': {'A': 2},
+            'f': {'R': 3},
+            'g': {'U': 4},
+        },
+    }
+    target = {'a': {'b': [0, {'c': 0}]}, 'd': [], 'f': 3, 'g': 4}
+    plan = Patcher().compile(ndiff)
+
+    assert plan.ndiff is None
+    assert [group[0] for group in plan.groups] == [('a', 'b', 1), ()]
+    assert plan.patch(target) == {
+        'a': {'b': [0, {'c': 1}]},
+        'd': [0],
+        'e': 2,
+        'g': 4,
+    }
+
+
+@pytest.mark.parametrize(
+    ('patcher', 'target', 'ndiff', 'expected'),
+    [
+        (
+            Patcher(copy_on_write=True),
+            {'a': 0},
+            {'D': {'a': {'N': 1}}},
+            {'a': 1},
+        ),
+        (
+            Patcher(transactional=True),
+            {'a': 0},
+            {'D': {'a': {'N': 1}}},
+            {'a': 1},
+        ),
+        (Patcher(), [0], {'D': [{'A': 1}]}, [1, 0]),
+        (Patcher(), 0, {'N': 1}, 1),
+    ],
+)
+def test_patch_compiled_not_flattened(patcher, target, ndiff, expected):
+    plan = patcher.compile(ndiff)
+
+    assert plan.ndiff is ndiff
+    assert plan.patch(target) == expected
+
+
+def test_patch_compiled_unsupported_extension():
+    with pytest.raises(ValueError, match='unsupported extension: _id_'):
+        Patcher().compile({'D': {'a': {'D': None, 'E': '_id_'}}})
+
+
+@pytest.mark.parametrize('threads', [False, True])
+def test_patch_many(threads):
+    targets = [{'a': [i, {'b': i}]} for i in range(20)]
+    plan = Patcher().compile(
+        {'D': {'a': {'D': [{'D': {'b': {'N': -1}}, 'I': 1}]}}},
+    )
+
+    if threads:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            got = plan.patch_many(targets, executor=executor)
+    else:
+        got = plan.patch_many(targets)
+
+    assert got == [{'a': [i, {'b': -1}]} for i in range(20)]
+
+
 def test_incorrect_diff_type():
     with pytest.raises(TypeError):
         Patcher().patch(None, None)
@@ -67,6 +366,24 @@ def test_type_mismatch():
         Patcher().patch({}, {'D': [{'A': 1}]})
 
 
+@pytest.mark.parametrize(
+    'ndiff',
+    [
+        {'D': [{'A': 3}, {'R': 0, 'I': 3}]},
+        {'D': [{'A': 3}, {'N': 1, 'O': 0, 'I': 3}]},
+        {'D': [{'A': 3, 'I': 4}]},
+        {'D': [{'R': 0}, {'R': 1}, {'R': 2}, {'R': 3}]},
+    ],
+)
+def test_list_index_out_of_range(ndiff):
+    targets = [[0, 1, 2], [0, 1, 2], [0, 1, 2]]
+
+    with pytest.raises(IndexError, match='list index out of range'):
+        list(map(lambda t: patch(t, ndiff), targets))  # noqa: C417
+
+    assert targets[0] == [0, 1, 2]  # not changed
+
+
 def test_unsupported_extension():
     with pytest.raises(ValueError, match='unsupported extension: _ext_id_'):
         Patcher().patch(None, {'D': None, 'E': '_ext_id_'})
@@ -79,3 +396,379 @@ def test_unsupported_patch_type():
 
 def test_patch_func():
     assert patch('a', {'N': 'b', 'O': 'a'}) == 'b'
+
+
+def test_patch_funcs_handlers_iterator():
+    text_diff = {'D': [{'U': 'a'}, {'R': 'b'}, {'A': 'c'}], 'E': 5}
+
+    def text_handlers():
+        return (h for h in [handlers.TextHandler()])
+
+    assert patch('a\nb', text_diff, handlers=text_handlers()) == 'a\nc'
+    assert invert(text_diff, handlers=text_handlers())['E'] == 5
+    assert compose(text_diff, {}, handlers=text_handlers())['E'] == 5
+
+
+def test_multiset_removed_item_absent():
+    diff = {'D': [{'R': 'x'}, {'A': 'y'}], 'E': 7}
+
+    assert Patcher().patch([], diff) == ['y']
+
+
+@pytest.mark.parametrize('name', sorted(TESTS.keys()))
+def test_compose(name):
+    try:
+        if TESTS[name]['skip']['diff']['cond']:
+            pytest.skip(TESTS[name]['skip']['diff'].get('reason', ''))
+    except KeyError:
+        pass
+
+    diff_opts = TESTS[name].get('diff_opts', {})
+    if not all(diff_opts.get(op, True) for op in 'ANR'):
+        pytest.skip('lossy diffs')
+
+    a = TESTS[name]['a']
+    b = TESTS[name]['b']
+
+    differ = Differ(**diff_opts)
+    for handler, handler_opts in TESTS[name].get('handlers', {}).items():
+        differ.set_handler(handler(**handler_opts))
+
+    diffs = [differ.diff(a, b)[1], differ.diff(b, a)[1], differ.diff(a, b)[1]]
+    patcher = Patcher()
+
+    expected = copy.deepcopy(a)
+    for diff in diffs:
+        expected = patcher.patch(expected, diff)
+
+    got = patcher.patch(copy.deepcopy(a), compose(*diffs))
+
+    try:
+        assert TESTS[name]['assert_func'](got, expected)
+    except KeyError:
+        assert got == expected
+
+
+@pytest.mark.parametrize(
+    ('diffs', 'expected'),
+    [
+        ([], {}),
+        ([{'U': 0}, {'N': 1, 'O': 0}], {'N': 1, 'O': 0}),
+        ([{'N': 1, 'O': 0}, {'U': 1}], {'N': 1, 'O': 0}),
+        ([{'N': 1, 'O': 0}, {'N': 2, 'O': 1}], {'N': 2, 'O': 0}),
+        ([{'N': 1, 'O': 0}, {'R': 1}], {'R': 0}),
+        ([{'N': 1}, {'R': 1}], {'R': 1}),
+        ([{'R': 0}, {'A': 1}], {'N': 1, 'O': 0}),
+        ([{'A': 0}, {'R': 0}], {}),
+        ([{'A': 0}, {'N': 1, 'O': 0}], {'A': 1}),
+        ([{'A': [0]}, {'D': [{'A': 1}]}], {'A': [1, 0]}),
+        ([{'N': [0], 'O': 0}, {'D': [{'R': 0}]}], {'N': [], 'O': 0}),
+        ([{'D': {'x': {'A': 0}}}, {'D': {'x': {'R': 0}}}], {}),
+        (
+            [{'D': {'x': {'A': 0}}}, {'D': {'y': {'A': 1}}}],
+            {'D': {'x': {'A': 0}, 'y': {'A': 1}}},
+        ),
+    ],
+)
+def test_compose_values(diffs, expected):
+    assert compose(*diffs) == expected
+
+
+@pytest.mark.parametrize(
+    ('target', 'diffs', 'expected'),
+    [
+        (  # explicit unchanged items kept
+            [0, 1],
+            [{'D': [{'N': 2, 'O': 0}]}, {'D': [{'U': 2}, {'U': 1}]}],
+            {'D': [{'N': 2, 'O': 0}, {'U': 1}]},
+        ),
+        (  # added then changed item
+            [0],
+            [{'D': [{'A': [1]}]}, {'D': [{'D': [{'A': 2}]}]}],
+            {'D': [{'A': [2, 1]}]},
+        ),
+        (  # changed then removed item, old value is kept
+            [0, 1],
+            [{'D': [{'N': 2, 'O': 0}]}, {'D': [{'R': 2}]}],
+            {'D': [{'R': 0}]},
+        ),
+        (
+            [0, 1],
+            [{'D': [{'N': 2}]}, {'D': [{'R': 2}]}],
+            {'D': [{'R': 2}]},
+        ),
+        (
+            [0, 1],
+            [{'D': [{'U': 0}]}, {'D': [{'R': 0}]}],
+            {'D': [{'R': 0}]},
+        ),
+        (
+            [0, 1],
+            [{'D': [{'U': 0}]}, {'D': [{'N': 2, 'O': 0}]}],
+            {'D': [{'N': 2, 'O': 0}]},
+        ),
+        (  # insertions around removed items
+            [0, 1, 2, 3],
+            [
+                {'D': [{'R': 1, 'I': 1}, {'R': 2}]},
+                {'D': [{'A': 4, 'I': 1}, {'A': 5, 'I': 2}]},
+            ],
+            {'D': [{'R': 1, 'I': 1}, {'R': 2}, {'A': 4}, {'A': 5, 'I': 4}]},
+        ),
+        (
+            (0, 1, 2),
+            [{'D': ({'R': 0},)}, {'D': ({'A': 3, 'I': 2},)}],
+            {'D': ({'R': 0}, {'A': 3, 'I': 3})},
+        ),
+        (
+            {0, 1},
+            [
+                {'D': [{'R': 0}, {'A': 2}], 'E': 3},
+                {'D': [{'R': 2}, {'A': 0}, {'U': 1}], 'E': 3},
+            ],
+            {'D': [{'A': 0}, {'R': 2}], 'E': 3},
+        ),
+        (
+            frozenset(),
+            [{'D': [{'A': 0}], 'E': 4}, {'D': [{'R': 0}], 'E': 4}],
+            {'D': [{'R': 0}], 'E': 4},
+        ),
+        (
+            [0, 1],
+            [
+                {'D': [{'R': 0}, {'A': 2}], 'E': 7},
+                {'D': [{'U': 1}, {'R': 2}], 'E': 7},
+            ],
+            {'D': [{'R': 0}, {'A': 2}, {'R': 2}], 'E': 7},
+        ),
+        (
+            'a\nb\nc\nd',
+            [
+                {
+                    'D': [{'I': [1, 2, 1, 2]}, {'R': 'b'}, {'A': 'B'}],
+                    'E': 5,
+                },
+                {
+                    'D': [
+                        {'I': [1, 4, 1, 4]},
+                        {'U': 'B'},
+                        {'U': 'c'},
+                        {'R': 'd'},
+                        {'A': 'D'},
+                    ],
+                    'E': 5,
+                },
+            ],
+            {
+                'D': [
+                    {'I': [1, 4, 1, 4]},
+                    {'R': 'b'},
+                    {'A': 'B'},
+                    {'U': 'c'},
+                    {'R': 'd'},
+                    {'A': 'D'},
+                ],
+                'E': 5,
+            },
+        ),
+        (
+            [{'id': 0}, {'id': 1}, {'id': 2}],
+            [
+                {'D': [{'I': [2, 0]}], 'E': 6},
+                {'D': [{'R': {'id': 0}, 'I': [1, None]}], 'E': 6},
+            ],
+            {
+                'D': [{'I': [2, 0]}, {'R': {'id': 0}, 'I': [0, None]}],
+                'E': 6,
+            },
+        ),
+        (
+            [{'id': 0}, {'id': 1}, {'id': 2}],
+            [
+                {'D': [{'I': [2, 0]}], 'E': 6},
+                {'D': [{'R': {'id': 0}, 'I': 1}, {'A': {'id': 0}, 'I': 3}]},
+            ],
+            {
+                'D': [
+                    {'I': [2, 0]},
+                    {'A': {'id': 0}, 'I': [None, 2]},
+                    {'R': {'id': 0}, 'I': [0, None]},
+                ],
+                'E': 6,
+            },
+        ),
+        (
+            [{'id': 0}, {'id': 0}],
+            [
+                {
+                    'D': [
+                        {'D': {'v': {'A': 1}}},
+                        {'R': {'id': 0}},
+                        {'A': {'id': 1}},
+                    ],
+                },
+                {'D': [{'I': [1, 0]}], 'E': 6},
+            ],
+            {
+                'D': [
+                    {'A': {'id': 1}, 'I': [None, 0]},
+                    {'D': {'v': {'A': 1}}, 'I': [0, 1]},
+                    {'R': {'id': 0}, 'I': [1, None]},
+                ],
+                'E': 6,
+            },
+        ),
+    ],
+)
+def test_compose_containers(target, diffs, expected):
+    got = compose(*diffs)
+    assert got == expected
+
+    patcher = Patcher()
+    patched = copy.deepcopy(target)
+    for diff in diffs:
+        patched = patcher.patch(patched, diff)
+
+    assert patcher.patch(copy.deepcopy(target), got) == patched
+
+
+def test_compose_values_not_changed():
+    diffs = [{'N': [0], 'O': None}, {'D': [{'N': 1, 'O': 0}]}]
+
+    assert compose(*diffs) == {'N': [1], 'O': None}
+    assert diffs[0] == {'N': [0], 'O': None}
+
+
+@pytest.mark.parametrize(
+    ('diffs', 'match'),
+    [
+        ([{'R': 0}, {'N': 1, 'O': 0}], 'for removed object'),
+        ([{'N': 1}, {'A': 1}], 'for existing object'),
+        ([{'D': {}}, {'D': []}], 'for different types'),
+        ([{'D': [], 'E': 3}, {'D': [], 'E': 4}], 'for different types'),
+        ([{'D': [], 'E': 3}, {'D': []}], 'for different types'),
+        ([{'O': 1}, {'O': 2}], 'without new values or subdiffs'),
+        ([{'D': [{'U': 0}]}, {'O': [0]}], 'without new values or subdiffs'),
+        ([{'D': None, 'E': '_id_'}] * 2, 'unsupported extension: _id_'),
+        ([{'D': pytest}] * 2, 'unsupported diff type: module'),
+        (
+            [{'D': [{'A': 0}]}, {'D': [{'N': 1, 'I': 2}, {'N': 2, 'I': 0}]}],
+            'diff items are not ordered',
+        ),
+    ],
+)
+def test_compose_errors(diffs, match):
+    with pytest.raises(ValueError, match=match):
+        compose(*diffs)
+
+
+def test_compose_unsupported_by_handler():
+    with pytest.raises(ValueError, match='using TypeHandler'):
+        handlers.TypeHandler().compose(Patcher(), {'D': []}, {'D': []})
+
+
+@pytest.mark.parametrize('name', sorted(TESTS.keys()))
+def test_invert(name):
+    diff_opts = TESTS[name].get('diff_opts', {})
+    lossy = not all(diff_opts.get(op, True) for op in 'ANOR')
+    if lossy or diff_opts.get('trimR'):
+        pytest.skip('lossy diff')
+
+    a = TESTS[name]['a']
+    b = TESTS[name]['b']
+
+    differ = Differ(**diff_opts)
+    for handler, handler_opts in TESTS[name].get('handlers', {}).items():
+        differ.set_handler(handler(**handler_opts))
+
+    got = Patcher().patch(copy.deepcopy(b), invert(differ.diff(a, b)[1]))
+
+    try:
+        assert TESTS[name]['assert_func'](got, a)
+    except KeyError:
+        assert differ.equal(got, a)
+
+
+@pytest.mark.parametrize(
+    ('diff', 'expected'),
+    [
+        ({}, {}),
+        ({'U': 0}, {'U': 0}),
+        ({'N': 1, 'O': 0}, {'N': 0, 'O': 1}),
+        ({'A': 0}, {'R': 0}),
+        ({'R': 0}, {'A': 0}),
+        (
+            {'D': [{'R': 0}, {'A': 2, 'I': 3}, {'N': 4, 'O': 3}, {'A': 5}]},
+            {'D': [{'A': 0}, {'R': 2, 'I': 2}, {'N': 3, 'O': 4}, {'R': 5}]},
+        ),
+        (
+            {'D': ({'A': 0}, {'R': 1, 'I': 2})},
+            {'D': ({'R': 0}, {'A': 1, 'I': 3})},
+        ),
+        (
+            {'D': [{'R': 0}, {'A': 1}, {'U': 2}], 'E': 3},
+            {'D': [{'A': 0}, {'R': 1}, {'U': 2}], 'E': 3},
+        ),
+        (
+            {
+                'D': [
+                    {'I': [1, 3, 1, 4]},
+                    {'R': 'b'},
+                    {'A': 'B'},
+                    {'A': 'BB'},
+                    {'U': 'c'},
+                ],
+                'E': 5,
+            },
+            {
+                'D': [
+                    {'I': [1, 4, 1, 3]},
+                    {'R': 'B'},
+                    {'R': 'BB'},
+                    {'A': 'b'},
+                    {'U': 'c'},
+                ],
+                'E': 5,
+            },
+        ),
+        (
+            {
+                'D': [
+                    {'I': [2, 0]},
+                    {'A': {'id': 3}, 'I': [None, 1]},
+                    {'R': {'id': 1}, 'I': [1, None]},
+                ],
+                'E': 6,
+            },
+            {
+                'D': [
+                    {'A': {'id': 1}, 'I': [None, 1]},
+                    {'I': [0, 2]},
+                    {'R': {'id': 3}, 'I': [1, None]},
+                ],
+                'E': 6,
+            },
+        ),
+    ],
+)
+def test_invert_diffs(diff, expected):
+    assert invert(diff) == expected
+
+
+@pytest.mark.parametrize(
+    ('diff', 'match'),
+    [
+        ({'N': 1}, 'without old or new value'),
+        ({'D': {'x': {'O': 1}}}, 'without old or new value'),
+        ({'D': None, 'E': '_id_'}, 'unsupported extension: _id_'),
+        ({'D': pytest}, 'unsupported diff type: module'),
+    ],
+)
+def test_invert_errors(diff, match):
+    with pytest.raises(ValueError, match=match):
+        invert(diff)
+
+
+def test_invert_unsupported_by_handler():
+    with pytest.raises(ValueError, match='using TypeHandler'):
+        handlers.TypeHandler().invert(Patcher(), {'D': []})
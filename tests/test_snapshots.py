@@ -0,0 +1,119 @@
+import copy
+
+import pytest
+
+from nested_diff import Patcher
+from nested_diff.snapshots import DirectoryStore, SnapshotStore, SqliteStore
+
+
+def make_versions(count):
+    obj = {'hosts': [], 'meta': {'version': 0}}
+
+    for i in range(count):
+        obj['hosts'].append({'name': f'host{i}', 'tags': {i % 3}})
+        obj['meta']['version'] = i
+        if i % 5 == 0:
+            obj['hosts'].pop(0)
+
+        yield obj
+
+
+@pytest.fixture(params=[DirectoryStore, SqliteStore])
+def store_cls(request, tmp_path):
+    def make_store(**kwargs):
+        return request.param(str(tmp_path / 'store'), **kwargs)
+
+    return make_store
+
+
+@pytest.mark.parametrize('background', [True, False])
+def test_store(store_cls, background):
+    versions = []
+
+    with store_cls(keyframe_interval=4, background=background) as store:
+        assert len(store) == 0
+
+        for obj in make_versions(20):
+            assert store.put(obj) == len(versions)
+            versions.append(copy.deepcopy(obj))
+
+        assert store.put(versions[-1]) == 20  # unchanged
+        versions.append(versions[-1])
+
+    with store_cls(keyframe_interval=4) as store:
+        assert sorted(store.list_versions('keyframe')) == [0, 4, 8, 12, 16, 20]
+        assert len(store) == len(versions)
+
+        for i, expected in enumerate(versions):
+            assert store.get(i) == expected
+
+        assert store.get() == versions[-1]
+        assert store.get(-2) == versions[-2]
+
+        store.put({'new': 'version'})
+
+        assert store.get() == {'new': 'version'}
+        assert store.get(-2) == versions[-1]
+
+
+def test_store_out_of_range(store_cls):
+    with store_cls() as store:
+        with pytest.raises(IndexError, match='version out of range'):
+            store.get()
+
+        store.put(0)
+
+        with pytest.raises(IndexError, match='version out of range'):
+            store.get(1)
+
+
+def test_store_compact(store_cls):
+    with store_cls(keyframe_interval=100) as store:
+        store.compact()  # empty store
+
+        for obj in make_versions(10):
+            store.put(obj)
+
+        assert store.list_versions('keyframe') == [0]
+
+    with store_cls(keyframe_interval=3) as store:
+        store.compact()
+
+        assert sorted(store.list_versions('keyframe')) == [0, 3, 6, 9]
+        assert store.get(8) == list(make_versions(9))[-1]
+
+        store.keyframe_interval = 2
+        store.compact()
+
+        assert sorted(store.list_versions('keyframe')) == [0, 2, 3, 5, 6, 8, 9]
+
+        store.put(None)  # next keyframe is 11
+
+        assert sorted(store.list_versions('keyframe'))[-1] == 9
+
+
+def test_store_abstract_methods():
+    class Store(SnapshotStore):
+        def list_versions(self, kind):
+            return super().list_versions(kind)
+
+    with pytest.raises(TypeError, match='abstract'):
+        Store()
+
+
+def test_store_get_patcher_per_call(store_cls):
+    class CountingPatcher(Patcher):
+        calls = 0
+
+        def patch(self, target, ndiff):
+            self.calls += 1
+            return super().patch(target, ndiff)
+
+    patcher = CountingPatcher(transactional=True)
+
+    with store_cls(patcher=patcher, background=False) as store:
+        for obj in make_versions(3):
+            store.put(obj)
+
+        assert store.get() == obj
+        assert patcher.calls == 0  # shared one is not used concurrently